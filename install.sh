@@ -10,6 +10,7 @@ set -euo pipefail
 
 HOME_DIR="${HOME}"
 ICONS_DIR="${HOME_DIR}/.local/share/icons"
+EMBLEMS_DIR="${ICONS_DIR}/hicolor/64x64/emblems"
 NEMO_ACTIONS_DIR="${HOME_DIR}/.local/share/nemo/actions"
 nemo_git_integration_DIR="${HOME_DIR}/.local/share/nemo/nemo-git-integration"
 CONFIG_DIR="${HOME_DIR}/.config/nemo/actions"
@@ -30,11 +31,16 @@ install_files() {
   [[ -f "./.config/nemo/actions/actions-tree.json" ]] || error "Integration JSON missing: $INTEGRATION_JSON"
 
   mkdir -p "$ICONS_DIR"
+  mkdir -p "$EMBLEMS_DIR"
   mkdir -p "$NEMO_ACTIONS_DIR"
   mkdir -p "$nemo_git_integration_DIR"
   mkdir -p "$CONFIG_DIR"
 
   cp -r ./icons/* "$ICONS_DIR/"
+  # Nemo looks emblems up as emblem-<name>
+  for icon in ./icons/*.png; do
+    cp "$icon" "$EMBLEMS_DIR/emblem-$(basename "$icon")"
+  done
   cp -r ./nemo/actions/* "$NEMO_ACTIONS_DIR/"
   cp -r ./nemo-git-integration/* "$nemo_git_integration_DIR/"
   cp -r ./.config/nemo/actions/* "$CONFIG_DIR/"
@@ -0,0 +1,158 @@
+#!/bin/bash
+
+# Stream a long-running command's output into a zenity dialog while it runs.
+#
+# Source this file, then:
+#   run_with_progress LOG ZENITY_ARG... -- COMMAND...
+#       show COMMAND's progress ("Receiving objects:  45% ...") in a
+#       zenity --progress dialog
+#   run_with_viewer LOG ZENITY_ARG... -- COMMAND...
+#       show COMMAND's output in a zenity --text-info dialog as it arrives
+#   run_repos_with_progress RESULTS FUNC VERB TITLE REPO...
+#       run FUNC REPO for each repository, NEMO_GIT_JOBS at a time, counting
+#       finished repositories in a zenity --progress dialog
+#
+# The first two run COMMAND in its own process group, which is killed when
+# the dialog is cancelled or closed early; they then return 130. Otherwise
+# they return COMMAND's exit status. Output is never held in full: only its
+# last lines (progress updates excluded) are written to LOG for error messages.
+#
+# Environment:
+#   NEMO_GIT_OUTPUT_LINES  Lines of output kept in LOG (default: 50)
+#   NEMO_GIT_JOBS          Repositories processed at once (default: number of CPUs)
+
+NEMO_GIT_OUTPUT_LINES="${NEMO_GIT_OUTPUT_LINES:-50}"
+
+# Split "LOG ZENITY_ARG... -- COMMAND..." into _RUN_LOG, _RUN_DIALOG and _RUN_CMD
+_run_parse_args() {
+    _RUN_LOG="$1"
+    _RUN_DIALOG=()
+    shift
+    while [ $# -gt 0 ] && [ "$1" != "--" ]; do
+        _RUN_DIALOG+=("$1")
+        shift
+    done
+    shift
+    _RUN_CMD=("$@")
+}
+
+# Start _RUN_CMD in a new process group writing to a new FIFO. Sets
+# _RUN_FIFO and _RUN_PID, the process group to kill on cancel.
+#
+# setsid only makes the command the group leader without forking when it is
+# not one already, which background jobs are under job control. Job control
+# is therefore off while starting it, and -w makes setsid report the
+# command's status even if it did fork.
+_run_start() {
+    local job_control=0
+    _RUN_FIFO=$(mktemp -u) && mkfifo -m 600 "$_RUN_FIFO" || return 1
+    [[ $- != *m* ]] || { job_control=1; set +m; }
+    setsid -w "${_RUN_CMD[@]}" > "$_RUN_FIFO" 2>&1 < /dev/null &
+    _RUN_PID=$!
+    [ $job_control -eq 0 ] || set -m
+}
+
+# Wait for the command; return its status, or 130 if the dialog ended it
+_run_finish() {
+    local cancelled="$1" status
+    wait "$_RUN_PID"
+    status=$?
+    rm -f "$_RUN_FIFO"
+    [ "$cancelled" -eq 0 ] || return 130
+    return "$status"
+}
+
+# Turn progress output into zenity --progress input: a percentage and a
+# "# text" line per update, capped at 99 so the dialog stays open until the
+# command finishes. Keeps the last lines of other output in the file $1.
+_progress_filter() {
+    local log="$1" line
+    local -a kept=()
+
+    while IFS= read -r line; do
+        if [[ "$line" =~ ^(.*[^\ ]):\ +([0-9]{1,3})% ]]; then
+            printf '%d\n# %s %d%%\n' \
+                $((BASH_REMATCH[2] > 99 ? 99 : BASH_REMATCH[2])) "${BASH_REMATCH[1]}" "${BASH_REMATCH[2]}"
+            # Only the final update of each stage is worth keeping
+            [[ "$line" == *", done."* ]] || continue
+        elif [ -n "$line" ]; then
+            printf '# %s\n' "$line"
+        else
+            continue
+        fi
+        kept+=("$line")
+        [ ${#kept[@]} -le "$NEMO_GIT_OUTPUT_LINES" ] || kept=("${kept[@]:1}")
+    done < <(stdbuf -o0 tr '\r' '\n')
+
+    printf '%s\n' "${kept[@]}" > "$log"
+    printf '100\n'
+}
+
+# Run a command with its progress shown in a zenity --progress dialog
+run_with_progress() {
+    local dialog_status
+
+    _run_parse_args "$@"
+    _run_start || return 1
+    _progress_filter "$_RUN_LOG" < "$_RUN_FIFO" | {
+        zenity --progress --percentage=0 --auto-close "${_RUN_DIALOG[@]}"
+        dialog_status=$?
+        if [ $dialog_status -ne 0 ]; then
+            kill -TERM -- "-$_RUN_PID" 2>/dev/null
+        else
+            # Keep reading so the command never writes to a closed pipe
+            cat > /dev/null
+        fi
+        exit $dialog_status
+    }
+    _run_finish "${PIPESTATUS[1]}"
+}
+
+# Run a command with its output streamed into a zenity --text-info dialog
+run_with_viewer() {
+    _run_parse_args "$@"
+    _run_start || return 1
+    {
+        tee >(tail -n "$NEMO_GIT_OUTPUT_LINES" > "$_RUN_LOG") < "$_RUN_FIFO"
+        wait $!
+    } | {
+        zenity --text-info "${_RUN_DIALOG[@]}"
+        # Closing the viewer stops the command if it is still running
+        if kill -0 "$_RUN_PID" 2>/dev/null; then
+            kill -TERM -- "-$_RUN_PID" 2>/dev/null
+            exit 1
+        fi
+    }
+    _run_finish "${PIPESTATUS[1]}"
+}
+
+# Run FUNC REPO for each repository in parallel, feeding a progress dialog
+# as results arrive. FUNC prints one tab-separated line per repository with
+# its name in the second field; it must be exported along with any variables
+# it reads. Lines are appended to RESULTS, and the dialog says "VERB n of
+# total". Returns non-zero if the dialog was cancelled.
+run_repos_with_progress() {
+    local results="$1" func="$2" verb="$3" title="$4"
+    shift 4
+    local total=$#
+
+    printf '%s\0' "$@" |
+        xargs -0 -n 1 -P "${NEMO_GIT_JOBS:-$(nproc 2>/dev/null || echo 4)}" \
+            bash -c '"$0" "$1"' "$func" |
+        {
+            finished=0
+            while IFS= read -r line; do
+                printf '%s\n' "$line" >> "$results"
+                finished=$((finished + 1))
+                # The dialog only goes away early when the user cancels it
+                printf '%d\n# %s %d of %d: %s\n' \
+                    $((finished * 100 / total)) "$verb" "$finished" "$total" "$(cut -f 2 <<<"$line")" \
+                    2>/dev/null || break
+            done
+        } |
+        zenity --progress --title="$title" \
+            --text="$verb 0 of $total repositories..." \
+            --percentage=0 --auto-close
+
+    [ "${PIPESTATUS[3]}" -eq 0 ] && [ "$(wc -l < "$results")" -eq "$total" ]
+}
@@ -0,0 +1,264 @@
+#!/bin/bash
+
+# Shared repository lookup for the nemo-git-integration actions.
+#
+# Source this file, then:
+#   find_repo_root PATH   print the repository containing PATH
+#   discover_repos ROOT   print every repository under ROOT, NUL-separated
+#   group_by_repo DIR FILE...   sort files into per-repository NUL-separated lists
+#   for_each_repo FUNC REPO...  run FUNC REPO for each repository in parallel
+#   git_batch REPO LIST ARGS... run `git ARGS` once over a path list from group_by_repo
+#   repo_state_dir KIND REPO    print where an action keeps KIND state for REPO
+#
+# Discovery walks breadth-first, one find per level, and stops descending
+# once a directory holds a .git entry (a directory, or a file for worktrees
+# and submodules). The result is cached per root and reused while none of
+# the walked directories has changed its mtime.
+#
+# Environment:
+#   NEMO_GIT_DISCOVERY_DEPTH   Deepest directory level searched below ROOT (default: 5)
+#   NEMO_GIT_DISCOVERY_IGNORE  Colon-separated name globs of directories never entered
+#   NEMO_GIT_DISCOVERY_CACHE   Set to 0 to always walk instead of using the cache
+#   NEMO_GIT_REPO_CACHE_DIR    Where repository lists are cached (default: ~/.cache/nemo_git_repos)
+#   NEMO_GIT_JOBS              Repositories processed at once (default: number of CPUs)
+
+NEMO_GIT_DISCOVERY_DEPTH="${NEMO_GIT_DISCOVERY_DEPTH:-5}"
+NEMO_GIT_DISCOVERY_IGNORE="${NEMO_GIT_DISCOVERY_IGNORE-node_modules:.cache:.local:.npm:.cargo:.rustup:.venv:venv:__pycache__:.tox:.Trash*}"
+NEMO_GIT_DISCOVERY_CACHE="${NEMO_GIT_DISCOVERY_CACHE:-1}"
+NEMO_GIT_REPO_CACHE_DIR="${NEMO_GIT_REPO_CACHE_DIR:-$HOME/.cache/nemo_git_repos}"
+NEMO_GIT_JOBS="${NEMO_GIT_JOBS:-$(nproc 2>/dev/null || echo 4)}"
+
+# Check whether a directory is the top of a git work tree
+is_repo_dir() {
+    [ -e "$1/.git" ]
+}
+
+# Print the root of the repository containing a file or directory
+find_repo_root() {
+    local dir
+    dir=$(realpath -- "$1" 2>/dev/null) || return 1
+    [ -d "$dir" ] || dir="${dir%/*}"
+
+    while :; do
+        if is_repo_dir "$dir"; then
+            printf '%s\n' "$dir"
+            return 0
+        fi
+        [ -z "$dir" ] || [ "$dir" = "/" ] && return 1
+        dir="${dir%/*}"
+        [ -n "$dir" ] || dir="/"
+    done
+}
+
+# Print the directory holding an action's KIND state (e.g. "pull") for a
+# repository: ~/.cache/nemo_git_KIND_state/<hash of the repository path>
+repo_state_dir() {
+    local repo key
+    repo=$(realpath -- "$2" 2>/dev/null) || repo="$2"
+    key=$(printf '%s' "$repo" | md5sum | cut -d ' ' -f 1)
+    printf '%s\n' "$HOME/.cache/nemo_git_$1_state/$key"
+}
+
+# Group files by repository without a process per file. Sets REPO_LISTS[root]
+# to a file in DIR holding the NUL-separated paths relative to root,
+# REPO_COUNTS[root] to their number and OUTSIDE_REPO to files in no repository.
+group_by_repo() {
+    local workdir="$1" path dir root n=0 n_files
+    local -a resolved
+    local -A root_of
+    shift
+    declare -gA REPO_LISTS=() REPO_COUNTS=()
+    declare -ga OUTSIDE_REPO=()
+    [ $# -gt 0 ] || return 0
+
+    mapfile -d '' -t resolved < <(realpath -z -- "$@" 2>/dev/null)
+    for path in "${resolved[@]}"; do
+        if [ -d "$path" ]; then
+            dir="$path"
+        else
+            dir="${path%/*}"
+        fi
+
+        root="${root_of[$dir]}"
+        if [ -z "$root" ]; then
+            root="$dir"
+            while [ -n "$root" ] && ! is_repo_dir "$root"; do
+                root="${root%/*}"
+            done
+            root="${root:-/}"
+            is_repo_dir "$root" || root="-"
+            root_of["$dir"]="$root"
+        fi
+
+        if [ "$root" = "-" ]; then
+            OUTSIDE_REPO+=("$path")
+            continue
+        fi
+        if [ -z "${REPO_LISTS[$root]}" ]; then
+            n=$((n + 1))
+            REPO_LISTS["$root"]="$workdir/repo-$n.list"
+            REPO_COUNTS["$root"]=0
+        fi
+        if [ "$path" = "$root" ]; then
+            printf '.\0' >> "${REPO_LISTS[$root]}"
+        else
+            printf '%s\0' "${path#"$root"/}" >> "${REPO_LISTS[$root]}"
+        fi
+        n_files="${REPO_COUNTS[$root]}"
+        REPO_COUNTS["$root"]=$((n_files + 1))
+    done
+}
+
+# List the entries one level below each directory argument:
+# "R<dir>/" when <dir> holds .git, "D<mtime> <subdir>/" for each
+# subdirectory that is not ignored.
+_discovery_list_level() {
+    local -a globs prune=()
+    local glob
+    IFS=: read -r -a globs <<<"$NEMO_GIT_DISCOVERY_IGNORE"
+    for glob in "${globs[@]}"; do
+        [ -n "$glob" ] && prune+=(-name "$glob" -o)
+    done
+    find "$@" -mindepth 1 -maxdepth 1 \
+        \( -name .git -printf 'R%h/\0' \) -o \
+        \( -type d \( "${prune[@]}" -false \) -prune \) -o \
+        \( -type d -printf 'D%T@ %p/\0' \) 2>/dev/null
+}
+
+# Walk ROOT and print cache records: "V<mtime> <dir>/" for each searched
+# directory that is not a repository and "R<dir>/" for each repository.
+# Directories carry a trailing slash so " <repo>/" matches a repository
+# and everything below it as a fixed string.
+_discovery_walk() {
+    local root="$1" level=0 work
+
+    if is_repo_dir "$root"; then
+        printf 'R%s/\0' "$root"
+        return
+    fi
+    work=$(mktemp -d) || return 1
+    find "$root" -maxdepth 0 -printf '%T@ %p/\0' > "$work/frontier"
+    : > "$work/visited"
+    : > "$work/found"
+
+    export -f _discovery_list_level
+    export NEMO_GIT_DISCOVERY_IGNORE
+    while [ -s "$work/frontier" ]; do
+        cut -z -d ' ' -f 2- "$work/frontier" | sed -z 's|/$||' |
+            xargs -0 bash -c '_discovery_list_level "$@"' _ > "$work/level"
+        grep -z '^R' "$work/level" | cut -z -c 2- > "$work/repos"
+
+        if [ -s "$work/repos" ]; then
+            # Leave repositories out of the searched set and do not descend into them
+            sed -z 's|^| |' "$work/repos" | tr '\0' '\n' > "$work/patterns"
+            grep -z -v -F -f "$work/patterns" "$work/frontier" >> "$work/visited" || true
+            grep -z '^D' "$work/level" | cut -z -c 2- |
+                { grep -z -v -F -f "$work/patterns" || true; } > "$work/next"
+            cat "$work/repos" >> "$work/found"
+        else
+            cat "$work/frontier" >> "$work/visited"
+            grep -z '^D' "$work/level" | cut -z -c 2- > "$work/next"
+        fi
+
+        [ $level -lt "$NEMO_GIT_DISCOVERY_DEPTH" ] || break
+        level=$((level + 1))
+        mv "$work/next" "$work/frontier"
+    done
+
+    sed -z 's|^|V|' "$work/visited"
+    sed -z 's|^|R|' "$work/found"
+    rm -rf "$work"
+}
+
+# Check that no walked directory changed and every repository still exists
+_discovery_cache_valid() {
+    local cache="$1" dir
+    local -a found
+
+    mapfile -d '' -t found < <(grep -z '^R' "$cache" | cut -z -c 2-)
+    for dir in "${found[@]}"; do
+        is_repo_dir "$dir" || return 1
+    done
+
+    # Compare recorded mtimes with current ones in a single pass
+    cmp -s <(grep -z '^V' "$cache" | cut -z -c 2- | sort -z) \
+           <(grep -z '^V' "$cache" | cut -z -d ' ' -f 2- | sed -z 's|/$||' |
+             xargs -0 sh -c 'find "$@" -maxdepth 0 -printf "%T@ %p/\\0" 2>/dev/null' sh |
+             sort -z)
+}
+
+# Print the repositories recorded in a cache file, sorted
+_discovery_repos_from() {
+    grep -z '^R' "$1" | cut -z -c 2- | sed -z 's|/$||' | sort -z
+}
+
+# Print every repository under ROOT (ROOT itself if it is one), NUL-separated
+discover_repos() {
+    local root="${1%/}" key cache records
+    [ -n "$root" ] || root="/"
+
+    if [ "$NEMO_GIT_DISCOVERY_CACHE" = "0" ]; then
+        _discovery_repos_from <(_discovery_walk "$root")
+        return
+    fi
+
+    key=$(printf '%s\0%s\0%s' "$root" "$NEMO_GIT_DISCOVERY_DEPTH" "$NEMO_GIT_DISCOVERY_IGNORE" |
+          md5sum | cut -d ' ' -f 1)
+    cache="$NEMO_GIT_REPO_CACHE_DIR/$key"
+    if [ -f "$cache" ] && _discovery_cache_valid "$cache"; then
+        _discovery_repos_from "$cache"
+        return
+    fi
+
+    mkdir -p "$NEMO_GIT_REPO_CACHE_DIR"
+    records=$(mktemp "$cache.XXXXXX") || {
+        _discovery_repos_from <(_discovery_walk "$root")
+        return
+    }
+    _discovery_walk "$root" > "$records"
+    mv -f "$records" "$cache"
+    _discovery_repos_from "$cache"
+}
+
+# Run FUNC once per repository argument, at most NEMO_GIT_JOBS at a time.
+# Each call runs in a background subshell, so results must go to files.
+for_each_repo() {
+    local func="$1" repo running=0
+    shift
+
+    for repo in "$@"; do
+        if [ $running -ge "$NEMO_GIT_JOBS" ]; then
+            wait -n
+            running=$((running - 1))
+        fi
+        "$func" "$repo" &
+        running=$((running + 1))
+    done
+    wait
+}
+
+# Run `git ARGS` in REPO once for every path in LIST (NUL-separated, as
+# written by group_by_repo), passing them as a literal pathspec file. When
+# the batch fails each path is retried alone so failures can be named.
+# Paths that succeeded go to LIST.done and the rest to LIST.failed.
+git_batch() {
+    local repo="$1" list="$2" path
+    shift 2
+
+    : > "$list.failed"
+    if git --literal-pathspecs -C "$repo" "$@" --pathspec-from-file=- --pathspec-file-nul \
+        < "$list" 2>/dev/null; then
+        cp "$list" "$list.done"
+        return 0
+    fi
+
+    : > "$list.done"
+    while IFS= read -r -d '' path; do
+        if git --literal-pathspecs -C "$repo" "$@" -- "$path" 2>/dev/null; then
+            printf '%s\0' "$path" >> "$list.done"
+        else
+            printf '%s\0' "$path" >> "$list.failed"
+        fi
+    done < "$list"
+    [ ! -s "$list.failed" ]
+}
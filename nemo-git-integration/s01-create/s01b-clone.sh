@@ -1,7 +1,40 @@
 #!/bin/bash
 
+# Clone a repository into the destination folder. Besides a full clone,
+# large repositories can be cloned shallow (recent history only), blobless
+# (file contents fetched on demand), sparse (top-level files only) or
+# borrowing objects from an existing local clone. The choice is remembered
+# per host and preselected next time.
+#
+# Environment:
+#   NEMO_GIT_CLONE_DEPTH  Commits fetched by a shallow clone (default: 1)
+
 # Required: Destination directory passed as $1
 DEST="$1"
+CLONE_DEPTH="${NEMO_GIT_CLONE_DEPTH:-1}"
+CLONE_DEFAULTS="$HOME/.cache/nemo_git_clone_state/defaults"
+
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+source "$SCRIPT_DIR/../lib/progress.sh"
+
+# Print the host part of a repository URL, or "local" for local paths
+url_host() {
+  local url="$1"
+  case "$url" in
+    file://* | /*) echo "local" ;;
+    *://*)
+      url="${url#*://}"
+      url="${url%%/*}"
+      url="${url#*@}"
+      echo "${url%%:*}"
+      ;;
+    *)
+      url="${url%%:*}"
+      echo "${url#*@}"
+      ;;
+  esac
+}
 
 # Validate destination
 if [ -z "$DEST" ] || [ ! -d "$DEST" ] || [ ! -w "$DEST" ]; then
@@ -19,7 +52,7 @@ if [ -z "$REPO_URL" ]; then
 fi
 
 # Validate repository URL format (basic validation)
-if [[ ! "$REPO_URL" =~ ^(https?|git|ssh):// ]] && [[ ! "$REPO_URL" =~ ^git@ ]] && [[ ! "$REPO_URL" =~ ^/ ]]; then
+if [[ ! "$REPO_URL" =~ ^(https?|git|ssh|file):// ]] && [[ ! "$REPO_URL" =~ ^git@ ]] && [[ ! "$REPO_URL" =~ ^/ ]]; then
   zenity --error --title="Invalid URL" --text="Invalid repository URL format:\n$REPO_URL"
   exit 1
 fi
@@ -37,12 +70,86 @@ if [ -e "$CLONE_PATH" ]; then
   exit 1
 fi
 
-# Perform clone with properly quoted arguments
-OUTPUT=$(git clone "$REPO_URL" "$CLONE_PATH" 2>&1)
+# Choose the kind of clone, preselecting the one last used for this host
+HOST=$(url_host "$REPO_URL")
+LAST_MODE=$(awk -F '\t' -v host="$HOST" '$1 == host { mode = $2 } END { print mode }' \
+  "$CLONE_DEFAULTS" 2>/dev/null)
+MODES=(
+  full "Full" "Complete history and files"
+  shallow "Shallow" "Only the last $CLONE_DEPTH commit(s)"
+  blobless "Blobless" "All commits, file contents downloaded when needed"
+  sparse "Sparse" "Blobless, with only top-level files checked out"
+  reference "Reference" "Reuse the objects of an existing local clone"
+)
+[[ " full shallow blobless sparse reference " == *" $LAST_MODE "* ]] || LAST_MODE=full
+MODE_ROWS=()
+for ((i = 0; i < ${#MODES[@]}; i += 3)); do
+  if [ "${MODES[i]}" = "$LAST_MODE" ]; then MODE_ROWS+=(TRUE); else MODE_ROWS+=(FALSE); fi
+  MODE_ROWS+=("${MODES[@]:i:3}")
+done
+
+MODE=$(zenity --list --radiolist \
+  --title="Git Clone" \
+  --text="How should $REPO_NAME be cloned?" \
+  --column="" --column="Mode" --column="Clone" --column="Downloads" \
+  --hide-column=2 --print-column=2 \
+  --width=550 --height=300 \
+  "${MODE_ROWS[@]}")
+if [ -z "$MODE" ]; then
+  exit 0
+fi
+
+CLONE_ARGS=()
+case "$MODE" in
+  shallow) CLONE_ARGS=(--depth "$CLONE_DEPTH") ;;
+  blobless) CLONE_ARGS=(--filter=blob:none) ;;
+  sparse) CLONE_ARGS=(--filter=blob:none --sparse) ;;
+  reference)
+    REFERENCE=$(zenity --file-selection --directory \
+      --title="Select an existing local clone of $REPO_NAME")
+    if [ -z "$REFERENCE" ]; then
+      exit 0
+    fi
+    if ! is_repo_dir "$REFERENCE"; then
+      zenity --error --title="Not a Git Repository" --text="The folder is not a Git repository:\n$REFERENCE"
+      exit 1
+    fi
+    CLONE_ARGS=(--reference "$REFERENCE")
+    ;;
+esac
+
+# Git ignores --depth and --filter for plain local paths; file:// honours them
+CLONE_URL="$REPO_URL"
+if [[ "$CLONE_URL" == /* ]] && [ "$MODE" != full ] && [ "$MODE" != reference ]; then
+  CLONE_URL="file://$CLONE_URL"
+fi
+
+# Perform clone with properly quoted arguments, showing git's progress
+CLONE_LOG=$(mktemp)
+trap 'rm -f "$CLONE_LOG"' EXIT
+
+run_with_progress "$CLONE_LOG" \
+  --title="Git Clone" --text="Cloning $REPO_URL" \
+  -- git clone --progress "${CLONE_ARGS[@]}" "$CLONE_URL" "$CLONE_PATH"
 EXIT_CODE=$?
 
 if [ $EXIT_CODE -eq 0 ]; then
-  zenity --info --title="Clone Success" --text="Repository cloned successfully to:\n$CLONE_PATH"
+  # Remember the choice for the next clone from this host
+  mkdir -p "$(dirname "$CLONE_DEFAULTS")"
+  { awk -F '\t' -v host="$HOST" '$1 != host' "$CLONE_DEFAULTS" 2>/dev/null
+    printf '%s\t%s\n' "$HOST" "$MODE"; } > "$CLONE_DEFAULTS.tmp" &&
+    mv "$CLONE_DEFAULTS.tmp" "$CLONE_DEFAULTS"
+
+  case "$MODE" in
+    sparse) NOTE="\n\nOnly top-level files are checked out. Add folders with:\ngit sparse-checkout add FOLDER" ;;
+    reference) NOTE="\n\nObjects are borrowed from $REFERENCE; do not delete it while this clone is in use." ;;
+    *) NOTE="" ;;
+  esac
+  zenity --info --title="Clone Success" --text="Repository cloned successfully to:\n$CLONE_PATH$NOTE"
+elif [ $EXIT_CODE -eq 130 ]; then
+  zenity --info --title="Clone Cancelled" --text="The clone was cancelled."
+  exit $EXIT_CODE
 else
-  zenity --error --title="Clone Failed" --text="Git reported an error:\n$OUTPUT"
+  zenity --error --title="Clone Failed" --text="Git reported an error:\n$(cat "$CLONE_LOG")"
+  exit $EXIT_CODE
 fi
@@ -1,42 +1,109 @@
 #!/bin/bash
 # Create a new git branch or switch to an existing one
+#
+# Branches are listed most recently committed first. Only the first
+# NEMO_GIT_BRANCH_LIMIT are shown; "[Search All Branches]" filters the rest.
+# The list is cached per repository until its refs change.
+#
+# Environment:
+#   NEMO_GIT_BRANCH_LIMIT  Branches shown before searching is needed (default: 200)
+
+BRANCH_LIMIT="${NEMO_GIT_BRANCH_LIMIT:-200}"
+NEW_BRANCH="[New Branch]"
+SEARCH_BRANCHES="[Search All Branches]"
+
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+
+# Print the local and remote branches, most recent first, as "name<TAB>date"
+# lines. Branches of origin are shown without the "origin/" prefix, as git
+# checkout creates the tracking branch for them.
+list_branches() {
+    git for-each-ref --sort=-committerdate \
+        --format='%(refname)%09%(committerdate:short)' refs/heads refs/remotes |
+        awk -F '\t' '
+            $1 ~ /\/HEAD$/ { next }
+            { name = $1
+              sub(/^refs\/heads\//, "", name)
+              sub(/^refs\/remotes\/origin\//, "", name)
+              sub(/^refs\/remotes\//, "", name) }
+            !seen[name]++ { print name "\t" $2 }'
+}
+
+# Print the cached branch list, rebuilding it when the refs have changed.
+# Every ref update rewrites packed-refs or renames a file into a refs
+# directory, so their mtimes identify the current state of the refs.
+cached_branches() {
+    local git_dir state key
+    git_dir=$(git rev-parse --git-common-dir) || return 1
+    state=$(repo_state_dir branches "$(git rev-parse --show-toplevel)")
+    key=$(find "$git_dir/packed-refs" "$git_dir/refs/heads" "$git_dir/refs/remotes" "$git_dir/reftable" \
+        \( -type d -o -name packed-refs \) -printf '%p %T@\n' 2>/dev/null | md5sum | cut -d ' ' -f 1)
+
+    if [ "$(cat "$state/key" 2>/dev/null)" != "$key" ]; then
+        mkdir -p "$state"
+        list_branches > "$state/branches.tmp" &&
+            mv "$state/branches.tmp" "$state/branches" &&
+            echo "$key" > "$state/key"
+    fi
+    cat "$state/branches"
+}
+
+# Show branches in an editable list with the given prompt; print the choice
+choose_branch() {
+    tr '\t' '\n' | zenity --list --editable \
+        --text "$1" \
+        --title "Git Create/Switch Branch" \
+        --column "Branches" --column "Last Commit" \
+        --width=500 --height=500
+}
 
 # Navigate to the given directory
 cd "$1"
 PREV_BRANCH=$(git rev-parse --abbrev-ref HEAD)
+BRANCHES=$(cached_branches)
 
 # Get the branch name
 BRANCH_NAME=$(
-    # List all local and remote branches. remove unwanted characters and lines via sed.
-    # Create a drop-down list with an editable text entry.
-    # Prompt for a new branch name
-
-    (git branch -a | \
-    sed -e "s/^..//" -e "s/remotes.origin.//" -e "s/*//" -e "/HEAD detached/d" | \
-    sort -u && echo "[New Branch]"\
-    ) | \
-    zenity --list --editable \
-    --text "Select an existing branch or type a new branch name:" \
-    --title "Git Create/Switch Branch" \
-    --column "Branches"
+    {
+        [ -z "$BRANCHES" ] || head -n "$BRANCH_LIMIT" <<<"$BRANCHES"
+        printf '%s\t\n' "$NEW_BRANCH"
+        [ "$(wc -l <<<"$BRANCHES")" -le "$BRANCH_LIMIT" ] || printf '%s\t\n' "$SEARCH_BRANCHES"
+    } | choose_branch "Select an existing branch or type a new branch name:"
 )
 
-# Check if the branch name is provided
+# Search every branch for the ones whose name contains the given text
+if [ "$BRANCH_NAME" = "$SEARCH_BRANCHES" ]; then
+    FILTER=$(zenity --entry --text "Show branches whose name contains:" --title "Git Search Branches")
+    [ -n "$FILTER" ] || exit 0
+    BRANCH_NAME=$(
+        {
+            awk -F '\t' -v filter="$FILTER" 'index(tolower($1), tolower(filter))' <<<"$BRANCHES"
+            printf '%s\t\n' "$NEW_BRANCH"
+        } | choose_branch "Branches matching '$FILTER':"
+    )
+fi
 
+# Check if the branch name is provided
 if [ -n "$BRANCH_NAME" ]; then
     # If the user chose to create a new branch
-    if [ "$BRANCH_NAME" = "[New Branch]" ]; then
+    if [ "$BRANCH_NAME" = "$NEW_BRANCH" ]; then
         BRANCH_NAME=$(zenity --entry --text "Enter the new branch name" --title "Git Create Branch")
-        git checkout -b "$BRANCH_NAME"
-        echo "$PREV_BRANCH" > ~/.cache/nemo_git_prev_branch
-        echo "$BRANCH_NAME" > ~/.cache/nemo_git_current_branch
-
+        [ -n "$BRANCH_NAME" ] || exit 0
+        OUTPUT=$(git checkout -b "$BRANCH_NAME" 2>&1)
+    elif ! git show-ref --verify -q "refs/heads/$BRANCH_NAME" &&
+        git show-ref --verify -q "refs/remotes/$BRANCH_NAME"; then
+        # A branch of a remote other than origin gets a local tracking branch
+        OUTPUT=$(git checkout --track "$BRANCH_NAME" 2>&1)
     else
-      git checkout "$BRANCH_NAME"
-      echo "$PREV_BRANCH" > ~/.cache/nemo_git_prev_branch
-      echo "$BRANCH_NAME" > ~/.cache/nemo_git_current_branch
+        OUTPUT=$(git checkout "$BRANCH_NAME" 2>&1)
     fi
+    EXIT_CODE=$?
 
-
+    if [ $EXIT_CODE -ne 0 ]; then
+        zenity --error --title "Git Branch Error" --text "Could not switch to '$BRANCH_NAME':\n$OUTPUT"
+        exit $EXIT_CODE
+    fi
+    echo "$PREV_BRANCH" > ~/.cache/nemo_git_prev_branch
+    git rev-parse --abbrev-ref HEAD > ~/.cache/nemo_git_current_branch
 fi
-
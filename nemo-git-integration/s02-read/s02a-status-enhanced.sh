@@ -1,54 +1,82 @@
 #!/bin/bash
 
 # Enhanced version of s02a-status.sh that handles directories with multiple repos
+#
+# A single repository shows the full `git status`. Several repositories are
+# checked in parallel and summarised one line per repo, most urgent first.
+#
+# Environment:
+#   NEMO_GIT_JOBS     Repositories checked at once (default: number of CPUs)
+#   NEMO_GIT_TIMEOUT  Seconds before a repository's status is abandoned (default: 10)
+#   NEMO_GIT_DISCOVERY_*  Repository discovery settings, see ../lib/repos.sh
 
 TARGET_DIR="$1"
+REPO_TIMEOUT="${NEMO_GIT_TIMEOUT:-10}"
 
-# Function to check if a directory is a git repo
-is_git_repo() {
-    [ -d "$1/.git" ]
-}
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+source "$SCRIPT_DIR/../lib/progress.sh"
+
+# Print one tab-separated line for a repo: severity, name, branch, details.
+# Severity orders the summary: 0 error, 1 conflicts, 2 changes, 3 untracked,
+# 4 ahead/behind, 5 clean.
+repo_summary() {
+    local repo_path="$1"
+    local repo_name="${repo_path#"$TARGET_DIR"/}"
+    local output rc
 
-# Function to find all git repos in a directory
-find_git_repos() {
-    local search_dir="$1"
-    local repos=()
-    
-    # Check if the directory itself is a git repo
-    if is_git_repo "$search_dir"; then
-        repos+=("$search_dir")
-    else
-        # Search for subdirectories that are git repos
-        while IFS= read -r -d '' repo; do
-            repos+=("$repo")
-        done < <(find "$search_dir" -maxdepth 2 -type d -name ".git" -printf "%h\0" 2>/dev/null)
+    output=$(LC_ALL=C timeout -k 2 "$REPO_TIMEOUT" \
+        git -C "$repo_path" status --porcelain=v2 --branch 2>&1)
+    rc=$?
+    if [ $rc -eq 124 ] || [ $rc -eq 137 ]; then
+        printf '0\t%s\t?\ttimed out after %ss\n' "$repo_name" "$REPO_TIMEOUT"
+        return
+    elif [ $rc -ne 0 ]; then
+        printf '0\t%s\t?\terror: %s\n' "$repo_name" "$(head -n 1 <<<"$output")"
+        return
     fi
-    
-    printf '%s\n' "${repos[@]}"
+
+    awk -v name="$repo_name" '
+        /^# branch\.head /     { branch = $3 }
+        /^# branch\.upstream / { upstream = 1 }
+        /^# branch\.ab /       { ahead = substr($3, 2) + 0; behind = substr($4, 2) + 0 }
+        /^[12] / {
+            if (substr($2, 1, 1) != ".") staged++
+            if (substr($2, 2, 1) != ".") modified++
+        }
+        /^u /  { conflicts++ }
+        /^\? / { untracked++ }
+        END {
+            severity = 5; detail = ""
+            if (conflicts) { detail = detail conflicts " conflicted, "; severity = 1 }
+            if (staged)    { detail = detail staged " staged, "; if (severity > 2) severity = 2 }
+            if (modified)  { detail = detail modified " modified, "; if (severity > 2) severity = 2 }
+            if (untracked) { detail = detail untracked " untracked, "; if (severity > 3) severity = 3 }
+            if (ahead || behind) {
+                detail = detail "ahead " ahead ", behind " behind ", "
+                if (severity > 4) severity = 4
+            }
+            if (!upstream) detail = detail "no upstream, "
+            if (detail == "" || detail == "no upstream, ") detail = "clean, " detail
+            sub(/, $/, "", detail)
+            printf "%d\t%s\t%s\t%s\n", severity, name, branch, detail
+        }' <<<"$output"
 }
 
-# Function to show git status for a repo
-show_repo_status() {
-    local repo_path="$1"
-    local repo_name=$(basename "$repo_path")
-    
-    cd "$repo_path" || {
-        echo "Error: Could not access directory: $repo_path"
-        return 1
-    }
-    
-    # Run git status and capture output
-    STATUS_OUTPUT=$(git status 2>&1)
-    EXIT_CODE=$?
-    
-    if [ $EXIT_CODE -ne 0 ]; then
-        echo "Error in $repo_name: git status failed:\n$STATUS_OUTPUT"
-        return $EXIT_CODE
-    fi
-    
-    echo "=== Git Status: $repo_name ==="
-    echo "$STATUS_OUTPUT"
-    echo ""
+# Format sorted summary lines into an aligned report
+format_summaries() {
+    sort -t $'\t' -k1,1n -k2,2 "$1" | awk -F '\t' '
+        BEGIN { split("ERROR CONFLICT CHANGED UNTRACKED UNSYNCED CLEAN", label, " ") }
+        { count[$1]++; lines[NR] = sprintf("%-10s %-40s %-24s %s", label[$1 + 1], $2, $3, $4) }
+        END {
+            summary = ""
+            for (s = 0; s <= 5; s++)
+                if (count[s]) summary = summary count[s] " " tolower(label[s + 1]) ", "
+            sub(/, $/, "", summary)
+            print NR " repositories: " summary
+            print ""
+            for (i = 1; i <= NR; i++) print lines[i]
+        }'
 }
 
 # Check if the target directory exists
@@ -56,24 +84,37 @@ if [ ! -d "$TARGET_DIR" ]; then
     zenity --error --title="Error" --text="Directory does not exist: $TARGET_DIR"
     exit 1
 fi
+TARGET_DIR="${TARGET_DIR%/}"
 
 # Find all git repositories
-mapfile -t repos < <(find_git_repos "$TARGET_DIR")
+mapfile -d '' -t repos < <(discover_repos "$TARGET_DIR")
 
 if [ ${#repos[@]} -eq 0 ]; then
     zenity --error --title="Not a Git Repository" --text="'$TARGET_DIR' and its subdirectories are not Git repositories."
     exit 1
 fi
 
-# Generate status output for all repos
-STATUS_OUTPUT=""
-for repo in "${repos[@]}"; do
-    STATUS_OUTPUT+=$(show_repo_status "$repo")
-    STATUS_OUTPUT+=$'\n'
-done
+RESULTS_FILE=$(mktemp)
+trap 'rm -f "$RESULTS_FILE"' EXIT
+
+if [ ${#repos[@]} -eq 1 ]; then
+    # Stream the full status of a single repository
+    run_with_viewer "$RESULTS_FILE" \
+      --title="Git Status: $(basename "${repos[0]}")" \
+      --width=800 --height=600 \
+      -- bash -c 'echo "=== Git Status: $(basename "$1") ==="; exec git -C "$1" status' _ "${repos[0]}"
+    exit 0
+fi
+
+export -f repo_summary
+export TARGET_DIR REPO_TIMEOUT
+if ! run_repos_with_progress "$RESULTS_FILE" repo_summary "Checked" \
+    "Git Status: $(basename "$TARGET_DIR")" "${repos[@]}"; then
+    exit 1
+fi
 
-# Display the output in a scrollable text box
+# Display the summary in a scrollable text box
 zenity --text-info \
   --title="Git Status: $(basename "$TARGET_DIR") (${#repos[@]} repositories)" \
-  --width=800 --height=600 \
-  --filename=<(echo -e "$STATUS_OUTPUT")
+  --width=900 --height=600 --font="monospace" \
+  --filename=<(format_summaries "$RESULTS_FILE")
@@ -3,6 +3,9 @@
 # Get the directory from the argument
 TARGET_DIR="$1"
 
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/progress.sh"
+
 cd "$TARGET_DIR" || {
   zenity --error --title="Error" --text="Could not access directory: $TARGET_DIR"
   exit 1
@@ -14,17 +17,17 @@ if [ ! -d ".git" ]; then
   exit 1
 fi
 
-# Run git status and capture output
-STATUS_OUTPUT=$(git status 2>&1)
+# Stream git status into a scrollable text box as it is produced
+STATUS_LOG=$(mktemp)
+trap 'rm -f "$STATUS_LOG"' EXIT
+
+run_with_viewer "$STATUS_LOG" \
+  --title="Git Status: $(basename "$TARGET_DIR")" \
+  --width=600 --height=400 \
+  -- git status
 EXIT_CODE=$?
 
-if [ $EXIT_CODE -ne 0 ]; then
-  zenity --error --title="Git Error" --text="git status failed:\n$STATUS_OUTPUT"
+if [ $EXIT_CODE -ne 0 ] && [ $EXIT_CODE -ne 130 ]; then
+  zenity --error --title="Git Error" --text="git status failed:\n$(cat "$STATUS_LOG")"
   exit $EXIT_CODE
 fi
-
-# Display the output in a scrollable text box
-zenity --text-info \
-  --title="Git Status: $(basename "$TARGET_DIR")" \
-  --width=600 --height=400 \
-  --filename=<(echo "$STATUS_OUTPUT")
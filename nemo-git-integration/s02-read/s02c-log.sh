@@ -1,7 +1,20 @@
 #!/bin/bash
 
+# Show the decorated history of a repository a page at a time. Each page
+# is streamed into the viewer as git produces it; "Older Commits" loads the
+# next page. Each page reads one commit more than it shows to learn whether
+# there is another, and the last page ends with an end-of-history line.
+#
+# Environment:
+#   NEMO_GIT_LOG_PAGE          Commits per page (default: 500)
+#   NEMO_GIT_LOG_COMMIT_GRAPH  Set to 1 to write a missing commit-graph in the
+#                              background, which speeds up later logs but
+#                              writes to the repository (default: 0)
+
 # Argument: target directory from Nemo (%P)
 TARGET_DIR="$1"
+PAGE_SIZE="${NEMO_GIT_LOG_PAGE:-500}"
+LOG_ARGS=(--graph --decorate --oneline --simplify-by-decoration)
 
 cd "$TARGET_DIR" || {
   zenity --error --title="Directory Error" --text="Cannot access directory:\n$TARGET_DIR"
@@ -14,23 +27,41 @@ if [ ! -d ".git" ]; then
   exit 1
 fi
 
-# Create a formatted Git log
-LOG_OUTPUT=$(git log \
-  --graph \
-  --decorate \
-  --oneline \
-  --simplify-by-decoration 2>&1)
-
-EXIT_CODE=$?
-
-if [ $EXIT_CODE -ne 0 ]; then
+# An empty repository has no log to page through
+if ! git rev-parse -q --verify HEAD >/dev/null; then
+  LOG_OUTPUT=$(git log -n 1 2>&1)
   zenity --error --title="Git Error" --text="git log failed:\n$LOG_OUTPUT"
-  exit $EXIT_CODE
+  exit 1
 fi
 
-# Show the Git log in a scrollable window
-zenity --text-info \
-  --title="Git Log: $(basename "$TARGET_DIR")" \
-  --width=800 \
-  --height=600 \
-  --filename=<(echo "$LOG_OUTPUT")
+# The commit-graph file lets git walk history without parsing every commit.
+# If asked to, repositories without one get it written for next time.
+if [ "${NEMO_GIT_LOG_COMMIT_GRAPH:-0}" = "1" ] &&
+   [ ! -e .git/objects/info/commit-graph ] && [ ! -d .git/objects/info/commit-graphs ]; then
+  nice git commit-graph write --reachable >/dev/null 2>&1 &
+fi
+
+MORE_FLAG=$(mktemp)
+trap 'rm -f "$MORE_FLAG"' EXIT
+
+# Show the Git log a page at a time in a scrollable window
+offset=0
+while :; do
+  # The commit past this page is not shown; reading it marks another page
+  : > "$MORE_FLAG"
+  git log "${LOG_ARGS[@]}" --skip="$offset" -n $((PAGE_SIZE + 1)) 2>&1 |
+    awk -v limit="$PAGE_SIZE" -v flag="$MORE_FLAG" '
+      /^[|\/\\_ .-]*\* / && ++commits > limit { print "more" > flag; more = 1; exit }
+      { print; fflush() }
+      END { if (!more) print "--- end of history ---" }' |
+    zenity --text-info \
+      --title="Git Log: $(basename "$TARGET_DIR") (commits $((offset + 1))-$((offset + PAGE_SIZE)))" \
+      --width=800 \
+      --height=600 \
+      --ok-label="Older Commits" --cancel-label="Close"
+
+  if [ "${PIPESTATUS[2]}" -ne 0 ] || [ ! -s "$MORE_FLAG" ]; then
+    break
+  fi
+  offset=$((offset + PAGE_SIZE))
+done
@@ -1,18 +1,104 @@
 #!/bin/bash
 
+# Fetch one or all remotes of a repository, or every repository found
+# under a folder that is not one itself.
+#
+# In a folder of repositories each one fetches all of its remotes, several
+# repositories at a time, and the results are summarised at the end. The
+# NEMO_GIT_JOBS budget is shared: each repository fetches its remotes with
+# NEMO_GIT_JOBS divided by the number of repositories fetched at once.
+#
+# Environment:
+#   NEMO_GIT_JOBS           Repositories (or remotes) fetched at once (default: number of CPUs)
+#   NEMO_GIT_FETCH_TIMEOUT  Seconds before a repository's fetch is abandoned (default: 120)
+#   NEMO_GIT_FETCH_PRUNE    Set to 1 to also prune deleted remote branches (--prune)
+#   NEMO_GIT_DISCOVERY_*    Repository discovery settings, see ../lib/repos.sh
+
 # Get target directory from Nemo (%P)
 TARGET_DIR="$1"
+REPO_TIMEOUT="${NEMO_GIT_FETCH_TIMEOUT:-120}"
+FETCH_PRUNE=""
+[ "${NEMO_GIT_FETCH_PRUNE:-0}" = "1" ] && FETCH_PRUNE="--prune"
+
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+source "$SCRIPT_DIR/../lib/progress.sh"
+
+# Fetch all remotes of one repository and print one tab-separated line:
+# status (ok, fail or skip), name, details
+fetch_repo() {
+  local repo_path="$1"
+  local repo_name="${repo_path#"$TARGET_DIR"/}"
+  local output rc updated
+
+  if [ -z "$(git -C "$repo_path" remote)" ]; then
+    printf 'skip\t%s\tno remotes\n' "$repo_name"
+    return
+  fi
+
+  output=$(LC_ALL=C GIT_TERMINAL_PROMPT=0 timeout -k 2 "$REPO_TIMEOUT" \
+    git -C "$repo_path" fetch --all --jobs="$REMOTE_JOBS" $FETCH_PRUNE 2>&1)
+  rc=$?
+  if [ $rc -eq 124 ] || [ $rc -eq 137 ]; then
+    printf 'fail\t%s\ttimed out after %ss\n' "$repo_name" "$REPO_TIMEOUT"
+  elif [ $rc -ne 0 ]; then
+    printf 'fail\t%s\t%s\n' "$repo_name" "$(grep -m 1 -E '^(fatal|error):' <<<"$output" || head -n 1 <<<"$output")"
+  else
+    updated=$(grep -c -e ' -> ' <<<"$output")
+    if [ "$updated" -eq 0 ]; then
+      printf 'ok\t%s\tup to date\n' "$repo_name"
+    else
+      printf 'ok\t%s\t%d refs updated\n' "$repo_name" "$updated"
+    fi
+  fi
+}
+
+# Summarise fetch results, failures first
+format_results() {
+  sort -t $'\t' -k1,1 -k2,2 "$1" | awk -F '\t' '
+    { count[$1]++; lines[NR] = sprintf("%-6s %-40s %s", toupper($1), $2, $3) }
+    END {
+      summary = (count["ok"] + 0) " fetched"
+      if (count["fail"]) summary = summary ", " count["fail"] " failed"
+      if (count["skip"]) summary = summary ", " count["skip"] " without remotes"
+      print NR " repositories: " summary
+      print ""
+      for (i = 1; i <= NR; i++) print lines[i]
+    }'
+}
 
 # Step 1: Validate directory
 cd "$TARGET_DIR" || {
   zenity --error --title="Directory Error" --text="Cannot access directory:\n$TARGET_DIR"
   exit 1
 }
+TARGET_DIR="$(pwd)"
 
-# Step 2: Check for Git repository
-if [ ! -d ".git" ]; then
-  zenity --error --title="Not a Git Repo" --text="'$TARGET_DIR' is not a Git repository."
-  exit 1
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+# Step 2: A folder of repositories fetches every one of them
+if ! is_repo_dir .; then
+  mapfile -d '' -t repos < <(discover_repos "$TARGET_DIR")
+  if [ ${#repos[@]} -eq 0 ]; then
+    zenity --error --title="Not a Git Repo" --text="'$TARGET_DIR' is not a Git repository."
+    exit 1
+  fi
+
+  PARALLEL=$((${#repos[@]} < NEMO_GIT_JOBS ? ${#repos[@]} : NEMO_GIT_JOBS))
+  REMOTE_JOBS=$((NEMO_GIT_JOBS / PARALLEL))
+  export -f fetch_repo
+  export TARGET_DIR REPO_TIMEOUT FETCH_PRUNE REMOTE_JOBS
+  if ! run_repos_with_progress "$WORK_DIR/results" fetch_repo "Fetched" \
+    "Git Fetch: $(basename "$TARGET_DIR")" "${repos[@]}"; then
+    exit 1
+  fi
+  zenity --text-info \
+    --title="Git Fetch: $(basename "$TARGET_DIR") (${#repos[@]} repositories)" \
+    --width=900 --height=600 --font="monospace" \
+    --filename=<(format_results "$WORK_DIR/results")
+  grep -q '^fail' "$WORK_DIR/results" && exit 1
+  exit 0
 fi
 
 # Step 3: List remotes
@@ -22,6 +108,11 @@ if [ -z "$REMOTES" ]; then
   exit 1
 fi
 
+ALL_REMOTES="All remotes"
+if [ "$(wc -l <<<"$REMOTES")" -gt 1 ]; then
+  REMOTES=$(printf '%s\n%s' "$ALL_REMOTES" "$REMOTES")
+fi
+
 REMOTE=$(echo "$REMOTES" | zenity --list \
   --title="Select Remote" \
   --text="Choose the remote to fetch from:" \
@@ -33,12 +124,23 @@ if [ -z "$REMOTE" ]; then
   exit 0
 fi
 
-# Step 4: Perform fetch and capture output
-FETCH_OUTPUT=$(git fetch "$REMOTE" 2>&1)
+# Step 4: Perform fetch with progress and capture output
+if [ "$REMOTE" = "$ALL_REMOTES" ]; then
+  FETCH_ARGS=(--all --jobs="$NEMO_GIT_JOBS")
+else
+  FETCH_ARGS=("$REMOTE")
+fi
+run_with_progress "$WORK_DIR/fetch.log" \
+  --title="Git Fetch: $(basename "$TARGET_DIR")" --text="Fetching..." \
+  -- git fetch --progress $FETCH_PRUNE "${FETCH_ARGS[@]}"
 EXIT_CODE=$?
+FETCH_OUTPUT=$(cat "$WORK_DIR/fetch.log")
 
 if [ $EXIT_CODE -eq 0 ]; then
   zenity --info --title="Fetch Complete" --text="Fetched from '$REMOTE' successfully."
+elif [ $EXIT_CODE -eq 130 ]; then
+  zenity --info --title="Cancelled" --text="Fetch cancelled."
+  exit 0
 else
   zenity --error --title="Git Fetch Error" --text="Failed to fetch from '$REMOTE':\n$FETCH_OUTPUT"
   exit $EXIT_CODE
@@ -1,6 +1,14 @@
 #!/bin/bash
 
+# Pull the current repository, or every repository among the selected
+# folders in parallel. Each repository is fetched once and rebased onto the
+# fetched upstream; undo state for s04e-unpull.sh is kept per repository.
 TARGET_DIR="$1"
+shift
+SELECTED=("$@")
+
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
 
 # Step 1: Navigate
 cd "$TARGET_DIR" || {
@@ -8,53 +16,152 @@ cd "$TARGET_DIR" || {
   exit 1
 }
 
-# Step 2: Validate Git repo
-if [ ! -d ".git" ]; then
-  zenity --error --title="Not a Git Repository" --text="The folder is not a Git repository."
-  exit 1
+# Step 2: Pull the selected repositories, or the current one
+REPOS=()
+for item in "${SELECTED[@]}"; do
+  [ -d "$item" ] && is_repo_dir "$item" && REPOS+=("$(realpath -- "$item")")
+done
+if [ ${#REPOS[@]} -eq 0 ]; then
+  if ! is_repo_dir .; then
+    zenity --error --title="Not a Git Repository" --text="The folder is not a Git repository."
+    exit 1
+  fi
+  REPOS=("$(pwd -P)")
 fi
+# Repositories pulled together cannot ask for credentials; they fail instead
+[ ${#REPOS[@]} -gt 1 ] && export GIT_TERMINAL_PROMPT=0
 
 # Step 3: Ask to stash (only if needed)
-if [[ -n $(git status --porcelain) ]]; then
-  zenity --question --title="Uncommitted Changes" \
-    --text="You have local changes. Stash before pulling?" || exit 0
+DIRTY=0
+for repo in "${REPOS[@]}"; do
+  [[ -n $(git -C "$repo" status --porcelain) ]] && DIRTY=$((DIRTY + 1))
+done
+STASH_BEFORE=false
+if [ $DIRTY -gt 0 ]; then
+  if [ ${#REPOS[@]} -eq 1 ]; then
+    zenity --question --title="Uncommitted Changes" \
+      --text="You have local changes. Stash before pulling?" || exit 0
+  else
+    zenity --question --title="Uncommitted Changes" \
+      --text="$DIRTY of ${#REPOS[@]} repositories have local changes. Stash before pulling?" || exit 0
+  fi
   STASH_BEFORE=true
-else
-  STASH_BEFORE=false
 fi
 
-# Step 4: Fetch from remote
-FETCH_MSG=$(git fetch 2>&1)
-if [ $? -ne 0 ]; then
-  zenity --error --title="Git Fetch Failed" --text="$FETCH_MSG"
-  exit 1
-fi
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+declare -A RESULT_FILES
+n=0
+for repo in "${REPOS[@]}"; do
+  n=$((n + 1))
+  RESULT_FILES["$repo"]="$WORK_DIR/repo-$n"
+done
 
-# Step 5: Stash if needed
-if $STASH_BEFORE; then
-  STASH_MSG=$(git stash push -u 2>&1)
-  if [ $? -ne 0 ]; then
-    zenity --error --title="Stash Failed" --text="$STASH_MSG"
-    exit 1
+# Pull one repository. Writes its exit status to RESULT.status and the
+# messages to show to RESULT.
+pull_repo() {
+  local repo="$1"
+  local result="${RESULT_FILES[$repo]}"
+  local state stashed=false msg rc before after
+
+  pull_failed() {
+    printf '%s\n' "$1" > "$result"
+    echo 1 > "$result.status"
+  }
+
+  # Step 4: Fetch from remote once; the rebase below reuses the fetched refs
+  if ! msg=$(git -C "$repo" fetch 2>&1); then
+    pull_failed "Git fetch failed: $msg"
+    return
+  fi
+  if ! git -C "$repo" rev-parse -q --verify "@{upstream}" >/dev/null 2>&1; then
+    pull_failed "No upstream branch is configured for the current branch."
+    return
   fi
-fi
 
-# Step 6: Pull with rebase
-mkdir -p "$HOME/.cache/nemo_git_pull_state"
-git rev-parse HEAD > "$HOME/.cache/nemo_git_pull_state/head_before_pull"
-echo "$STASH_BEFORE" > "$HOME/.cache/nemo_git_pull_state/was_stashed"
-PULL_MSG=$(git pull --rebase 2>&1)
-PULL_EXIT=$?
+  # Step 5: Stash if needed
+  if $STASH_BEFORE && [[ -n $(git -C "$repo" status --porcelain) ]]; then
+    if ! msg=$(git -C "$repo" stash push -u 2>&1); then
+      pull_failed "Stash failed: $msg"
+      return
+    fi
+    stashed=true
+  fi
 
-# Step 7: Restore stash if it was pushed
-if $STASH_BEFORE; then
-  STASH_POP_MSG=$(git stash pop 2>&1)
-fi
+  # Step 6: Rebase onto the fetched upstream, keeping undo state per repository
+  state=$(repo_state_dir pull "$repo")
+  mkdir -p "$state"
+  printf '%s\n' "$repo" > "$state/repo"
+  before=$(git -C "$repo" rev-parse HEAD)
+  echo "$before" > "$state/head_before_pull"
+  echo "$stashed" > "$state/was_stashed"
+  if $stashed; then
+    git -C "$repo" rev-parse stash@{0} > "$state/stash_commit"
+  else
+    rm -f "$state/stash_commit"
+  fi
+
+  msg=$(git -C "$repo" rebase -q --fork-point "@{upstream}" 2>&1)
+  rc=$?
+  if [ $rc -ne 0 ]; then
+    # Leave the repository as it was rather than mid-rebase
+    git -C "$repo" rebase --abort >/dev/null 2>&1
+    msg+=$'\n'"The rebase was aborted; resolve the conflicts with a manual pull."
+  else
+    after=$(git -C "$repo" rev-parse HEAD)
+    if [ "$before" = "$after" ]; then
+      msg="Already up to date."
+    else
+      msg="Updated ${before:0:7}..${after:0:7} with $(git -C "$repo" rev-list --count "$before..@{upstream}") new commits from $(git -C "$repo" rev-parse --abbrev-ref "@{upstream}")."
+    fi
+  fi
+
+  # Step 7: Restore stash if it was pushed
+  if $stashed && ! git -C "$repo" stash pop >/dev/null 2>&1; then
+    msg+=$'\n'"Your local changes could not be restored and are kept in the stash."
+  fi
+
+  printf '%s\n' "$msg" > "$result"
+  echo "$rc" > "$result.status"
+}
+
+for_each_repo pull_repo "${REPOS[@]}"
 
 # Step 8: Show results
-if [ $PULL_EXIT -eq 0 ]; then
-  zenity --info --title="Git Pull Successful" --text="$PULL_MSG"
+if [ ${#REPOS[@]} -eq 1 ]; then
+  result="${RESULT_FILES[${REPOS[0]}]}"
+  PULL_MSG=$(cat "$result" 2>/dev/null)
+  PULL_EXIT=$(cat "$result.status" 2>/dev/null || echo 1)
+  if [ "$PULL_EXIT" -eq 0 ]; then
+    zenity --info --title="Git Pull Successful" --text="$PULL_MSG"
+  else
+    zenity --error --title="Git Pull Error" --text="$PULL_MSG"
+    exit "$PULL_EXIT"
+  fi
+  exit 0
+fi
+
+# Failed repositories are listed first
+FAILED=0
+FAILED_NAMES=""
+FAILED_MSG=""
+RESULTS_MSG=""
+while IFS= read -r -d '' repo; do
+  result="${RESULT_FILES[$repo]}"
+  if [ "$(cat "$result.status" 2>/dev/null || echo 1)" -eq 0 ]; then
+    RESULTS_MSG+="$(basename "$repo"): $(paste -s -d ' ' "$result")\n"
+  else
+    FAILED=$((FAILED + 1))
+    FAILED_NAMES+="${FAILED_NAMES:+, }$(basename "$repo")"
+    FAILED_MSG+="$(basename "$repo"): FAILED\n$(cat "$result" 2>/dev/null)\n"
+  fi
+done < <(printf '%s\0' "${REPOS[@]}" | sort -z)
+
+if [ $FAILED -eq 0 ]; then
+  zenity --info --title="Git Pull Successful" \
+    --text="Pulled ${#REPOS[@]} repositories:\n\n$RESULTS_MSG"
 else
-  zenity --error --title="Git Pull Error" --text="$PULL_MSG"
-  exit $PULL_EXIT
+  zenity --error --title="Git Pull Error" \
+    --text="$FAILED of ${#REPOS[@]} repositories failed to pull: $FAILED_NAMES\n\n$FAILED_MSG$RESULTS_MSG"
+  exit 1
 fi
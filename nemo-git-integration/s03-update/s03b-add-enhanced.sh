@@ -1,38 +1,25 @@
 #!/bin/bash
 
 # Enhanced version of s03b-add.sh that handles multiple repos
+#
+# Selected files are grouped by repository and staged with a single
+# `git add --pathspec-from-file` per repository, repositories in parallel.
 TARGET_DIR="$1"
 shift
 SELECTED_FILES=("$@")
 
-# Function to check if a path is in a git repo and get the repo root
-get_git_repo_root() {
-    local path="$1"
-    local dir="$path"
-    
-    # If it's a file, get its directory
-    if [ -f "$path" ]; then
-        dir="$(dirname "$path")"
-    fi
-    
-    # Convert to absolute path
-    dir="$(realpath "$dir")"
-    
-    # Walk up to find .git directory
-    while [ "$dir" != "/" ]; do
-        if [ -d "$dir/.git" ]; then
-            echo "$dir"
-            return 0
-        fi
-        dir="$(dirname "$dir")"
-    done
-    
-    return 1
-}
+# Staged file names are listed individually up to this many per repository
+MAX_LISTED_FILES=20
 
-# Group files by their git repository
-declare -A repos_to_files
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+# Validate the selection, then group files by their git repository
 declare -A failed_files
+valid_files=()
 
 for file in "${SELECTED_FILES[@]}"; do
     # Validate file path to prevent command injection (check for dangerous characters)
@@ -45,15 +32,13 @@ for file in "${SELECTED_FILES[@]}"; do
         failed_files["$file"]="File does not exist"
         continue
     fi
-    
-    repo_root=$(get_git_repo_root "$file")
-    if [ $? -eq 0 ]; then
-        # Get relative path from repo root
-        rel_path=$(realpath --relative-to="$repo_root" "$file")
-        repos_to_files["$repo_root"]+="$rel_path "
-    else
-        failed_files["$file"]="Not in a git repository"
-    fi
+
+    valid_files+=("$file")
+done
+
+group_by_repo "$WORK_DIR" "${valid_files[@]}"
+for file in "${OUTSIDE_REPO[@]}"; do
+    failed_files["$file"]="Not in a git repository"
 done
 
 # Show failed files if any
@@ -66,58 +51,48 @@ if [ ${#failed_files[@]} -gt 0 ]; then
 fi
 
 # Exit if no files in valid repos
-if [ ${#repos_to_files[@]} -eq 0 ]; then
+if [ ${#REPO_LISTS[@]} -eq 0 ]; then
     zenity --error --title="Git Add - No Valid Files" --text="No files are in valid git repositories."
     exit 1
 fi
 
 # Confirm intent
 total_files=0
-for repo_root in "${!repos_to_files[@]}"; do
-    files=${repos_to_files[$repo_root]}
-    for file in $files; do
-        ((total_files++))
-    done
+for count in "${REPO_COUNTS[@]}"; do
+    total_files=$((total_files + count))
 done
 
 zenity --question --title="Git Add" --text="Add $total_files selected files to staging in their respective repositories?" || exit 0
 
-# Process each repository
-declare -A repo_results
+# Stage one repository's files in a single index update and write a
+# summary next to its file list
+stage_repo() {
+    local repo_root="$1"
+    local list="${REPO_LISTS[$repo_root]}"
+    local staged=() failed=() result
 
-for repo_root in "${!repos_to_files[@]}"; do
-    cd "$repo_root" || {
-        repo_results["$repo_root"]="Failed to access directory"
-        continue
-    }
-    
-    files=${repos_to_files[$repo_root]}
-    added_files=""
-    failed_files_in_repo=""
-    
-    for file in $files; do
-        if git add "$file" 2>/dev/null; then
-            added_files+="$file\n"
-        else
-            failed_files_in_repo+="$file "
-        fi
-    done
-    
-    result_msg="Repository: $(basename "$repo_root")\n"
-    if [ -n "$added_files" ]; then
-        result_msg+="Successfully staged:\n$added_files"
+    git_batch "$repo_root" "$list" add
+    mapfile -d '' -t staged < "$list.done"
+    mapfile -d '' -t failed < "$list.failed"
+
+    result="Repository: $(basename "$repo_root")\n"
+    if [ ${#staged[@]} -gt 0 ] && [ ${#staged[@]} -le $MAX_LISTED_FILES ]; then
+        result+="Successfully staged:\n$(printf '%s\\n' "${staged[@]}")"
+    elif [ ${#staged[@]} -gt 0 ]; then
+        result+="Successfully staged ${#staged[@]} files\n"
     fi
-    if [ -n "$failed_files_in_repo" ]; then
-        result_msg+="Failed to add: $failed_files_in_repo\n"
+    if [ ${#failed[@]} -gt 0 ]; then
+        result+="Failed to add: ${failed[*]}\n"
     fi
-    
-    repo_results["$repo_root"]="$result_msg"
-done
+    printf '%s' "$result" > "$list.result"
+}
+
+for_each_repo stage_repo "${!REPO_LISTS[@]}"
 
 # Show results
 results_msg="Git Add Results:\n\n"
-for repo_root in "${!repo_results[@]}"; do
-    results_msg+="${repo_results[$repo_root]}\n"
-done
+while IFS= read -r -d '' repo_root; do
+    results_msg+="$(cat "${REPO_LISTS[$repo_root]}.result" 2>/dev/null || echo "Repository: $(basename "$repo_root")\nFailed to stage files")\n\n"
+done < <(printf '%s\0' "${!REPO_LISTS[@]}" | sort -z)
 
 zenity --info --title="Git Add Complete" --text="$results_msg"
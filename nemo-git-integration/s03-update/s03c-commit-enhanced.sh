@@ -1,38 +1,26 @@
 #!/bin/bash
 
 # Enhanced version of s03c-commit.sh that handles multiple repos
+#
+# Selected files are grouped by repository. The commit message is asked for
+# once, then each repository stages its files in one batch and commits,
+# repositories in parallel.
 TARGET_DIR="$1"
 shift
 SELECTED_FILES=("$@")
 
-# Function to check if a path is in a git repo and get the repo root
-get_git_repo_root() {
-    local path="$1"
-    local dir="$path"
-    
-    # If it's a file, get its directory
-    if [ -f "$path" ]; then
-        dir="$(dirname "$path")"
-    fi
-    
-    # Convert to absolute path
-    dir="$(realpath "$dir")"
-    
-    # Walk up to find .git directory
-    while [ "$dir" != "/" ]; do
-        if [ -d "$dir/.git" ]; then
-            echo "$dir"
-            return 0
-        fi
-        dir="$(dirname "$dir")"
-    done
-    
-    return 1
-}
+# Committed file names are listed individually up to this many per repository
+MAX_LISTED_FILES=20
 
-# Group files by their git repository
-declare -A repos_to_files
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+# Validate the selection, then group files by their git repository
 declare -A failed_files
+valid_files=()
 
 for file in "${SELECTED_FILES[@]}"; do
     # Validate file path to prevent command injection (check for dangerous characters)
@@ -45,15 +33,13 @@ for file in "${SELECTED_FILES[@]}"; do
         failed_files["$file"]="File does not exist"
         continue
     fi
-    
-    repo_root=$(get_git_repo_root "$file")
-    if [ $? -eq 0 ]; then
-        # Get relative path from repo root
-        rel_path=$(realpath --relative-to="$repo_root" "$file")
-        repos_to_files["$repo_root"]+="$rel_path "
-    else
-        failed_files["$file"]="Not in a git repository"
-    fi
+
+    valid_files+=("$file")
+done
+
+group_by_repo "$WORK_DIR" "${valid_files[@]}"
+for file in "${OUTSIDE_REPO[@]}"; do
+    failed_files["$file"]="Not in a git repository"
 done
 
 # Show failed files if any
@@ -66,18 +52,15 @@ if [ ${#failed_files[@]} -gt 0 ]; then
 fi
 
 # Exit if no files in valid repos
-if [ ${#repos_to_files[@]} -eq 0 ]; then
+if [ ${#REPO_LISTS[@]} -eq 0 ]; then
     zenity --error --title="Git Commit - No Valid Files" --text="No files are in valid git repositories."
     exit 1
 fi
 
 # Confirm selected files exist
 total_files=0
-for repo_root in "${!repos_to_files[@]}"; do
-    files=${repos_to_files[$repo_root]}
-    for file in $files; do
-        ((total_files++))
-    done
+for count in "${REPO_COUNTS[@]}"; do
+    total_files=$((total_files + count))
 done
 
 if [ $total_files -eq 0 ]; then
@@ -86,7 +69,11 @@ if [ $total_files -eq 0 ]; then
 fi
 
 # Ask for commit message
-COMMIT_MSG=$(zenity --entry --title="Git Commit" --text="Enter a commit message for $total_files files:")
+if [ ${#REPO_LISTS[@]} -gt 1 ]; then
+    COMMIT_MSG=$(zenity --entry --title="Git Commit" --text="Enter a commit message for $total_files files in ${#REPO_LISTS[@]} repositories:")
+else
+    COMMIT_MSG=$(zenity --entry --title="Git Commit" --text="Enter a commit message for $total_files files:")
+fi
 
 # Exit if user cancels or leaves message empty
 if [ -z "$COMMIT_MSG" ]; then
@@ -97,48 +84,44 @@ fi
 # Sanitize commit message to prevent command injection
 COMMIT_MSG=$(echo "$COMMIT_MSG" | tr -d '\000\001\002\003\004\005\006\007\010\011\012\013\014\015\016\017\020\021\022\023\024\025\026\027\030\031\032\033\034\035\036\037\177')
 
-# Process each repository
-declare -A repo_results
+printf '%s\n' "$COMMIT_MSG" > "$WORK_DIR/message"
 
-for repo_root in "${!repos_to_files[@]}"; do
-    cd "$repo_root" || {
-        repo_results["$repo_root"]="Failed to access directory"
-        continue
-    }
-    
-    files=${repos_to_files[$repo_root]}
-    
-    # Stage the files
-    staged_files=""
-    failed_files_in_repo=""
-    for file in $files; do
-        if git add "$file" 2>/dev/null; then
-            staged_files+="$file "
+# Stage one repository's files in a single batch, commit them and write a
+# summary next to its file list
+commit_repo() {
+    local repo_root="$1"
+    local list="${REPO_LISTS[$repo_root]}"
+    local staged=() failed=() result output
+
+    git_batch "$repo_root" "$list" add
+    mapfile -d '' -t staged < "$list.done"
+    mapfile -d '' -t failed < "$list.failed"
+
+    result="Repository: $(basename "$repo_root")\n"
+    if [ ${#staged[@]} -gt 0 ]; then
+        if output=$(git -C "$repo_root" commit -q -F "$WORK_DIR/message" 2>&1); then
+            result+="Successfully committed: "
         else
-            failed_files_in_repo+="$file "
+            result+="Commit failed ($(head -n 1 <<<"$output")) for: "
         fi
-    done
-    
-    # Commit the changes
-    result_msg="Repository: $(basename "$repo_root")\n"
-    if [ -n "$staged_files" ]; then
-        if git commit -m "$COMMIT_MSG"; then
-            result_msg+="Successfully committed: $staged_files\n"
+        if [ ${#staged[@]} -le $MAX_LISTED_FILES ]; then
+            result+="${staged[*]}\n"
         else
-            result_msg+="Commit failed for: $staged_files\n"
+            result+="${#staged[@]} files\n"
         fi
     fi
-    if [ -n "$failed_files_in_repo" ]; then
-        result_msg+="Failed to stage: $failed_files_in_repo\n"
+    if [ ${#failed[@]} -gt 0 ]; then
+        result+="Failed to stage: ${failed[*]}\n"
     fi
-    
-    repo_results["$repo_root"]="$result_msg"
-done
+    printf '%s' "$result" > "$list.result"
+}
+
+for_each_repo commit_repo "${!REPO_LISTS[@]}"
 
 # Show results
 results_msg="Git Commit Results:\n\n"
-for repo_root in "${!repo_results[@]}"; do
-    results_msg+="${repo_results[$repo_root]}\n"
-done
+while IFS= read -r -d '' repo_root; do
+    results_msg+="$(cat "${REPO_LISTS[$repo_root]}.result" 2>/dev/null || echo "Repository: $(basename "$repo_root")\nCommit failed")\n\n"
+done < <(printf '%s\0' "${!REPO_LISTS[@]}" | sort -z)
 
 zenity --info --title="Commit Complete" --text="$results_msg"
@@ -1,17 +1,139 @@
 #!/bin/bash
 
+# Push the current branch of the current repository, or of every repository
+# among the selected folders. With several repositories, those with nothing
+# to push are skipped and the rest are pushed in parallel.
 TARGET_DIR="$1"
+shift
+SELECTED=("$@")
+
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+source "$SCRIPT_DIR/../lib/progress.sh"
+
+# Print what would be pushed from a repository's current branch as one
+# tab-separated line: branch, upstream remote, upstream ref, upstream name
+# and ahead/behind counts, all read by a single git command
+branch_state() {
+  git -C "$1" for-each-ref --points-at=HEAD \
+    --format='%(HEAD)%09%(refname:short)%09%(upstream:remotename)%09%(upstream:remoteref)%09%(upstream:short)%09%(upstream:track,nobracket)' \
+    refs/heads | awk -F '\t' '$1 == "*"' | cut -f 2-
+}
+
+# Push one repository's current branch to its upstream, writing the outcome
+# to RESULT and its exit status to RESULT.status
+push_repo() {
+  local repo="$1"
+  local result="${RESULT_FILES[$repo]}"
+  local msg rc
+
+  msg=$(git -C "$repo" push -q "${PUSH_REMOTE[$repo]}" "HEAD:${PUSH_REF[$repo]}" 2>&1)
+  rc=$?
+  if [ $rc -eq 0 ]; then
+    msg="${PUSH_SUMMARY[$repo]}"
+  fi
+  printf '%s\n' "$msg" > "$result"
+  echo "$rc" > "$result.status"
+}
+
 cd "$TARGET_DIR" || {
   zenity --error --title="Directory Error" --text="Cannot access: $TARGET_DIR"
   exit 1
 }
 
+# Several selected repositories are pushed together
+REPOS=()
+for item in "${SELECTED[@]}"; do
+  [ -d "$item" ] && is_repo_dir "$item" && REPOS+=("$(realpath -- "$item")")
+done
+if [ ${#REPOS[@]} -eq 1 ]; then
+  cd "${REPOS[0]}" || exit 1
+  TARGET_DIR="${REPOS[0]}"
+elif [ ${#REPOS[@]} -gt 1 ]; then
+  WORK_DIR=$(mktemp -d)
+  trap 'rm -rf "$WORK_DIR"' EXIT
+  declare -A RESULT_FILES PUSH_REMOTE PUSH_REF PUSH_SUMMARY
+  TO_PUSH=()
+  SKIPPED_MSG=""
+
+  # One pass over the repositories decides which have anything to push
+  n=0
+  while IFS= read -r -d '' repo; do
+    n=$((n + 1))
+    IFS=$'\t' read -r branch remote ref upstream track < <(branch_state "$repo")
+    ahead=0
+    behind=0
+    [[ "$track" =~ ahead\ ([0-9]+) ]] && ahead="${BASH_REMATCH[1]}"
+    [[ "$track" =~ behind\ ([0-9]+) ]] && behind="${BASH_REMATCH[1]}"
+
+    if [ -z "$branch" ]; then
+      reason="not on a branch"
+    elif [ -z "$upstream" ]; then
+      reason="no upstream for '$branch'; push it on its own to set one"
+    elif [ "$track" = "gone" ]; then
+      reason="'$upstream' no longer exists"
+    elif [ "$ahead" -eq 0 ]; then
+      reason="nothing to push"
+    elif [ "$behind" -gt 0 ]; then
+      reason="'$branch' is $behind commits behind '$upstream'; pull first"
+    else
+      RESULT_FILES["$repo"]="$WORK_DIR/repo-$n"
+      PUSH_REMOTE["$repo"]="$remote"
+      PUSH_REF["$repo"]="$ref"
+      PUSH_SUMMARY["$repo"]="pushed $ahead commits to '$upstream'"
+      TO_PUSH+=("$repo")
+      continue
+    fi
+    SKIPPED_MSG+="$(basename "$repo"): $reason\n"
+  done < <(printf '%s\0' "${REPOS[@]}" | sort -z)
+
+  if [ ${#TO_PUSH[@]} -eq 0 ]; then
+    zenity --info --title="Nothing to Push" \
+      --text="None of the ${#REPOS[@]} repositories has commits to push:\n\n$SKIPPED_MSG"
+    exit 0
+  fi
+
+  # Repositories pushed together cannot ask for credentials; they fail instead
+  export GIT_TERMINAL_PROMPT=0
+  for_each_repo push_repo "${TO_PUSH[@]}"
+
+  # Failed repositories are listed first
+  FAILED=0
+  FAILED_NAMES=""
+  FAILED_MSG=""
+  RESULTS_MSG=""
+  for repo in "${TO_PUSH[@]}"; do
+    result="${RESULT_FILES[$repo]}"
+    if [ "$(cat "$result.status" 2>/dev/null || echo 1)" -eq 0 ]; then
+      RESULTS_MSG+="$(basename "$repo"): $(cat "$result")\n"
+    else
+      FAILED=$((FAILED + 1))
+      FAILED_NAMES+="${FAILED_NAMES:+, }$(basename "$repo")"
+      FAILED_MSG+="$(basename "$repo"): FAILED\n$(cat "$result" 2>/dev/null)\n"
+    fi
+  done
+  [ -z "$SKIPPED_MSG" ] || RESULTS_MSG+="\nSkipped:\n$SKIPPED_MSG"
+
+  if [ $FAILED -eq 0 ]; then
+    zenity --info --title="Push Successful" \
+      --text="Pushed ${#TO_PUSH[@]} of ${#REPOS[@]} repositories:\n\n$RESULTS_MSG"
+  else
+    zenity --error --title="Push Failed" \
+      --text="$FAILED of ${#TO_PUSH[@]} repositories failed to push: $FAILED_NAMES\n\n$FAILED_MSG$RESULTS_MSG"
+    exit 1
+  fi
+  exit 0
+fi
+
 # Ensure this is a git repo
-if [ ! -d .git ]; then
+if ! is_repo_dir .; then
   zenity --error --title="Not a Git Repository" --text="This directory is not a Git repository."
   exit 1
 fi
 
+PUSH_LOG=$(mktemp)
+trap 'rm -f "$PUSH_LOG"' EXIT
+
 # Get the current branch
 CURRENT_BRANCH=$(git rev-parse --abbrev-ref HEAD)
 
@@ -34,17 +156,29 @@ if [ -z "$UPSTREAM_SET" ]; then
     exit 0
   fi
 
-  if git push --set-upstream "$REMOTE" "$CURRENT_BRANCH"; then
+  run_with_progress "$PUSH_LOG" --title="Git Push" --text="Pushing '$CURRENT_BRANCH' to '$REMOTE'..." \
+    -- git push --progress --set-upstream "$REMOTE" "$CURRENT_BRANCH"
+  PUSH_EXIT=$?
+  if [ $PUSH_EXIT -eq 0 ]; then
     zenity --info --title="Push Successful" --text="Branch '$CURRENT_BRANCH' pushed and upstream set."
+  elif [ $PUSH_EXIT -eq 130 ]; then
+    zenity --info --title="Push Cancelled" --text="Push was cancelled."
+    exit 1
   else
-    zenity --error --title="Push Failed" --text="Failed to push and set upstream."
+    zenity --error --title="Push Failed" --text="Failed to push and set upstream.\n\n$(cat "$PUSH_LOG")"
     exit 1
   fi
 else
-  if git push; then
+  run_with_progress "$PUSH_LOG" --title="Git Push" --text="Pushing to '$UPSTREAM_SET'..." \
+    -- git push --progress
+  PUSH_EXIT=$?
+  if [ $PUSH_EXIT -eq 0 ]; then
     zenity --info --title="Push Successful" --text="Changes pushed to '$UPSTREAM_SET'."
+  elif [ $PUSH_EXIT -eq 130 ]; then
+    zenity --info --title="Push Cancelled" --text="Push was cancelled."
+    exit 1
   else
-    zenity --error --title="Push Failed" --text="Failed to push to '$UPSTREAM_SET'."
+    zenity --error --title="Push Failed" --text="Failed to push to '$UPSTREAM_SET'.\n\n$(cat "$PUSH_LOG")"
     exit 1
   fi
 fi
@@ -1,14 +1,25 @@
 #!/bin/bash
 
+# Discard local changes to the selected files. Selections are grouped by
+# repository and each repository restores all of its files in one
+# `git restore`, repositories in parallel.
 TARGET_DIR="$1"
 shift
+
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+
 cd "$TARGET_DIR" || {
   zenity --error --title="Directory Error" --text="Cannot access: $TARGET_DIR"
   exit 1
 }
 
-# Ensure it's a Git repo
-if [ ! -d .git ]; then
+# Ensure the selection is inside Git repositories
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+group_by_repo "$WORK_DIR" "$@"
+
+if [ ${#REPO_LISTS[@]} -eq 0 ]; then
   zenity --error --title="Not a Git Repository" --text="This directory is not a Git repository."
   exit 1
 fi
@@ -22,14 +33,17 @@ if [ $? -ne 0 ]; then
   exit 0
 fi
 
-# Attempt to restore each selected file
-ERRORS=()
-for FILE in "$@"; do
-  if git restore "$FILE" 2>/dev/null; then
-    echo "Restored $FILE"
-  else
-    ERRORS+=("$FILE")
-  fi
+# Restore each repository's files in one batch
+restore_repo() {
+  git_batch "$1" "${REPO_LISTS[$1]}" restore
+}
+
+for_each_repo restore_repo "${!REPO_LISTS[@]}"
+
+ERRORS=("${OUTSIDE_REPO[@]}")
+for REPO in "${!REPO_LISTS[@]}"; do
+  mapfile -d '' -t FAILED < "${REPO_LISTS[$REPO]}.failed"
+  ERRORS+=("${FAILED[@]}")
 done
 
 if [ ${#ERRORS[@]} -eq 0 ]; then
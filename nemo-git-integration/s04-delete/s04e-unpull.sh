@@ -1,18 +1,23 @@
 #!/bin/bash
 
 TARGET_DIR="$1"
-STATE_DIR="$HOME/.cache/nemo_git_pull_state"
+
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
 
 cd "$TARGET_DIR" || {
   zenity --error --title="Directory Error" --text="Cannot access: $TARGET_DIR"
   exit 1
 }
 
-if [ ! -d ".git" ]; then
+if ! is_repo_dir .; then
   zenity --error --title="Not a Git Repository" --text="The folder is not a Git repository."
   exit 1
 fi
 
+# Pull state is kept per repository by s03a-pull.sh
+STATE_DIR=$(repo_state_dir pull "$(pwd -P)")
+
 if [ ! -d "$STATE_DIR" ]; then
   zenity --error --title="State Missing" --text="No pull state found to undo."
   exit 1
@@ -20,6 +25,7 @@ fi
 
 PULL_HEAD_FILE="$STATE_DIR/head_before_pull"
 STASHED_FILE="$STATE_DIR/was_stashed"
+STASH_COMMIT_FILE="$STATE_DIR/stash_commit"
 
 if [ ! -f "$PULL_HEAD_FILE" ]; then
   zenity --error --title="State Missing" --text="Missing saved HEAD commit hash."
@@ -43,9 +49,14 @@ if [ $? -ne 0 ]; then
   exit 1
 fi
 
-# Restore stash if we stashed before
+# Restore stash if we stashed before; the pull already popped it, so apply
+# the recorded stash commit rather than whatever is on top of the stash
 if [ "$WAS_STASHED" = "true" ]; then
-  git stash apply
+  if [ -s "$STASH_COMMIT_FILE" ]; then
+    git stash apply "$(cat "$STASH_COMMIT_FILE")"
+  else
+    git stash apply
+  fi
   if [ $? -eq 0 ]; then
     zenity --info --title="Unpull Success" --text="Reset to pre-pull state and restored stash."
   else
@@ -1,17 +1,28 @@
 #!/bin/bash
 
+# Unstage the selected files (the target directory when nothing is
+# selected). Selections are grouped by repository and each repository
+# unstages all of its files in one command, repositories in parallel.
 TARGET_DIR="$1"
 shift
 SELECTED_FILES=("$@")
 
+SCRIPT_DIR="$(dirname "$(readlink -f "${BASH_SOURCE[0]}")")"
+source "$SCRIPT_DIR/../lib/repos.sh"
+
 # Step 1: Navigate
 cd "$TARGET_DIR" || {
   zenity --error --title="Directory Error" --text="Cannot access: $TARGET_DIR"
   exit 1
 }
+[ ${#SELECTED_FILES[@]} -gt 0 ] || SELECTED_FILES=(.)
+
+# Step 2: Group the selection by Git repository
+WORK_DIR=$(mktemp -d)
+trap 'rm -rf "$WORK_DIR"' EXIT
+group_by_repo "$WORK_DIR" "${SELECTED_FILES[@]}"
 
-# Step 2: Validate Git repo
-if [ ! -d ".git" ]; then
+if [ ${#REPO_LISTS[@]} -eq 0 ]; then
   zenity --error --title="Not a Git Repository" --text="This is not a Git repository."
   exit 1
 fi
@@ -19,20 +30,31 @@ fi
 # Step 3: Confirm intent
 zenity --question --title="Git Unstage" --text="Unstage selected files?" || exit 0
 
-# Step 4: Run git restore --staged or git reset for each file and collect output
-UNSTAGED_FILES=""
-for file in "${SELECTED_FILES[@]}"; do
-  if git restore --staged "$file" 2>/dev/null; then
-    UNSTAGED_FILES+="$file\n"
+# Step 4: Unstage each repository's files in one batch. Before the first
+# commit there is no HEAD to restore from, so entries are dropped instead.
+unstage_repo() {
+  if git -C "$1" rev-parse -q --verify HEAD >/dev/null; then
+    git_batch "$1" "${REPO_LISTS[$1]}" restore --staged
   else
-    # Fallback for older Git versions without 'git restore'
-    if git reset "$file" 2>/dev/null; then
-      UNSTAGED_FILES+="$file\n"
-    else
-      zenity --warning --title="Unstage Warning" --text="Failed to unstage: $file"
-    fi
+    git_batch "$1" "${REPO_LISTS[$1]}" rm -r -q --cached
   fi
-done
+}
+
+for_each_repo unstage_repo "${!REPO_LISTS[@]}"
+
+UNSTAGED_FILES=""
+FAILED_FILES=("${OUTSIDE_REPO[@]}")
+while IFS= read -r -d '' REPO; do
+  LIST="${REPO_LISTS[$REPO]}"
+  mapfile -d '' -t DONE < "$LIST.done"
+  mapfile -d '' -t FAILED < "$LIST.failed"
+  [ ${#DONE[@]} -gt 0 ] && UNSTAGED_FILES+="$(printf '%s\\n' "${DONE[@]}")"
+  FAILED_FILES+=("${FAILED[@]}")
+done < <(printf '%s\0' "${!REPO_LISTS[@]}" | sort -z)
+
+if [ ${#FAILED_FILES[@]} -gt 0 ]; then
+  zenity --warning --title="Unstage Warning" --text="Failed to unstage: ${FAILED_FILES[*]}"
+fi
 
 # Step 5: Show results
 if [ -n "$UNSTAGED_FILES" ]; then
@@ -6,22 +6,66 @@ Provides Git status columns in Nemo file manager.
 Optimized for performance with caching and security best practices.
 """
 
+import cProfile
+import concurrent.futures
+import functools
+import hashlib
+import json
 import logging
 import os
+import posixpath
 import re
 import subprocess
 import threading
 import time
-from typing import Dict, Optional, Tuple
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
 from urllib.parse import urlparse, unquote
 
 from gi.repository import Nemo, GObject
 
+try:
+    from gi.repository import Gio
+except ImportError:  # Gio is optional; all columns are computed without it
+    Gio = None
+
 # Configuration
 CACHE_TTL = 3  # seconds
 GIT_TIMEOUT = 3  # seconds
+GIT_EXECUTABLE = "git"  # resolved against /bin:/usr/bin since git runs with a clean environment
+MAX_GIT_PROCESSES = 4  # Concurrent git subprocesses across all threads
 MAX_CACHE_SIZE = 100  # Maximum number of repos to cache
+INCREMENTAL_REFRESH = True  # Patch snapshots per changed path instead of full rebuilds
+SNAPSHOT_MAX_AGE = 300  # seconds; full refresh safety net for snapshots only patched per file
+LAST_COMMIT_MAX_COMMITS = 5000  # history walked when building a last-commit index
+LAST_COMMIT_TIMEOUT = 20  # seconds allowed for that walk
+LAST_COMMIT_RETRY = 60  # seconds before a failed walk is tried again
+LAST_COMMIT_CACHE_DIR = os.path.expanduser("~/.cache/nemo_git_last_commit")  # persisted indexes
+DIFF_STAT_MAX_FILES = 5000  # changed files above which line counts are not computed
+SUBMODULE_WORKERS = 2  # submodule snapshots refreshed at once; capped below MAX_GIT_PROCESSES
+SHOW_EMBLEMS = True  # add status emblems; reads status in every view, even with Git Status hidden
+# Emblem per status; icons/<name>.png is installed as the emblem-<name> icon
+STATUS_EMBLEMS = {
+    "clean": "happy-file",
+    "dirty": "construction",
+    "untracked": "add-file",
+    "conflict": "important-file",
+}
 LOG_LEVEL = logging.WARNING  # Reduce log noise in production
+LIST_VIEW_SCHEMA = "org.nemo.list-view"
+VISIBLE_COLUMNS_KEY = "default-visible-columns"
+FOLDER_COLUMNS_ATTRIBUTE = "metadata::nemo-list-view-visible-columns"  # per-folder override
+COLUMN_PREFIX = "NemoGitIntegration::"
+GIT_COLUMNS = frozenset(
+    ("git_repo", "git_branch", "git_status", "git_sync", "git_last_commit", "git_changes")
+)
+# Columns that need `git status`; Git Changes uses it to cap and patch its diff
+STATUS_COLUMNS = frozenset(("git_status", "git_sync", "git_changes"))
+PROFILE_ENV = "NEMO_GIT_PROFILE"  # set to 1 to collect per-stage latency stats
+PROFILE_DUMP_ENV = "NEMO_GIT_PROFILE_DUMP"  # seconds between JSON dumps to $XDG_RUNTIME_DIR
+TRACE_ENV = "NEMO_GIT_TRACE"  # 1 or an output path to record update_file_info_full calls
+TRACE_CPROFILE_ENV = "NEMO_GIT_TRACE_CPROFILE"  # seconds of cProfile capture when tracing starts
+TRACE_SENTINEL = os.path.expanduser("~/.cache/nemo_git_trace")  # touch to start tracing
+TRACE_SENTINEL_POLL = 5  # seconds between sentinel checks
 
 # Configure logging
 logging.basicConfig(
@@ -31,30 +75,330 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+# ============================================================
+#  Instrumentation
+# ============================================================
+
+class LatencyStats:
+    """
+    Per-stage call counts and log2-bucketed latency histograms.
+    
+    Recording is guarded by a single attribute check so the hot path pays
+    almost nothing while disabled. Bucket keys are upper bounds in
+    microseconds (1, 2, 4, 8, ...).
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._stages: Dict[str, dict] = {}
+        self._dump_thread: Optional[threading.Thread] = None
+        self._dump_stop = threading.Event()
+
+    def record(self, stage: str, elapsed_ns: int):
+        """Add one timed call to a stage."""
+        bucket = 1 << (elapsed_ns // 1000).bit_length()
+        with self._lock:
+            entry = self._stages.get(stage)
+            if entry is None:
+                entry = self._stages[stage] = {"count": 0, "total_ns": 0, "max_ns": 0, "buckets": {}}
+            entry["count"] += 1
+            entry["total_ns"] += elapsed_ns
+            if elapsed_ns > entry["max_ns"]:
+                entry["max_ns"] = elapsed_ns
+            entry["buckets"][bucket] = entry["buckets"].get(bucket, 0) + 1
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serialisable copy of all stage statistics."""
+        with self._lock:
+            return {
+                stage: {
+                    "count": entry["count"],
+                    "total_ms": entry["total_ns"] / 1e6,
+                    "mean_ms": entry["total_ns"] / entry["count"] / 1e6,
+                    "max_ms": entry["max_ns"] / 1e6,
+                    "histogram_us": {str(b): n for b, n in sorted(entry["buckets"].items())},
+                }
+                for stage, entry in self._stages.items()
+            }
+
+    def reset(self):
+        """Discard all recorded statistics."""
+        with self._lock:
+            self._stages.clear()
+
+    def dump(self, path: str):
+        """Atomically write the current snapshot to a JSON file."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"pid": os.getpid(), "time": time.time(), "stages": self.snapshot()}, f)
+        os.replace(tmp_path, path)
+
+    def start_periodic_dump(self, interval: float, path: Optional[str] = None):
+        """
+        Dump statistics to a JSON file every interval seconds.
+        
+        Args:
+            interval: Seconds between dumps
+            path: Output file (defaults to a per-process file under $XDG_RUNTIME_DIR)
+        """
+        if self._dump_thread is not None or interval <= 0:
+            return
+        if path is None:
+            out_dir = _runtime_dir()
+            if out_dir is None:
+                logger.warning("XDG_RUNTIME_DIR is not set; latency stats will not be dumped")
+                return
+            path = os.path.join(out_dir, f"stats-{os.getpid()}.json")
+
+        self.enabled = True
+        self._dump_stop.clear()
+
+        def loop():
+            while not self._dump_stop.wait(interval):
+                try:
+                    self.dump(path)
+                except OSError as e:
+                    logger.debug(f"Latency stats dump failed: {e}")
+
+        self._dump_thread = threading.Thread(target=loop, name="nemo-git-stats-dump", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self):
+        """Stop the periodic dump thread if running."""
+        self._dump_stop.set()
+        if self._dump_thread is not None:
+            self._dump_thread.join()
+            self._dump_thread = None
+
+
+latency = LatencyStats(enabled=bool(os.environ.get(PROFILE_ENV) or os.environ.get(PROFILE_DUMP_ENV)))
+
+
+def _runtime_dir() -> Optional[str]:
+    """Return (creating it) the private diagnostics directory under $XDG_RUNTIME_DIR."""
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if not runtime_dir or not os.path.isdir(runtime_dir):
+        return None
+    out_dir = os.path.join(runtime_dir, "nemo-git-integration")
+    os.makedirs(out_dir, mode=0o700, exist_ok=True)
+    return out_dir
+
+
+class CallRecorder:
+    """
+    Opt-in JSONL trace of update_file_info_full calls.
+    
+    Each line records the path, cache outcome, git subcommands run with
+    their durations, and the total call time, so a user's slow listing can
+    be replayed with tools/replay_trace.py. Header lines record the visible
+    columns when tracing starts and whenever they change, as they decide
+    which git commands run. Tracing starts from the
+    NEMO_GIT_TRACE environment variable or while the sentinel file exists,
+    and can capture a cProfile window alongside the trace.
+    """
+
+    def __init__(self, sentinel: str = TRACE_SENTINEL):
+        self.active = False
+        self._sentinel = sentinel
+        self._from_sentinel = False
+        self._next_poll = 0.0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._file = None
+        self.path: Optional[str] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._profile_until = 0.0
+
+    def configure_from_env(self):
+        """Start tracing if requested through the environment."""
+        target = os.environ.get(TRACE_ENV)
+        if target:
+            self.start(None if target == "1" else target, _env_float(TRACE_CPROFILE_ENV))
+
+    def poll(self):
+        """Start or stop sentinel-driven tracing, checking at most every few seconds."""
+        now = time.monotonic()
+        if now < self._next_poll:
+            return
+        self._next_poll = now + TRACE_SENTINEL_POLL
+        exists = os.path.exists(self._sentinel)
+        if exists and not self.active:
+            self.start(profile_seconds=_env_float(TRACE_CPROFILE_ENV))
+            self._from_sentinel = self.active
+        elif not exists and self.active and self._from_sentinel:
+            self.stop()
+
+    def start(self, path: Optional[str] = None, profile_seconds: float = 0):
+        """
+        Begin writing a trace.
+        
+        Args:
+            path: Trace file (defaults to a per-process file under $XDG_RUNTIME_DIR)
+            profile_seconds: Length of the cProfile capture window, 0 to disable
+        """
+        with self._lock:
+            if self.active:
+                return
+            if path is None:
+                out_dir = _runtime_dir()
+                if out_dir is None:
+                    logger.warning("XDG_RUNTIME_DIR is not set; call trace will not be recorded")
+                    return
+                path = os.path.join(out_dir, f"trace-{os.getpid()}.jsonl")
+            try:
+                self._file = open(path, "a", buffering=1)
+            except OSError as e:
+                logger.warning(f"Cannot open trace file {path}: {e}")
+                return
+            self.path = path
+            self._write_columns(column_settings.visible)
+            if profile_seconds and profile_seconds > 0:
+                try:
+                    self._profiler = cProfile.Profile()
+                    self._profiler.enable()
+                    self._profile_until = time.monotonic() + profile_seconds
+                except ValueError as e:  # another profiler is already active
+                    logger.warning(f"cProfile capture unavailable: {e}")
+                    self._profiler = None
+            self.active = True
+        logger.info(f"Recording git call trace to {path}")
+
+    def stop(self):
+        """Stop tracing, flushing the trace and any cProfile capture."""
+        with self._lock:
+            if not self.active:
+                return
+            self.active = False
+            self._from_sentinel = False
+            self._finish_profile()
+            self._file.close()
+            self._file = None
+
+    def _finish_profile(self):
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        try:
+            self._profiler.dump_stats(f"{self.path}.prof")
+        except OSError as e:
+            logger.debug(f"cProfile dump failed: {e}")
+        self._profiler = None
+
+    def note_columns(self, columns: Iterable[str]):
+        """Record a change to the visible columns."""
+        with self._lock:
+            if self._file is not None:
+                self._write_columns(columns)
+
+    def _write_columns(self, columns: Iterable[str]):
+        record = {"ts": round(time.time(), 3), "columns": sorted(columns)}
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+    def begin_call(self):
+        """Reset the per-thread record for a new call."""
+        self._local.git = []
+        self._local.outcome = ""
+
+    def note_outcome(self, outcome: str):
+        """Record how the cache served the current call."""
+        self._local.outcome = outcome
+
+    def note_git(self, args: list, elapsed_ns: int):
+        """Record a git command run during the current call."""
+        calls = getattr(self._local, "git", None)
+        if calls is not None:
+            calls.append([_git_subcommand(args), round(elapsed_ns / 1e6, 3)])
+
+    def end_call(self, path: str, elapsed_ns: int):
+        """Append the current call to the trace."""
+        record = {
+            "ts": round(time.time(), 3),
+            "path": path,
+            "cache": getattr(self._local, "outcome", ""),
+            "git": getattr(self._local, "git", []),
+            "ms": round(elapsed_ns / 1e6, 3),
+        }
+        self._local.git = None
+        line = json.dumps(record, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(line + "\n")
+            if self._profiler is not None and time.monotonic() >= self._profile_until:
+                self._finish_profile()
+
+
+def _env_float(name: str) -> float:
+    """Read a float setting from the environment, 0 if unset or invalid."""
+    try:
+        return float(os.environ.get(name, "") or 0)
+    except ValueError:
+        return 0.0
+
+
+recorder = CallRecorder()
+
+
+def timed(stage: str):
+    """Decorator recording a function's latency under stage when enabled."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not latency.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                latency.record(stage, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+
+def _git_subcommand(args: list) -> str:
+    """Return the git subcommand name from an argument list."""
+    for arg in args:
+        if not arg.startswith("-"):
+            return arg
+    return args[0] if args else ""
+
+
 # ============================================================
 #  Git Utilities
 # ============================================================
 
-def run_git(repo_root: str) -> Optional[dict]:
+@timed("run_git")
+def run_git(repo_root: str, columns: Optional[Iterable[str]] = None) -> Optional[dict]:
     """
     Run git commands to fetch repository information.
     Uses parameterized commands for security and optimized error handling.
     
     Args:
         repo_root: Absolute path to git repository
+        columns: Column attributes to compute (defaults to all of GIT_COLUMNS);
+                 git commands only needed by other columns are skipped
         
     Returns:
         Dict with git info or None if repo invalid/inaccessible
     """
     if not repo_root or not _is_safe_path(repo_root) or not os.path.isdir(repo_root):
         return None
+    columns = GIT_COLUMNS if columns is None else frozenset(columns) & GIT_COLUMNS
+
+    # Taken before any git work so changes made while git runs are re-checked
+    taken_ns = time.time_ns()
+    signature = _repo_signature(repo_root)
 
     try:
-        # Get branch information
-        branch = _run_git_command(repo_root, ["rev-parse", "--abbrev-ref", "HEAD"])
-        if branch is None:
-            return None
-        branch = branch.strip()
+        # Get branch information; this also probes that the repo is valid
+        # unless the status run below does so instead
+        branch = ""
+        if "git_branch" in columns or not columns & STATUS_COLUMNS:
+            branch = _run_git_command(repo_root, ["rev-parse", "--abbrev-ref", "HEAD"])
+            if branch is None:
+                return None
+            branch = branch.strip()
         
         # Handle detached HEAD
         if branch == "HEAD":
@@ -62,17 +406,43 @@ def run_git(repo_root: str) -> Optional[dict]:
             branch = f"detached@{commit_hash.strip()}" if commit_hash else "detached"
         
         # Get origin URL
-        origin = _run_git_command(repo_root, ["remote", "get-url", "origin"])
-        origin = origin.strip() if origin else ""
+        origin = ""
+        if "git_repo" in columns:
+            origin = _run_git_command(repo_root, ["remote", "get-url", "origin"])
+            origin = origin.strip() if origin else ""
         
-        # Get status information
-        status_output = _run_git_command(repo_root, ["status", "--porcelain=v2", "--branch"])
-        status_lines = status_output.splitlines() if status_output else []
+        # Get status information; its branch headers also give the sync state
+        status_lines = []
+        if columns & STATUS_COLUMNS:
+            status_output = _run_git_command(repo_root, STATUS_ARGS + ["--branch"])
+            if status_output is None:
+                # Failed or timed out; reporting every file as clean would be wrong
+                return None
+            status_lines = status_output.splitlines()
+        file_status_map = parse_porcelain_status(status_lines)
+
+        # Bring the last-commit index up to HEAD in the background; a no-op unless HEAD moved
+        if "git_last_commit" in columns:
+            head = parse_head_oid(status_lines)
+            if head is None:
+                head = _run_git_command(repo_root, ["rev-parse", "-q", "--verify", "HEAD"])
+                head = head.strip() if head else None
+            if head:
+                last_commits.request(repo_root, head)
         
         return {
+            "columns": columns,
             "git_branch": branch,
             "git_repo": origin,
-            "file_status_map": parse_porcelain_status(status_lines),
+            "git_sync": parse_branch_sync(status_lines),
+            "operation": detect_operation(repo_root) if "git_status" in columns else "",
+            "submodules": read_submodule_paths(repo_root),
+            "file_status_map": file_status_map,
+            "dir_rollup": build_dir_rollup(file_status_map),
+            "signature": signature,
+            "taken_ns": taken_ns,
+            "validated_at": time.monotonic(),
+            "patched_ns": {},
         }
         
     except (subprocess.SubprocessError, OSError, ValueError) as e:
@@ -80,33 +450,189 @@ def run_git(repo_root: str) -> Optional[dict]:
         return None
 
 
-def _run_git_command(repo_root: str, args: list) -> Optional[str]:
+# Submodules get snapshots of their own, so the superproject's status only
+# notes gitlinks that moved instead of scanning every submodule serially
+STATUS_ARGS = ["status", "--porcelain=v2", "--ignore-submodules=dirty"]
+
+
+# Bounds concurrent git processes so a burst of lookups cannot fork-bomb
+_git_slots = threading.BoundedSemaphore(MAX_GIT_PROCESSES)
+
+
+def _run_git_command(repo_root: str, args: list, timeout: Optional[float] = None) -> Optional[str]:
     """
     Execute a git command with proper security measures.
     
     Args:
         repo_root: Repository path (must be validated)
         args: Git command arguments
+        timeout: Seconds before the command is abandoned (defaults to GIT_TIMEOUT)
         
     Returns:
         Command output or None on failure
     """
-    cmd = ["git", "-C", repo_root] + args
+    cmd = [GIT_EXECUTABLE, "-C", repo_root] + args
+    start = time.perf_counter_ns() if latency.enabled or recorder.active else 0
     
     try:
-        return subprocess.check_output(
-            cmd, 
-            stderr=subprocess.DEVNULL, 
-            text=True, 
-            timeout=GIT_TIMEOUT,
-            env={}  # Clean environment for security
-        )
+        with _git_slots:
+            return subprocess.check_output(
+                cmd, 
+                stderr=subprocess.DEVNULL, 
+                text=True, 
+                timeout=GIT_TIMEOUT if timeout is None else timeout,
+                env={}  # Clean environment for security
+            )
     except subprocess.TimeoutExpired:
         logger.warning(f"Git command timed out for {repo_root}")
         return None
     except subprocess.SubprocessError as e:
         logger.debug(f"Git subprocess error: {e}")
         return None
+    finally:
+        if start:
+            elapsed = time.perf_counter_ns() - start
+            if latency.enabled:
+                latency.record(f"git {_git_subcommand(args)}", elapsed)
+            if recorder.active:
+                recorder.note_git(args, elapsed)
+
+
+def _stat_key(path: str) -> Optional[tuple]:
+    """Return an (mtime, size, inode) key for a path, or None if missing."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+
+def resolve_git_dir(repo_root: str) -> Optional[str]:
+    """
+    Return the git directory of a work tree, following the `.git` file
+    that submodules and linked worktrees have instead of a directory.
+
+    Args:
+        repo_root: Repository root path
+
+    Returns:
+        Git directory path or None if there is none
+    """
+    dot_git = os.path.join(repo_root, ".git")
+    if os.path.isdir(dot_git):
+        return dot_git
+    try:
+        with open(dot_git, "r") as f:
+            line = f.readline(4096).strip()
+    except (OSError, ValueError):
+        return None
+    if not line.startswith("gitdir: "):
+        return None
+    return os.path.normpath(os.path.join(repo_root, line[len("gitdir: "):]))
+
+
+def read_submodule_paths(repo_root: str) -> Tuple[str, ...]:
+    """
+    Return the repo-relative paths of the submodules declared in
+    `.gitmodules` that are checked out, without running git.
+    """
+    try:
+        with open(os.path.join(repo_root, ".gitmodules"), "r") as f:
+            content = f.read()
+    except (OSError, ValueError):
+        return ()
+    paths = []
+    for match in re.finditer(r"^\s*path\s*=\s*(.+?)\s*$", content, re.MULTILINE):
+        rel_path = match.group(1).strip('"')
+        if os.path.exists(os.path.join(repo_root, rel_path, ".git")):
+            paths.append(rel_path)
+    return tuple(paths)
+
+
+def _common_dir(git_dir: str) -> str:
+    """Return the directory holding refs and config, shared by linked worktrees."""
+    try:
+        with open(os.path.join(git_dir, "commondir"), "r") as f:
+            return os.path.normpath(os.path.join(git_dir, f.read(4096).strip()))
+    except (OSError, ValueError):
+        return git_dir
+
+
+def _upstream_ref(config_path: str, branch: str) -> Optional[str]:
+    """
+    Return the ref a branch tracks, e.g. refs/remotes/origin/main, from its
+    `branch.<name>.remote` and `branch.<name>.merge` config, or None.
+    """
+    section = f'[branch "{branch}"]'
+    remote = merge = None
+    inside = False
+    try:
+        with open(config_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    inside = line == section
+                elif inside and "=" in line:
+                    key, value = (part.strip() for part in line.split("=", 1))
+                    if key.lower() == "remote":
+                        remote = value
+                    elif key.lower() == "merge":
+                        merge = value
+    except (OSError, ValueError):
+        return None
+    if not remote or not merge or not merge.startswith("refs/heads/"):
+        return None
+    if remote == ".":
+        return merge
+    return f"refs/remotes/{remote}/{merge[len('refs/heads/'):]}"
+
+
+def _ref_key(common_dir: str, ref: str) -> Optional[tuple]:
+    """Stat key of a loose ref, falling back to packed-refs."""
+    key = _stat_key(os.path.join(common_dir, ref))
+    if key is None:
+        key = _stat_key(os.path.join(common_dir, "packed-refs"))
+    return key
+
+
+def _repo_signature(repo_root: str) -> Optional[tuple]:
+    """
+    Build a cheap fingerprint of the repository index, HEAD and config.
+
+    Stats `.git/index`, `.git/HEAD`, `.git/config`, `.git/FETCH_HEAD`, the
+    branch ref HEAD points at, the remote-tracking ref that branch tracks
+    and the in-progress operation markers, so staging, commits, checkouts,
+    fetches, pushes, remote changes and starting or finishing a merge or
+    rebase all alter the signature without running git.
+
+    Args:
+        repo_root: Repository root path
+
+    Returns:
+        Tuple of stat keys or None if the git directory is unreadable
+    """
+    git_dir = resolve_git_dir(repo_root)
+    if git_dir is None:
+        return None
+    common_dir = _common_dir(git_dir)
+    try:
+        parts = [_stat_key(os.path.join(git_dir, name)) for name in ("index", "HEAD", "FETCH_HEAD")]
+        parts.append(_stat_key(os.path.join(common_dir, "config")))
+        with open(os.path.join(git_dir, "HEAD"), "r") as f:
+            head = f.read(256).strip()
+    except (OSError, ValueError):
+        return None
+
+    ref_key = upstream_key = None
+    if head.startswith("ref: "):
+        ref_key = _ref_key(common_dir, head[5:])
+        if head.startswith("ref: refs/heads/"):
+            upstream = _upstream_ref(os.path.join(common_dir, "config"), head[len("ref: refs/heads/"):])
+            if upstream:
+                upstream_key = (upstream, _ref_key(common_dir, upstream))
+    parts.append((head, ref_key, upstream_key))
+    parts.append(detect_operation(repo_root))
+    return tuple(parts)
 
 
 def _is_safe_path(path: str) -> bool:
@@ -137,6 +663,7 @@ def _is_safe_path(path: str) -> bool:
         return False
 
 
+@timed("parse_porcelain_status")
 def parse_porcelain_status(lines) -> Dict[str, str]:
     """
     Parse `git status --porcelain[=v2] --branch` output into per-file status.
@@ -148,6 +675,7 @@ def parse_porcelain_status(lines) -> Dict[str, str]:
 
     Returns:
         Dict mapping file paths to status:
+          - 'conflict' for unmerged files
           - 'dirty' for modified/staged files
           - 'untracked' for untracked files
           - 'clean' for unchanged files
@@ -174,12 +702,12 @@ def parse_porcelain_status(lines) -> Dict[str, str]:
             if path:
                 status_map[path] = "untracked"
         elif first_char in ("1", "2", "u"):
-            # Porcelain v2 format
+            # Porcelain v2 format; "u" records are unmerged paths
             parts = line.split()
             if len(parts) >= 2:
                 path = parts[-1]
                 if path:
-                    status_map[path] = "dirty"
+                    status_map[path] = "conflict" if first_char == "u" else "dirty"
         elif first_char in ("M", "A", "D", "R", "C") and len(line) > 2:
             # Porcelain v1 format
             path = line[2:].strip()
@@ -189,6 +717,236 @@ def parse_porcelain_status(lines) -> Dict[str, str]:
     return status_map
 
 
+def parse_branch_sync(lines) -> str:
+    """
+    Describe how the branch relates to its upstream from the `# branch.*`
+    headers of `git status --porcelain=v2 --branch` output.
+
+    Args:
+        lines: List of git status output lines
+
+    Returns:
+        'up to date', 'ahead N', 'behind N', 'ahead N, behind M',
+        'upstream gone' when the upstream no longer exists, or an empty
+        string when the branch has no upstream
+    """
+    upstream = False
+    ahead_behind = None
+    for line in lines:
+        if not line.startswith("# branch."):
+            if line and line[0] != "#":
+                break  # headers come before any entries
+            continue
+        if line.startswith("# branch.upstream "):
+            upstream = True
+        elif line.startswith("# branch.ab "):
+            ahead_behind = line[len("# branch.ab "):].split()
+
+    if not upstream:
+        return ""
+    if not ahead_behind or len(ahead_behind) != 2:
+        return "upstream gone"
+    try:
+        ahead, behind = int(ahead_behind[0]), -int(ahead_behind[1])
+    except ValueError:
+        return ""
+    parts = [f"{label} {count}" for label, count in (("ahead", ahead), ("behind", behind)) if count]
+    return ", ".join(parts) or "up to date"
+
+
+def parse_head_oid(lines) -> Optional[str]:
+    """
+    Return the commit HEAD points at from the `# branch.oid` header of
+    `git status --porcelain=v2 --branch` output, or None if absent or the
+    repository has no commits yet.
+    """
+    for line in lines:
+        if line.startswith("# branch.oid "):
+            oid = line[len("# branch.oid "):].strip()
+            return None if oid == "(initial)" else oid
+        if line and line[0] != "#":
+            break
+    return None
+
+
+# Marker files git keeps in its directory while an operation is in progress
+OPERATION_MARKERS = (
+    ("rebase-merge", "rebasing"),
+    ("rebase-apply", "rebasing"),
+    ("MERGE_HEAD", "merging"),
+    ("CHERRY_PICK_HEAD", "cherry-picking"),
+    ("REVERT_HEAD", "reverting"),
+    ("BISECT_LOG", "bisecting"),
+)
+
+
+def detect_operation(repo_root: str) -> str:
+    """
+    Name the operation in progress in a repository, e.g. 'merging', from
+    the marker files in its git directory; empty if there is none.
+    """
+    git_dir = resolve_git_dir(repo_root)
+    if git_dir is None:
+        return ""
+    for marker, operation in OPERATION_MARKERS:
+        if os.path.exists(os.path.join(git_dir, marker)):
+            return operation
+    return ""
+
+
+# Rollup precedence: the first status present below a directory wins
+ROLLUP_PRIORITY = ("conflict", "dirty", "untracked")
+
+
+def build_dir_rollup(file_status_map: Dict[str, str]) -> Dict[str, Dict[str, int]]:
+    """
+    Count file statuses per ancestor directory.
+
+    Args:
+        file_status_map: Mapping of repo-relative paths to status
+
+    Returns:
+        Dict mapping repo-relative directories to {status: count}
+    """
+    rollup: Dict[str, Dict[str, int]] = {}
+    for path, status in file_status_map.items():
+        _adjust_rollup(rollup, path, status, 1)
+    return rollup
+
+
+def _adjust_rollup(rollup: Dict[str, Dict[str, int]], path: str, status: str, delta: int):
+    """Add delta to the status count of every ancestor directory of path."""
+    parent = posixpath.dirname(path.rstrip("/"))
+    while parent:
+        counts = rollup.setdefault(parent, {})
+        count = counts.get(status, 0) + delta
+        if count > 0:
+            counts[status] = count
+        else:
+            counts.pop(status, None)
+            if not counts:
+                del rollup[parent]
+        parent = posixpath.dirname(parent)
+
+
+def rollup_status(counts: Dict[str, int]) -> str:
+    """Reduce a directory's status counts to a single display status."""
+    for status in ROLLUP_PRIORITY:
+        if counts.get(status):
+            return status
+    return "clean"
+
+
+def lookup_status(info: dict, rel_path: str) -> str:
+    """
+    Look up the status of a repo-relative path in a snapshot.
+
+    Files come straight from the status map; directories fall back to
+    their rollup so a folder containing changes is not shown as clean.
+    """
+    file_status_map = info["file_status_map"]
+    status = file_status_map.get(rel_path) or file_status_map.get(rel_path + "/")
+    if status:
+        return status
+    counts = info.get("dir_rollup", {}).get(rel_path)
+    if counts:
+        return rollup_status(counts)
+    return "clean"
+
+
+DIFF_STAT_ARGS = ["--literal-pathspecs", "diff", "--numstat", "-z", "--no-renames", "HEAD"]
+
+
+def parse_numstat(output: str) -> Dict[str, Tuple[int, int]]:
+    """
+    Parse `git diff --numstat -z --no-renames` output.
+
+    Returns:
+        Dict mapping repo-relative paths to (added, removed) line counts;
+        binary files have (-1, -1)
+    """
+    stats = {}
+    for record in output.split("\0"):
+        fields = record.split("\t", 2)
+        if len(fields) != 3 or not fields[2]:
+            continue
+        added, removed, path = fields
+        if added == "-" or removed == "-":
+            stats[path] = (-1, -1)
+        elif added.isdigit() and removed.isdigit():
+            stats[path] = (int(added), int(removed))
+    return stats
+
+
+def _adjust_diff_totals(totals: Dict[str, list], path: str, stat: Tuple[int, int], sign: int):
+    """Add a file's line counts (times sign) to every directory above it and '.'."""
+    if stat[0] < 0:
+        return  # binary files have no line counts to sum
+    parent = posixpath.dirname(path)
+    while True:
+        key = parent or "."
+        total = totals.setdefault(key, [0, 0, 0])
+        total[0] += sign * stat[0]
+        total[1] += sign * stat[1]
+        total[2] += sign
+        if total[2] <= 0:
+            del totals[key]
+        if not parent:
+            break
+        parent = posixpath.dirname(parent)
+
+
+def build_diff_stats(repo_root: str, file_status_map: Dict[str, str]) -> dict:
+    """
+    Compute per-file and per-directory line counts with one
+    `git diff --numstat HEAD` for the whole repository.
+
+    Skipped when more than DIFF_STAT_MAX_FILES files are changed, and
+    bounded by GIT_TIMEOUT like every other git command; either way the
+    column stays empty rather than the listing waiting.
+
+    Returns:
+        {"files": {path: (added, removed)}, "dirs": {dir: [added, removed, files]}}
+    """
+    stats = {"files": {}, "dirs": {}}
+    changed = sum(1 for status in file_status_map.values() if status != "untracked")
+    if changed > DIFF_STAT_MAX_FILES:
+        return stats
+    output = _run_git_command(repo_root, DIFF_STAT_ARGS)
+    if output is None:
+        return stats
+    stats["files"] = parse_numstat(output)
+    for path, stat in stats["files"].items():
+        _adjust_diff_totals(stats["dirs"], path, stat, 1)
+    return stats
+
+
+def lookup_changes(repo_root: str, info: dict, rel_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Return the (added, removed) lines of a repo-relative path in a snapshot.
+
+    The diff is run on first use and kept in the snapshot, so it is only
+    computed while the column is shown and goes away with the snapshot.
+    """
+    stats = info.get("diff_stats")
+    if stats is None:
+        stats = info["diff_stats"] = build_diff_stats(repo_root, info.get("file_status_map", {}))
+    stat = stats["files"].get(rel_path)
+    if stat is not None:
+        return stat
+    total = stats["dirs"].get(rel_path)
+    return (total[0], total[1]) if total else None
+
+
+def format_changes(stat: Optional[Tuple[int, int]]) -> str:
+    """Format (added, removed) line counts as '+12/-3'."""
+    if stat is None:
+        return ""
+    if stat[0] < 0:
+        return "binary"
+    return f"+{stat[0]}/-{stat[1]}"
+
+
 # ---------------------------
 # Format-specific parsers
 # ---------------------------
@@ -208,12 +966,13 @@ def parse_porcelain_v2(line):
       - 1 <xy> ... path
       - 2 <xy> ... path
       - u <xy> ... path
-    Returns (path, 'dirty') or (None, None) if not v2.
+    Returns (path, 'dirty'), (path, 'conflict') for unmerged 'u' entries,
+    or (None, None) if not v2.
     """
     if line[0] in ("1", "2", "u"):
         parts = line.split()
         if len(parts) >= 2:
-            return parts[-1], "dirty"
+            return parts[-1], "conflict" if line[0] == "u" else "dirty"
     return None, None
 
 
@@ -236,6 +995,7 @@ def parse_porcelain_v1(line):
     return None, None
 
 
+@timed("resolve_repo_root")
 def resolve_repo_root(path: str) -> Optional[str]:
     """
     Find git repository root efficiently.
@@ -256,10 +1016,11 @@ def resolve_repo_root(path: str) -> Optional[str]:
             
         cur = os.path.abspath(path)
         
-        # Walk up the directory tree looking for .git
+        # Walk up the directory tree looking for .git; a file rather than
+        # a directory marks a submodule or linked worktree root
         while cur != "/" and cur:
             git_dir = os.path.join(cur, ".git")
-            if os.path.isdir(git_dir):
+            if os.path.exists(git_dir):
                 return cur
             cur = os.path.dirname(cur)
             
@@ -269,6 +1030,7 @@ def resolve_repo_root(path: str) -> Optional[str]:
     return None
 
 
+@timed("uri_to_path")
 def uri_to_path(uri: str) -> Optional[str]:
     """
     Convert a 'file://...' URI into a local filesystem path.
@@ -324,6 +1086,11 @@ def should_skip(path: str) -> bool:
 #  Caching and File Info
 # ============================================================
 
+def _newest_read_ns(info: dict) -> int:
+    """Start time of the newest git status read into a snapshot."""
+    return max([info.get("taken_ns", 0)] + list(info.get("patched_ns", {}).values()))
+
+
 class GitCache:
     """
     Thread-safe TTL cache for repository information with size limits.
@@ -341,24 +1108,28 @@ class GitCache:
         self._hits = 0
         self._misses = 0
 
-    def get(self, repo_root: str) -> Optional[dict]:
+    @timed("GitCache.get")
+    def get(self, repo_root: str, ttl: Optional[float] = None) -> Optional[dict]:
         """
         Get cached repository info if still valid.
         
         Args:
             repo_root: Repository root path
+            ttl: Maximum entry age in seconds (defaults to CACHE_TTL)
             
         Returns:
             Cached info dict or None if expired/not found
         """
         if not repo_root:
             return None
+        if ttl is None:
+            ttl = CACHE_TTL
             
         with self._lock:
             item = self._data.get(repo_root)
             if item:
                 timestamp, data = item
-                if (time.time() - timestamp) < CACHE_TTL:
+                if (time.time() - timestamp) < ttl:
                     self._hits += 1
                     return data
                 else:
@@ -368,6 +1139,24 @@ class GitCache:
             self._misses += 1
             return None
 
+    def peek(self, repo_root: str, ttl: Optional[float] = None) -> Optional[dict]:
+        """
+        Get cached repository info if still valid, without counting a hit or miss.
+
+        Used by background work so the statistics only reflect lookups made
+        for the file manager.
+        """
+        if not repo_root:
+            return None
+        if ttl is None:
+            ttl = CACHE_TTL
+
+        with self._lock:
+            item = self._data.get(repo_root)
+            if item and (time.time() - item[0]) < ttl:
+                return item[1]
+            return None
+
     def set(self, repo_root: str, data: dict):
         """
         Cache repository info with automatic cleanup.
@@ -380,11 +1169,37 @@ class GitCache:
             return
             
         with self._lock:
+            item = self._data.get(repo_root)
+            if item is not None and _newest_read_ns(item[1]) > data.get("taken_ns", _newest_read_ns(item[1])):
+                # A path was patched in after this snapshot's status started
+                return
+
             # Remove oldest entries if cache is full
             if len(self._data) >= self._max_size:
                 self._cleanup_oldest()
                 
             self._data[repo_root] = (time.time(), data)
+
+    def replace(self, repo_root: str, data: dict, base: dict):
+        """
+        Swap in a patched snapshot, keeping the original entry's age.
+        
+        Nothing is replaced unless the entry is still the snapshot that was
+        patched, so a newer full snapshot is not overwritten.
+        
+        Args:
+            repo_root: Repository root path
+            data: Patched repository information
+            base: Snapshot the patch was applied to
+        """
+        if not repo_root or not data:
+            return
+            
+        with self._lock:
+            item = self._data.get(repo_root)
+            if item is None or item[1] is not base:
+                return
+            self._data[repo_root] = (item[0], data)
     
     def _cleanup_oldest(self):
         """Remove oldest entries to make room for new ones."""
@@ -404,6 +1219,8 @@ class GitCache:
             self._data.clear()
             self._hits = 0
             self._misses = 0
+        with _refresh_lock:
+            _failed_refreshes.clear()
     
     def get_stats(self) -> dict:
         """Get cache performance statistics."""
@@ -421,12 +1238,336 @@ class GitCache:
 cache = GitCache()
 
 
+class LastCommitIndex:
+    """
+    Most recent commit touching each path of a repository.
+    
+    An index is built from one `git log --name-only` walk of at most
+    LAST_COMMIT_MAX_COMMITS commits, newest first, so the first commit
+    seen for a path (or any directory above it) is its last change. When
+    HEAD moves forward only the new commits are walked. Indexes are keyed
+    on the HEAD they describe and persisted under LAST_COMMIT_CACHE_DIR,
+    so a lookup is a dict access per file even in a new session.
+
+    Listings only request an index; it is loaded, built or extended on a
+    background thread, and lookups return None until it describes the
+    HEAD last requested. The walk may take LAST_COMMIT_TIMEOUT seconds.
+    If it fails nothing is stored and it is retried after
+    LAST_COMMIT_RETRY seconds.
+    """
+
+    def __init__(self, max_repos: int = MAX_CACHE_SIZE):
+        self._lock = threading.Lock()
+        self._repos: Dict[str, dict] = {}
+        self._heads: Dict[str, str] = {}  # HEAD last requested per repository
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._failed: Dict[str, tuple] = {}  # (head, monotonic time) of the last failed walk
+        self._pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._max_repos = max_repos
+
+    def request(self, repo_root: str, head: str):
+        """
+        Bring the repository's index up to HEAD in the background.
+
+        Returns at once; a lookup is answered once the index is ready.
+
+        Args:
+            repo_root: Repository root path
+            head: Full object id HEAD points at
+        """
+        with self._lock:
+            if repo_root not in self._heads and len(self._heads) >= self._max_repos:
+                stale = next((r for r in self._heads if r not in self._pending), None)
+                if stale is not None:
+                    del self._heads[stale]
+            self._heads[repo_root] = head
+            index = self._repos.get(repo_root)
+            if (index is not None and index["head"] == head) or repo_root in self._pending:
+                return
+            if self._pool is None:
+                self._pool = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="nemo-git-last-commit"
+                )
+            self._pending[repo_root] = self._pool.submit(self._update_requested, repo_root)
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until the requested index updates have finished."""
+        with self._lock:
+            pending = list(self._pending.values())
+        concurrent.futures.wait(pending, timeout)
+
+    def _update_requested(self, repo_root: str):
+        """Update an index until it describes the HEAD last requested."""
+        while True:
+            with self._lock:
+                head = self._heads.get(repo_root)
+            try:
+                if head:
+                    self.update(repo_root, head)
+            except Exception as e:
+                logger.debug(f"Last-commit index update failed for {repo_root}: {e}")
+            with self._lock:
+                if self._heads.get(repo_root) == head:
+                    del self._pending[repo_root]
+                    return
+
+    def update(self, repo_root: str, head: str):
+        """
+        Make the repository's index describe the given HEAD commit.
+        
+        Args:
+            repo_root: Repository root path
+            head: Full object id HEAD points at
+        """
+        index = self._get(repo_root)
+        if index is not None and index["head"] == head:
+            return
+        with self._lock:
+            failed = self._failed.get(repo_root)
+        if failed and failed[0] == head and time.monotonic() - failed[1] < LAST_COMMIT_RETRY:
+            return
+
+        entries = None
+        if index is not None and index["entries"] and self._is_ancestor(repo_root, index["head"], head):
+            newer = self._walk(repo_root, [f"{index['head']}..{head}"])
+            if newer is not None:
+                entries = dict(index["entries"])
+                entries.update(newer)
+        if entries is None:
+            entries = self._walk(repo_root, ["-n", str(LAST_COMMIT_MAX_COMMITS), head])
+
+        if entries is None:
+            with self._lock:
+                self._failed[repo_root] = (head, time.monotonic())
+            return
+        index = {"head": head, "entries": entries}
+        with self._lock:
+            self._failed.pop(repo_root, None)
+        self._put(repo_root, index)
+        self._save(repo_root, index)
+
+    def lookup(self, repo_root: str, rel_path: str) -> Optional[tuple]:
+        """
+        Return (short hash, author, commit time) of the last commit touching
+        a repo-relative path ('.' for the repository itself), or None.
+        """
+        with self._lock:
+            index = self._repos.get(repo_root)
+            head = self._heads.get(repo_root)
+        if index is None or head is not None and index["head"] != head:
+            return None
+        return index["entries"].get(rel_path)
+
+    def clear(self):
+        """Forget all in-memory indexes; persisted ones are reloaded on use."""
+        with self._lock:
+            self._repos.clear()
+            self._heads.clear()
+            self._failed.clear()
+
+    def _get(self, repo_root: str) -> Optional[dict]:
+        with self._lock:
+            index = self._repos.get(repo_root)
+        if index is None:
+            index = self._load(repo_root)
+            if index is not None:
+                self._put(repo_root, index)
+        return index
+
+    def _put(self, repo_root: str, index: dict):
+        with self._lock:
+            if repo_root not in self._repos and len(self._repos) >= self._max_repos:
+                del self._repos[next(iter(self._repos))]
+            self._repos[repo_root] = index
+
+    @staticmethod
+    def _is_ancestor(repo_root: str, old: str, new: str) -> bool:
+        return _run_git_command(repo_root, ["merge-base", "--is-ancestor", old, new]) is not None
+
+    @staticmethod
+    def _walk(repo_root: str, revisions: list) -> Optional[Dict[str, tuple]]:
+        """Map each path changed in revisions to the newest commit changing it."""
+        output = _run_git_command(
+            repo_root,
+            ["log", "-z", "--no-renames", "--name-only", "--format=%x01%h%x09%an%x09%ct"] + revisions,
+            timeout=LAST_COMMIT_TIMEOUT,
+        )
+        if output is None:
+            return None
+        entries: Dict[str, tuple] = {}
+        commit = None
+        for token in output.split("\0"):
+            token = token.lstrip("\n")
+            if not token:
+                continue
+            if token[0] == "\x01":
+                fields = token[1:].split("\t")
+                if len(fields) != 3 or not fields[2].isdigit():
+                    commit = None
+                    continue
+                commit = (fields[0], fields[1], int(fields[2]))
+                entries.setdefault(".", commit)
+            elif commit is not None:
+                path = token
+                while path and path not in entries:
+                    entries[path] = commit
+                    path = posixpath.dirname(path)
+        return entries
+
+    @staticmethod
+    def _path(repo_root: str) -> str:
+        key = hashlib.md5(repo_root.encode("utf-8", "surrogateescape")).hexdigest()
+        return os.path.join(LAST_COMMIT_CACHE_DIR, f"{key}.json")
+
+    def _load(self, repo_root: str) -> Optional[dict]:
+        try:
+            with open(self._path(repo_root)) as f:
+                data = json.load(f)
+            if data.get("repo") != repo_root:
+                return None
+            return {"head": data["head"], "entries": {p: tuple(c) for p, c in data["entries"].items()}}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+    def _save(self, repo_root: str, index: dict):
+        path = self._path(repo_root)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(LAST_COMMIT_CACHE_DIR, mode=0o700, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump({"repo": repo_root, "head": index["head"], "entries": index["entries"]}, f,
+                          separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not save last-commit index for {repo_root}: {e}")
+
+
+last_commits = LastCommitIndex()
+
+
+def format_last_commit(commit: Optional[tuple], now: Optional[float] = None) -> str:
+    """Format a (hash, author, time) commit as 'abc1234 Author, 3 days ago'."""
+    if not commit:
+        return ""
+    short_hash, author, when = commit
+    age = max(0, int((time.time() if now is None else now) - when))
+    for unit, seconds in (("year", 365 * 86400), ("month", 30 * 86400), ("day", 86400),
+                          ("hour", 3600), ("minute", 60)):
+        if age >= seconds:
+            count = age // seconds
+            return f"{short_hash} {author}, {count} {unit}{'s' if count > 1 else ''} ago"
+    return f"{short_hash} {author}, just now"
+
+
+class ColumnSettings:
+    """
+    Tracks which git columns are visible in Nemo's list view.
+    
+    Reads `default-visible-columns` from the `org.nemo.list-view` GSettings
+    schema and follows change notifications, so hidden columns cost no git
+    work. Without Gio or the schema every column is treated as visible.
+
+    Folders whose columns were changed in Nemo carry their own list in
+    FOLDER_COLUMNS_ATTRIBUTE, which replaces the defaults for that folder.
+    It is read once per folder and kept for CACHE_TTL seconds.
+    """
+
+    def __init__(self, max_folders: int = MAX_CACHE_SIZE):
+        self._visible: FrozenSet[str] = GIT_COLUMNS
+        self._settings = None
+        self._lock = threading.Lock()
+        self._folders: Dict[str, Tuple[float, Optional[FrozenSet[str]]]] = {}
+        self._max_folders = max_folders
+
+    @property
+    def visible(self) -> FrozenSet[str]:
+        """Column attributes visible by default."""
+        return self._visible
+
+    def visible_in(self, folder: str) -> FrozenSet[str]:
+        """
+        Column attributes that need to be computed for entries of a folder.
+
+        Args:
+            folder: Directory whose list view shows the entries
+        """
+        now = time.monotonic()
+        with self._lock:
+            item = self._folders.get(folder)
+        if item is None or now - item[0] >= CACHE_TTL:
+            names = self._folder_columns(folder)
+            item = (now, None if names is None else self._git_columns(names))
+            with self._lock:
+                if folder not in self._folders and len(self._folders) >= self._max_folders:
+                    del self._folders[next(iter(self._folders))]
+                self._folders[folder] = item
+        return self._visible if item[1] is None else item[1]
+
+    @staticmethod
+    def _folder_columns(folder: str) -> Optional[list]:
+        """Return the column names a folder overrides the defaults with, or None."""
+        if Gio is None:
+            return None
+        try:
+            info = Gio.File.new_for_path(folder).query_info(
+                FOLDER_COLUMNS_ATTRIBUTE, Gio.FileQueryInfoFlags.NONE, None
+            )
+            if not info.has_attribute(FOLDER_COLUMNS_ATTRIBUTE):
+                return None
+            return info.get_attribute_stringv(FOLDER_COLUMNS_ATTRIBUTE)
+        except Exception as e:
+            logger.debug(f"Could not read column metadata of {folder}: {e}")
+            return None
+
+    @staticmethod
+    def _git_columns(column_names: Iterable[str]) -> FrozenSet[str]:
+        """Map Nemo column names, e.g. 'NemoGitIntegration::git_branch', to attributes."""
+        return frozenset(
+            name[len(COLUMN_PREFIX):] for name in column_names
+            if name.startswith(COLUMN_PREFIX)
+        ) & GIT_COLUMNS
+
+    def connect(self):
+        """Start following Nemo's list-view settings if available."""
+        if Gio is None or self._settings is not None:
+            return
+        try:
+            source = Gio.SettingsSchemaSource.get_default()
+            if source is None or source.lookup(LIST_VIEW_SCHEMA, True) is None:
+                return
+            self._settings = Gio.Settings.new(LIST_VIEW_SCHEMA)
+            self._settings.connect(f"changed::{VISIBLE_COLUMNS_KEY}", self._on_changed)
+            self._on_changed(self._settings, VISIBLE_COLUMNS_KEY)
+        except Exception as e:
+            logger.debug(f"Could not read Nemo column settings: {e}")
+            self._settings = None
+            self._visible = GIT_COLUMNS
+
+    def _on_changed(self, settings, key):
+        self.set_visible(settings.get_strv(key))
+
+    def set_visible(self, column_names: Iterable[str]):
+        """
+        Update visibility from a list of Nemo column names.
+        
+        Args:
+            column_names: Names as stored by Nemo, e.g. 'NemoGitIntegration::git_branch'
+        """
+        self._visible = self._git_columns(column_names)
+        if recorder.active:
+            recorder.note_columns(self._visible)
+
+
+column_settings = ColumnSettings()
+
+
 def get_overall_repo_status(file_status_map: dict) -> str:
     """
     Determine the overall status of a repository based on all file statuses.
     
     Returns:
-      - 'dirty' if any files are modified/staged
+      - 'conflict' if any files are unmerged
+      - 'dirty' if any files are modified/staged (and none unmerged)
       - 'untracked' if there are untracked files (and no dirty files)
       - 'clean' if repository is clean
     """
@@ -434,9 +1575,10 @@ def get_overall_repo_status(file_status_map: dict) -> str:
     has_untracked = False
     
     for status in file_status_map.values():
-        if status == "dirty":
+        if status == "conflict":
+            return "conflict"  # Conflicts take priority
+        elif status == "dirty":
             has_dirty = True
-            break  # Dirty takes priority
         elif status == "untracked":
             has_untracked = True
     
@@ -448,7 +1590,247 @@ def get_overall_repo_status(file_status_map: dict) -> str:
         return "clean"
 
 
-def get_file_git_info(path: str) -> dict:
+class _PendingRefresh:
+    """A full refresh in progress that other callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Optional[dict] = None
+
+
+_refresh_lock = threading.Lock()
+_pending_refreshes: Dict[str, _PendingRefresh] = {}
+_failed_refreshes: Dict[str, float] = {}
+
+
+def fetch_repo_info(repo_root: str, columns: Optional[Iterable[str]] = None) -> Optional[dict]:
+    """
+    Run git for a repository and cache the snapshot, coalescing callers.
+    
+    Concurrent requests for the same repository wait for a single run_git
+    instead of each starting their own, and a failed or timed-out refresh
+    is not retried for CACHE_TTL seconds so a slow repository cannot stall
+    every file in a listing.
+    
+    Args:
+        repo_root: Repository root path
+        columns: Column attributes to compute (defaults to all of GIT_COLUMNS)
+        
+    Returns:
+        The new snapshot or None if git failed
+    """
+    columns = GIT_COLUMNS if columns is None else frozenset(columns) & GIT_COLUMNS
+    with _refresh_lock:
+        failed_at = _failed_refreshes.get(repo_root)
+        if failed_at is not None and time.monotonic() - failed_at < CACHE_TTL:
+            return None
+        pending = _pending_refreshes.get(repo_root)
+        leader = pending is None
+        if leader:
+            pending = _pending_refreshes[repo_root] = _PendingRefresh()
+
+    if not leader:
+        pending.done.wait()
+        result = pending.result
+        if result is None or columns <= result.get("columns", GIT_COLUMNS):
+            return result
+        return fetch_repo_info(repo_root, columns)
+
+    info = None
+    try:
+        info = run_git(repo_root, columns)
+        if info:
+            cache.set(repo_root, info)
+            if info.get("submodules"):
+                _prefetch_submodules(repo_root, info["submodules"], columns)
+        pending.result = info
+    finally:
+        with _refresh_lock:
+            del _pending_refreshes[repo_root]
+            if info:
+                _failed_refreshes.pop(repo_root, None)
+            else:
+                _failed_refreshes[repo_root] = time.monotonic()
+        pending.done.set()
+    return info
+
+
+_submodule_pool: Optional[concurrent.futures.ThreadPoolExecutor] = None
+_submodule_pool_lock = threading.Lock()
+
+
+def _prefetch_submodules(repo_root: str, submodules: Iterable[str], columns: FrozenSet[str]):
+    """
+    Refresh the snapshots of a superproject's submodules in the background.
+
+    Runs on a pool of SUBMODULE_WORKERS threads so opening a superproject
+    with many submodules has their status ready by the time their entries
+    are listed. The pool is kept smaller than MAX_GIT_PROCESSES, so lookups
+    for the files being listed always find a free git slot. Submodules with
+    a valid cached snapshot are skipped, and fetch_repo_info coalesces with
+    any lookup already running.
+    """
+    global _submodule_pool
+    with _submodule_pool_lock:
+        if _submodule_pool is None:
+            _submodule_pool = concurrent.futures.ThreadPoolExecutor(
+                max_workers=max(1, min(SUBMODULE_WORKERS, MAX_GIT_PROCESSES - 1)),
+                thread_name_prefix="nemo-git-submodule",
+            )
+        pool = _submodule_pool
+    for rel_path in submodules:
+        sub_root = os.path.normpath(os.path.join(repo_root, rel_path))
+        cached = cache.peek(sub_root, ttl=SNAPSHOT_MAX_AGE)
+        if cached and columns <= cached.get("columns", GIT_COLUMNS) and _validate_snapshot(sub_root, cached):
+            continue
+        pool.submit(fetch_repo_info, sub_root, columns)
+
+
+def patch_snapshot(repo_root: str, info: dict, rel_path: str) -> Optional[dict]:
+    """
+    Re-run status for a single path and patch it into a cached snapshot.
+
+    Only entries at or below rel_path are replaced, and the directory
+    rollups are adjusted by the difference, so the cost is one
+    pathspec-limited `git status` rather than a full repository scan.
+
+    Args:
+        repo_root: Repository root path
+        info: Snapshot previously returned by run_git
+        rel_path: Repo-relative path that changed
+
+    Returns:
+        The patched snapshot, or None if git failed
+    """
+    started_ns = time.time_ns()
+    output = _run_git_command(
+        repo_root, ["--literal-pathspecs"] + STATUS_ARGS + ["--", rel_path]
+    )
+    if output is None:
+        return None
+    fresh = parse_porcelain_status(output.splitlines())
+
+    file_status_map = dict(info["file_status_map"])
+    dir_rollup = {d: dict(counts) for d, counts in info.get("dir_rollup", {}).items()}
+
+    prefix = rel_path.rstrip("/") + "/"
+    stale = [p for p in file_status_map if p == rel_path or p.startswith(prefix)]
+    for p in stale:
+        _adjust_rollup(dir_rollup, p, file_status_map.pop(p), -1)
+    for p, status in fresh.items():
+        if p in file_status_map:
+            _adjust_rollup(dir_rollup, p, file_status_map[p], -1)
+        file_status_map[p] = status
+        _adjust_rollup(dir_rollup, p, status, 1)
+
+    patched_ns = dict(info.get("patched_ns", {}))
+    patched_ns[rel_path] = started_ns
+    patched = dict(info, file_status_map=file_status_map, dir_rollup=dir_rollup, patched_ns=patched_ns)
+    if "diff_stats" in info:
+        diff_stats = _patch_diff_stats(repo_root, info["diff_stats"], rel_path, prefix)
+        if diff_stats is None:
+            del patched["diff_stats"]  # recomputed in full on next use
+        else:
+            patched["diff_stats"] = diff_stats
+    cache.replace(repo_root, patched, info)
+    return patched
+
+
+def _patch_diff_stats(repo_root: str, diff_stats: dict, rel_path: str, prefix: str) -> Optional[dict]:
+    """Re-run the numstat for one path and patch it into a snapshot's line counts."""
+    output = _run_git_command(repo_root, DIFF_STAT_ARGS + ["--", rel_path])
+    if output is None:
+        return None
+    files = dict(diff_stats["files"])
+    dirs = {d: list(total) for d, total in diff_stats["dirs"].items()}
+    for p in [p for p in files if p == rel_path or p.startswith(prefix)]:
+        _adjust_diff_totals(dirs, p, files.pop(p), -1)
+    for p, stat in parse_numstat(output).items():
+        files[p] = stat
+        _adjust_diff_totals(dirs, p, stat, 1)
+    return {"files": files, "dirs": dirs}
+
+
+def refresh_path(path: str, columns: Optional[Iterable[str]] = None) -> Optional[dict]:
+    """
+    Refresh cached git information after a change to a specific path.
+
+    Patches the cached snapshot when the index and HEAD are unchanged and
+    falls back to a full `run_git` otherwise.
+
+    Args:
+        path: File system path known to have changed
+        columns: Column attributes for a full refresh (defaults to the
+                 columns visible in Nemo)
+
+    Returns:
+        The refreshed snapshot or None if path is not in a usable repo
+    """
+    if not path or not isinstance(path, str) or should_skip(path):
+        return None
+    repo_root = resolve_repo_root(path)
+    if not repo_root:
+        return None
+
+    info = cache.get(repo_root, ttl=SNAPSHOT_MAX_AGE)
+    rel_path = os.path.relpath(os.path.abspath(path), repo_root)
+    if info and rel_path != "." and _validate_snapshot(repo_root, info):
+        patched = patch_snapshot(repo_root, info, rel_path)
+        if patched:
+            return patched
+
+    if columns is None:
+        columns = column_settings.visible_in(os.path.dirname(os.path.abspath(path)))
+    return fetch_repo_info(repo_root, columns)
+
+
+def _validate_snapshot(repo_root: str, info: dict) -> bool:
+    """
+    Check that a snapshot still matches the repository index and HEAD.
+
+    The signature is re-read at most once per CACHE_TTL seconds per repo so
+    listing a large folder costs a handful of stats, not a few per file.
+    """
+    now = time.monotonic()
+    if now - info.get("validated_at", 0) < CACHE_TTL:
+        return True
+    if info.get("signature") is None or info["signature"] != _repo_signature(repo_root):
+        return False
+    info["validated_at"] = now
+    return True
+
+
+def _snapshot_age(info: dict) -> float:
+    """Seconds since the full status run behind a snapshot was started."""
+    return (time.time_ns() - info.get("taken_ns", 0)) / 1e9
+
+
+def _changed_since_snapshot(path: str, rel_path: str, info: dict) -> bool:
+    """Return True if path was modified after it was last read into info."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    since = info.get("patched_ns", {}).get(rel_path, info.get("taken_ns"))
+    if since is None:
+        return False
+    return max(st.st_mtime_ns, st.st_ctime_ns) > since
+
+
+def _repo_relative(path: str, repo_root: str) -> Optional[str]:
+    """Return path relative to repo_root ('.' for the root), or None."""
+    try:
+        return os.path.relpath(os.path.abspath(path), repo_root)
+    except ValueError:
+        return None
+
+
+def _empty_info() -> dict:
+    """Column values for a path with no git information."""
+    return dict.fromkeys(GIT_COLUMNS, "")
+
+
+def get_file_git_info(path: str, columns: Optional[Iterable[str]] = None) -> dict:
     """
     Get comprehensive git information for a file or directory.
     
@@ -456,48 +1838,93 @@ def get_file_git_info(path: str) -> dict:
     
     Args:
         path: File system path
+        columns: Column attributes to compute (defaults to the columns
+                 visible in the folder holding path); hidden columns are
+                 returned empty
         
     Returns:
-        Dict with git_repo, git_branch, and git_status keys
+        Dict with a key per column in GIT_COLUMNS
     """
+    if columns is None:
+        valid = path and isinstance(path, str)
+        columns = column_settings.visible_in(os.path.dirname(os.path.abspath(path))) if valid else frozenset()
+    else:
+        columns = frozenset(columns) & GIT_COLUMNS
+
     # Input validation
-    if not path or not isinstance(path, str) or should_skip(path):
-        return {"git_repo": "", "git_branch": "", "git_status": ""}
+    if not columns or not path or not isinstance(path, str) or should_skip(path):
+        return _empty_info()
 
     # Resolve repository root
     repo_root = resolve_repo_root(path)
     if not repo_root:
-        return {"git_repo": "", "git_branch": "", "git_status": ""}
+        if recorder.active:
+            recorder.note_outcome("none")
+        return _empty_info()
 
     # Try to get cached info first
-    cached = cache.get(repo_root)
+    if INCREMENTAL_REFRESH:
+        cached = cache.get(repo_root, ttl=SNAPSHOT_MAX_AGE)
+        if cached and not _validate_snapshot(repo_root, cached):
+            cached = None
+    else:
+        cached = cache.get(repo_root)
+    if cached and not columns <= cached.get("columns", GIT_COLUMNS):
+        # Snapshot was taken while a now-visible column was hidden
+        cached = None
     if not cached:
         # Fetch fresh git information
-        info = run_git(repo_root)
+        info = fetch_repo_info(repo_root, columns)
+        if recorder.active:
+            recorder.note_outcome("miss")
         if not info:
-            return {"git_repo": "", "git_branch": "", "git_status": ""}
-        cache.set(repo_root, info)
+            return _empty_info()
     else:
         info = cached
+        if recorder.active:
+            recorder.note_outcome("hit")
+
+    result = _empty_info()
+    for column in ("git_repo", "git_branch", "git_sync"):
+        if column in columns:
+            result[column] = info.get(column, "")
+    rel_path = _repo_relative(path, repo_root)
+    if "git_last_commit" in columns and rel_path is not None:
+        result["git_last_commit"] = format_last_commit(last_commits.lookup(repo_root, rel_path))
+
+    if cached and INCREMENTAL_REFRESH and rel_path is not None and columns & {"git_status", "git_changes"}:
+        if (rel_path == "." or os.path.isdir(path)) and _snapshot_age(info) >= CACHE_TTL:
+            # Folders roll up edits below them, which are only patched in
+            # once the edited file is listed, so they re-read the whole
+            # repository once the snapshot is CACHE_TTL old
+            info = fetch_repo_info(repo_root, columns) or info
+            if recorder.active:
+                recorder.note_outcome("miss")
+        elif rel_path != "." and _changed_since_snapshot(path, rel_path, info):
+            info = refresh_path(path, columns) or info
+            if recorder.active:
+                recorder.note_outcome("patch")
+
+    if "git_status" in columns:
+        # Determine appropriate status for the path
+        try:
+            if rel_path == ".":
+                # Repository root - show overall status and any operation in progress
+                status = get_overall_repo_status(info["file_status_map"])
+                if info.get("operation"):
+                    status = f"{status} ({info['operation']})"
+            else:
+                # Individual file or directory - show specific status
+                status = lookup_status(info, os.path.relpath(path, repo_root))
+        except (ValueError, OSError):
+            # Fallback to clean status if path resolution fails
+            status = "clean"
+        result["git_status"] = status
 
-    # Determine appropriate status for the path
-    try:
-        if os.path.abspath(path) == os.path.abspath(repo_root):
-            # Repository root - show overall status
-            status = get_overall_repo_status(info["file_status_map"])
-        else:
-            # Individual file or directory - show specific status
-            rel_path = os.path.relpath(path, repo_root)
-            status = info["file_status_map"].get(rel_path, "clean")
-    except (ValueError, OSError):
-        # Fallback to clean status if path resolution fails
-        status = "clean"
+    if "git_changes" in columns and rel_path is not None:
+        result["git_changes"] = format_changes(lookup_changes(repo_root, info, rel_path))
 
-    return {
-        "git_repo": info.get("git_repo", ""),
-        "git_branch": info.get("git_branch", ""),
-        "git_status": status,
-    }
+    return result
 
 
 # ============================================================
@@ -518,6 +1945,14 @@ class NemoGitIntegration(GObject.GObject, Nemo.ColumnProvider, Nemo.InfoProvider
     def __init__(self):
         super().__init__()
         self._column_stats = {"updates": 0, "errors": 0}
+        column_settings.connect()
+        dump_interval = os.environ.get(PROFILE_DUMP_ENV)
+        if dump_interval:
+            try:
+                latency.start_periodic_dump(float(dump_interval))
+            except (ValueError, OSError) as e:
+                logger.warning(f"Invalid {PROFILE_DUMP_ENV} setting: {e}")
+        recorder.configure_from_env()
         logger.info("Nemo Git Integration initialized")
 
     @staticmethod
@@ -545,7 +1980,25 @@ class NemoGitIntegration(GObject.GObject, Nemo.ColumnProvider, Nemo.InfoProvider
                 name="NemoGitIntegration::git_status",
                 attribute="git_status",
                 label="Git Status",
-                description="Working tree state (clean/dirty/untracked)"
+                description="Working tree state (clean/dirty/untracked/conflict)"
+            ),
+            Nemo.Column(
+                name="NemoGitIntegration::git_sync",
+                attribute="git_sync",
+                label="Git Sync",
+                description="Commits ahead of and behind the upstream branch"
+            ),
+            Nemo.Column(
+                name="NemoGitIntegration::git_last_commit",
+                attribute="git_last_commit",
+                label="Git Last Commit",
+                description="Most recent commit changing the file or folder"
+            ),
+            Nemo.Column(
+                name="NemoGitIntegration::git_changes",
+                attribute="git_changes",
+                label="Git Changes",
+                description="Lines added and removed since the last commit"
             ),
         )
 
@@ -555,6 +2008,12 @@ class NemoGitIntegration(GObject.GObject, Nemo.ColumnProvider, Nemo.InfoProvider
         
         Enhanced with error handling and performance tracking.
         """
+        recorder.poll()
+        tracing = recorder.active
+        if tracing:
+            recorder.begin_call()
+            start = time.perf_counter_ns()
+        path = None
         try:
             self._column_stats["updates"] += 1
             
@@ -566,13 +2025,21 @@ class NemoGitIntegration(GObject.GObject, Nemo.ColumnProvider, Nemo.InfoProvider
             if not path:
                 return Nemo.OperationResult.COMPLETE
 
-            info = get_file_git_info(path)
+            columns = column_settings.visible_in(os.path.dirname(path))
+            if SHOW_EMBLEMS:
+                # Emblems need the status in icon views and wherever the
+                # Git Status column is hidden, at the cost of its status pass
+                columns = columns | {"git_status"}
+            info = get_file_git_info(path, columns)
             self._apply_info(file, info)
             
         except Exception as e:
             self._column_stats["errors"] += 1
             logger.debug(f"Error updating file info: {e}")
             # Don't fail the operation, just skip git info
+        finally:
+            if tracing and path:
+                recorder.end_call(path, time.perf_counter_ns() - start)
             
         return Nemo.OperationResult.COMPLETE
 
@@ -592,11 +2059,21 @@ class NemoGitIntegration(GObject.GObject, Nemo.ColumnProvider, Nemo.InfoProvider
         file.add_string_attribute("git_repo", repo)
         file.add_string_attribute("git_branch", info.get("git_branch", "")[:20])  # Limit branch name length
         file.add_string_attribute("git_status", info.get("git_status", ""))
+        file.add_string_attribute("git_sync", info.get("git_sync", ""))
+        file.add_string_attribute("git_last_commit", info.get("git_last_commit", ""))
+        file.add_string_attribute("git_changes", info.get("git_changes", ""))
+
+        # Emblem from the same status, e.g. "conflict (merging)" -> conflict
+        if SHOW_EMBLEMS:
+            emblem = STATUS_EMBLEMS.get(info.get("git_status", "").split(" ", 1)[0])
+            if emblem:
+                file.add_emblem(emblem)
     
     def get_stats(self) -> dict:
         """Get performance statistics for monitoring."""
         cache_stats = cache.get_stats()
         return {
             **self._column_stats,
-            **cache_stats
+            **cache_stats,
+            "latency": latency.snapshot() if latency.enabled else {},
         }
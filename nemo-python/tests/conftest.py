@@ -3,14 +3,19 @@ pytest configuration and fixtures for nemo-git-integration tests
 """
 
 import os
+import subprocess
 import sys
+import tempfile
 
 import pytest
 
-# Add the extensions directory to sys.path so nemo_git_status can be imported
+# Add the extensions directory to sys.path so nemo_git_status can be imported,
+# and tools/ for the helpers shared with the benchmark and soak scripts
 extensions_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'extensions')
-if extensions_dir not in sys.path:
-    sys.path.insert(0, extensions_dir)
+tools_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'tools')
+for path in (extensions_dir, tools_dir):
+    if path not in sys.path:
+        sys.path.insert(0, path)
 
 
 # Create mock classes first
@@ -64,3 +69,62 @@ def setup_gi_mocks():
     """Automatically setup gi mocks for all tests"""
     # This ensures mocks are available in all test modules
     pass
+
+
+@pytest.fixture(autouse=True)
+def isolated_last_commit_cache(tmp_path, monkeypatch):
+    """Keep persisted last-commit indexes out of the user's cache directory."""
+    import nemo_git_status
+
+    monkeypatch.setattr(nemo_git_status, "LAST_COMMIT_CACHE_DIR", str(tmp_path / "last-commit"))
+    nemo_git_status.last_commits.clear()
+    yield
+    nemo_git_status.last_commits.wait()
+    nemo_git_status.last_commits.clear()
+
+
+@pytest.fixture
+def temp_git_repo():
+    """Create a temporary git repository with one commit."""
+    import nemo_git_status
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        subprocess.run(["git", "init"], cwd=tmpdir, check=True, stdout=subprocess.DEVNULL)
+        subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=tmpdir, check=True)
+        subprocess.run(["git", "config", "user.name", "Test User"], cwd=tmpdir, check=True)
+        with open(os.path.join(tmpdir, "README.md"), "w") as f:
+            f.write("# Test Repo\n")
+        subprocess.run(["git", "add", "."], cwd=tmpdir, check=True)
+        subprocess.run(["git", "commit", "-m", "Initial commit"], cwd=tmpdir, check=True, stdout=subprocess.DEVNULL)
+        nemo_git_status.cache.clear()
+        yield tmpdir
+        nemo_git_status.cache.clear()
+
+
+@pytest.fixture
+def git_calls(monkeypatch):
+    """Record the argument list of every git command the extension runs."""
+    import nemo_git_status
+
+    calls = []
+    original = nemo_git_status._run_git_command
+
+    def recording(repo_root, args, **kwargs):
+        calls.append(args)
+        return original(repo_root, args, **kwargs)
+
+    monkeypatch.setattr(nemo_git_status, "_run_git_command", recording)
+    return calls
+
+
+@pytest.fixture
+def fake_git(tmp_path, monkeypatch):
+    """Route the extension's git calls through a scriptable FakeGit."""
+    import nemo_git_status
+    from fakegit import FakeGit
+
+    fake = FakeGit(str(tmp_path / "fake-git"))
+    monkeypatch.setattr(nemo_git_status, "GIT_EXECUTABLE", fake.executable)
+    nemo_git_status.cache.clear()
+    yield fake
+    nemo_git_status.cache.clear()
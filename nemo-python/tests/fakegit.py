@@ -0,0 +1,122 @@
+"""
+Scriptable fake git executable for deterministic concurrency tests.
+
+FakeGit writes a small Python script that stands in for git. Because the
+extension runs git with an empty environment, the script reads its rules
+from a config.json next to itself rather than from variables. Each rule
+(keyed by subcommand, or "*" for any) can delay, print canned output,
+exit non-zero or pass through to the real git, and every invocation logs
+start and end events so tests can count calls and measure overlap.
+"""
+
+import json
+import os
+import shutil
+import sys
+from typing import Dict, List, Optional
+
+_SCRIPT = '''#!{python}
+import json, os, subprocess, sys, time
+
+here = os.path.dirname(os.path.abspath(__file__))
+with open(os.path.join(here, "config.json")) as f:
+    config = json.load(f)
+
+args = sys.argv[1:]
+repo = ""
+if len(args) >= 2 and args[0] == "-C":
+    repo, args = args[1], args[2:]
+sub = next((a for a in args if not a.startswith("-")), "")
+rule = config["rules"].get(sub, config["rules"].get("*", {{}}))
+
+
+def log(event):
+    line = json.dumps({{"event": event, "sub": sub, "repo": repo, "pid": os.getpid(),
+                       "t": time.monotonic()}}) + "\\n"
+    fd = os.open(os.path.join(here, "calls.log"), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+    try:
+        os.write(fd, line.encode())
+    finally:
+        os.close(fd)
+
+
+log("start")
+try:
+    time.sleep(rule.get("delay", 0))
+    if rule.get("passthrough"):
+        code = subprocess.call([config["real_git"]] + sys.argv[1:])
+    else:
+        out = rule.get("stdout", "") * rule.get("repeat", 1)
+        sys.stdout.write(out)
+        sys.stdout.flush()
+        code = rule.get("exit", 0)
+finally:
+    log("end")
+sys.exit(code)
+'''
+
+
+class FakeGit:
+    """A fake git executable living in a directory of its own."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.executable = os.path.join(directory, "git")
+        self.log_path = os.path.join(directory, "calls.log")
+        self.rules: Dict[str, dict] = {"*": {"passthrough": True}}
+        os.makedirs(directory, exist_ok=True)
+        with open(self.executable, "w") as f:
+            f.write(_SCRIPT.format(python=sys.executable))
+        os.chmod(self.executable, 0o755)
+        self._write_config()
+
+    def _write_config(self):
+        config = {"rules": self.rules, "real_git": shutil.which("git") or "/usr/bin/git"}
+        with open(os.path.join(self.directory, "config.json"), "w") as f:
+            json.dump(config, f)
+
+    def set_rule(self, subcommand: str = "*", *, delay: float = 0, stdout: str = "",
+                 repeat: int = 1, exit: int = 0, passthrough: bool = False):
+        """
+        Configure how the fake responds to a subcommand.
+
+        Args:
+            subcommand: git subcommand such as "status", or "*" for the default
+            delay: Seconds to sleep before responding
+            stdout: Output to print
+            repeat: Times to repeat stdout (for large outputs)
+            exit: Exit code
+            passthrough: Run the real git after the delay instead
+        """
+        self.rules[subcommand] = {"delay": delay, "stdout": stdout, "repeat": repeat,
+                                  "exit": exit, "passthrough": passthrough}
+        self._write_config()
+
+    def reset_calls(self):
+        """Forget logged invocations."""
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+
+    def events(self) -> List[dict]:
+        """Logged start/end events in the order they were written."""
+        if not os.path.exists(self.log_path):
+            return []
+        with open(self.log_path) as f:
+            return [json.loads(line) for line in f if line.strip()]
+
+    def count(self, subcommand: Optional[str] = None, repo: Optional[str] = None) -> int:
+        """Number of invocations, optionally filtered by subcommand and repo."""
+        return sum(
+            1 for e in self.events()
+            if e["event"] == "start"
+            and (subcommand is None or e["sub"] == subcommand)
+            and (repo is None or e["repo"] == repo)
+        )
+
+    def max_concurrency(self) -> int:
+        """Largest number of invocations that were running at the same time."""
+        running = peak = 0
+        for event in sorted(self.events(), key=lambda e: (e["t"], e["event"] == "start")):
+            running += 1 if event["event"] == "start" else -1
+            peak = max(peak, running)
+        return peak
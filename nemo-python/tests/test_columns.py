@@ -0,0 +1,290 @@
+import os
+import subprocess
+import time
+
+import pytest
+
+import nemo_git_status
+from nemo_git_status import (
+    ColumnSettings,
+    GIT_COLUMNS,
+    get_file_git_info,
+    run_git,
+    cache,
+)
+
+
+@pytest.fixture
+def temp_git_repo(temp_git_repo):
+    """The shared temp_git_repo with an origin remote."""
+    subprocess.run(["git", "remote", "add", "origin", "https://example.com/repo.git"], cwd=temp_git_repo, check=True)
+    return temp_git_repo
+
+
+def _commands(git_calls):
+    """The git subcommand of each recorded call."""
+    return [args[0] for args in git_calls]
+
+
+# --------------------------
+# ColumnSettings
+# --------------------------
+
+def test_column_settings_default_all_visible():
+    assert ColumnSettings().visible == GIT_COLUMNS
+
+
+@pytest.mark.parametrize("names,expected", [
+    (["name", "size", "NemoGitIntegration::git_branch"], {"git_branch"}),
+    (["NemoGitIntegration::git_repo", "NemoGitIntegration::git_status"], {"git_repo", "git_status"}),
+    (["name", "date_modified"], set()),
+    (["NemoGitIntegration::unknown"], set()),
+])
+def test_column_settings_parses_nemo_names(names, expected):
+    settings = ColumnSettings()
+    settings.set_visible(names)
+    assert settings.visible == expected
+
+
+def test_column_settings_connect_without_gio(monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "Gio", None)
+    settings = ColumnSettings()
+    settings.connect()
+    assert settings.visible == GIT_COLUMNS
+
+
+def test_folder_metadata_overrides_default_columns(temp_git_repo, monkeypatch):
+    docs = os.path.join(temp_git_repo, "docs")
+    os.makedirs(docs)
+    reads = []
+
+    def folder_columns(folder):
+        reads.append(folder)
+        return ["name", "NemoGitIntegration::git_status"] if folder == temp_git_repo else None
+
+    settings = ColumnSettings()
+    settings.set_visible(["name", "size"])
+    monkeypatch.setattr(settings, "_folder_columns", folder_columns)
+    monkeypatch.setattr(nemo_git_status, "column_settings", settings)
+
+    readme = os.path.join(temp_git_repo, "README.md")
+    assert get_file_git_info(readme)["git_status"] == "clean"
+    assert get_file_git_info(os.path.join(docs, "x.txt"))["git_status"] == ""
+    get_file_git_info(readme)
+    assert reads == [temp_git_repo, docs]  # kept for CACHE_TTL
+
+
+def test_folder_metadata_is_reread_after_cache_ttl(monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "CACHE_TTL", 0)
+    settings = ColumnSettings()
+    columns = [["NemoGitIntegration::git_branch"], None]
+    monkeypatch.setattr(settings, "_folder_columns", lambda folder: columns.pop(0))
+    assert settings.visible_in("/some/folder") == {"git_branch"}
+    assert settings.visible_in("/some/folder") == GIT_COLUMNS
+
+
+# --------------------------
+# Column-limited git work
+# --------------------------
+
+def test_branch_only_skips_status_and_origin(temp_git_repo, git_calls):
+    info = get_file_git_info(os.path.join(temp_git_repo, "README.md"), columns={"git_branch"})
+    assert info == {"git_repo": "", "git_branch": "main", "git_status": "", "git_sync": "",
+                    "git_last_commit": "", "git_changes": ""}
+    assert "status" not in _commands(git_calls)
+    assert "remote" not in _commands(git_calls)
+
+
+def test_hidden_repo_column_skips_origin(temp_git_repo, git_calls):
+    info = get_file_git_info(temp_git_repo, columns={"git_branch", "git_status"})
+    assert info["git_repo"] == ""
+    assert info["git_status"] == "clean"
+    assert "remote" not in _commands(git_calls)
+
+
+def test_no_visible_columns_runs_nothing(temp_git_repo, git_calls):
+    info = get_file_git_info(temp_git_repo, columns=set())
+    assert info == {"git_repo": "", "git_branch": "", "git_status": "", "git_sync": "",
+                    "git_last_commit": "", "git_changes": ""}
+    assert git_calls == []
+
+
+def test_snapshot_refreshed_when_column_becomes_visible(temp_git_repo):
+    readme = os.path.join(temp_git_repo, "README.md")
+    assert get_file_git_info(readme, columns={"git_branch"})["git_repo"] == ""
+    info = get_file_git_info(readme, columns=GIT_COLUMNS)
+    assert info["git_repo"] == "https://example.com/repo.git"
+
+
+def test_run_git_status_only_detects_invalid_repo(tmp_path):
+    assert run_git(str(tmp_path), {"git_status"}) is None
+
+
+# --------------------------
+# Git Sync column
+# --------------------------
+
+@pytest.fixture
+def tracking_clone(temp_git_repo, tmp_path):
+    """Clone temp_git_repo so the clone's main branch tracks it."""
+    clone = str(tmp_path / "clone")
+    subprocess.run(["git", "clone", "-q", temp_git_repo, clone], check=True)
+    subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=clone, check=True)
+    subprocess.run(["git", "config", "user.name", "Test User"], cwd=clone, check=True)
+    return clone
+
+
+def _commit(repo, message):
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", message], cwd=repo, check=True)
+
+
+def test_sync_only_reads_status_headers(tracking_clone, git_calls):
+    _commit(tracking_clone, "local")
+    info = get_file_git_info(tracking_clone, columns={"git_sync"})
+    assert info["git_sync"] == "ahead 1"
+    assert info["git_status"] == ""
+    assert _commands(git_calls) == ["status"]
+
+
+def test_sync_without_upstream_is_empty(temp_git_repo):
+    assert get_file_git_info(temp_git_repo)["git_sync"] == ""
+
+
+def test_sync_shown_for_files_and_repo_root(tracking_clone):
+    readme = os.path.join(tracking_clone, "README.md")
+    assert get_file_git_info(readme)["git_sync"] == "up to date"
+    assert get_file_git_info(tracking_clone)["git_sync"] == "up to date"
+
+
+def test_push_invalidates_sync(temp_git_repo, tmp_path, monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "CACHE_TTL", 0)
+    remote = str(tmp_path / "remote.git")
+    subprocess.run(["git", "clone", "-q", "--bare", temp_git_repo, remote], check=True)
+    clone = str(tmp_path / "pusher")
+    subprocess.run(["git", "clone", "-q", remote, clone], check=True)
+    subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=clone, check=True)
+    subprocess.run(["git", "config", "user.name", "Test User"], cwd=clone, check=True)
+    _commit(clone, "local")
+    assert get_file_git_info(clone)["git_sync"] == "ahead 1"
+
+    signature = nemo_git_status._repo_signature(clone)
+    subprocess.run(["git", "push", "-q"], cwd=clone, check=True)
+    assert nemo_git_status._repo_signature(clone) != signature
+    assert get_file_git_info(clone)["git_sync"] == "up to date"
+
+
+def test_signature_reads_refs_of_linked_worktrees(temp_git_repo, tmp_path):
+    worktree = str(tmp_path / "worktree")
+    subprocess.run(["git", "worktree", "add", "-q", "-b", "side", worktree], cwd=temp_git_repo, check=True)
+    signature = nemo_git_status._repo_signature(worktree)
+    assert signature[4][1] is not None  # refs/heads/side lives in the main git directory
+
+    time.sleep(0.01)
+    _commit(worktree, "side")
+    assert nemo_git_status._repo_signature(worktree) != signature
+
+
+def test_fetch_invalidates_sync(temp_git_repo, tracking_clone, monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "CACHE_TTL", 0)
+    _commit(tracking_clone, "local")
+    assert get_file_git_info(tracking_clone)["git_sync"] == "ahead 1"
+
+    _commit(temp_git_repo, "remote")
+    subprocess.run(["git", "fetch", "-q"], cwd=tracking_clone, check=True)
+    assert get_file_git_info(tracking_clone)["git_sync"] == "ahead 1, behind 1"
+
+
+# --------------------------
+# Git Changes column
+# --------------------------
+
+@pytest.fixture
+def changed_repo(temp_git_repo):
+    """temp_git_repo with two edited files in src/, a binary and an untracked file."""
+    src = os.path.join(temp_git_repo, "src")
+    os.makedirs(src)
+    for name in ("one.txt", "two.txt"):
+        with open(os.path.join(src, name), "w") as f:
+            f.write("a\nb\nc\n")
+    with open(os.path.join(temp_git_repo, "image.bin"), "wb") as f:
+        f.write(b"\0\1")
+    subprocess.run(["git", "add", "."], cwd=temp_git_repo, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", "files"], cwd=temp_git_repo, check=True)
+
+    with open(os.path.join(src, "one.txt"), "w") as f:
+        f.write("a\nB\nc\nd\n")
+    with open(os.path.join(src, "two.txt"), "w") as f:
+        f.write("a\n")
+    with open(os.path.join(temp_git_repo, "image.bin"), "wb") as f:
+        f.write(b"\0\2")
+    with open(os.path.join(temp_git_repo, "new.txt"), "w") as f:
+        f.write("new\n")
+    cache.clear()
+    return temp_git_repo
+
+
+def _changes(path, columns=("git_status", "git_changes")):
+    return get_file_git_info(path, columns=columns)["git_changes"]
+
+
+# Git Changes on its own must be capped and patched like it is next to Git Status
+ALONE_OR_WITH_STATUS = pytest.mark.parametrize("columns", [("git_changes",), ("git_status", "git_changes")])
+
+
+def test_changes_for_files_directories_and_root(changed_repo):
+    assert _changes(os.path.join(changed_repo, "src", "one.txt")) == "+2/-1"
+    assert _changes(os.path.join(changed_repo, "src", "two.txt")) == "+0/-2"
+    assert _changes(os.path.join(changed_repo, "src")) == "+2/-3"
+    assert _changes(os.path.join(changed_repo, "image.bin")) == "binary"
+    assert _changes(changed_repo) == "+2/-3"
+    assert _changes(os.path.join(changed_repo, "new.txt")) == ""
+    assert _changes(os.path.join(changed_repo, "README.md")) == ""
+
+
+def test_changes_use_one_diff_per_snapshot(changed_repo, git_calls):
+    for name in ("one.txt", "two.txt"):
+        _changes(os.path.join(changed_repo, "src", name))
+    _changes(os.path.join(changed_repo, "src"))
+    assert _commands(git_calls).count("--literal-pathspecs") == 1
+
+
+def test_hidden_changes_column_runs_no_diff(changed_repo, git_calls):
+    get_file_git_info(os.path.join(changed_repo, "src", "one.txt"), columns={"git_status"})
+    assert "--literal-pathspecs" not in _commands(git_calls)
+
+
+@ALONE_OR_WITH_STATUS
+def test_changes_skipped_above_file_limit(changed_repo, git_calls, monkeypatch, columns):
+    monkeypatch.setattr(nemo_git_status, "DIFF_STAT_MAX_FILES", 1)
+    assert _changes(os.path.join(changed_repo, "src", "one.txt"), columns) == ""
+    assert "--literal-pathspecs" not in _commands(git_calls)
+
+
+@ALONE_OR_WITH_STATUS
+def test_changes_follow_patched_file(changed_repo, columns):
+    one = os.path.join(changed_repo, "src", "one.txt")
+    assert _changes(one, columns) == "+2/-1"
+    time.sleep(0.01)
+    with open(one, "a") as f:
+        f.write("e\nf\n")
+    assert _changes(one, columns) == "+4/-1"
+    assert _changes(os.path.join(changed_repo, "src"), columns) == "+4/-3"
+
+
+@ALONE_OR_WITH_STATUS
+def test_changes_reset_when_index_changes(changed_repo, monkeypatch, columns):
+    monkeypatch.setattr(nemo_git_status, "CACHE_TTL", 0)
+    one = os.path.join(changed_repo, "src", "one.txt")
+    assert _changes(one, columns) == "+2/-1"
+    subprocess.run(["git", "add", "src"], cwd=changed_repo, check=True)
+    subprocess.run(["git", "reset", "-q", "--hard"], cwd=changed_repo, check=True)
+    assert _changes(one, columns) == ""
+
+
+def test_changes_reset_with_snapshot(changed_repo, monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "CACHE_TTL", 0)
+    one = os.path.join(changed_repo, "src", "one.txt")
+    assert _changes(one) == "+2/-1"
+    subprocess.run(["git", "commit", "-q", "-am", "commit changes"], cwd=changed_repo, check=True)
+    assert _changes(one) == ""
+    assert _changes(changed_repo) == ""
@@ -0,0 +1,115 @@
+"""
+Deterministic concurrency tests driven by the FakeGit harness.
+
+Covers coalescing of concurrent cache misses, timeouts and their negative
+caching, the bound on concurrent git processes, and failed, partial and
+large git output.
+"""
+
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+import nemo_git_status
+from nemo_git_status import get_file_git_info, run_git
+
+STATUS_HEADER = "# branch.oid 0000000\n# branch.head main\n"
+
+
+@pytest.fixture
+def fake_repo(tmp_path, fake_git):
+    """A directory that looks like a repository, answered by the fake git."""
+    root = tmp_path / "repo"
+    (root / ".git").mkdir(parents=True)
+    (root / "a.txt").write_text("a\n")
+    (root / "b.txt").write_text("b\n")
+    fake_git.set_rule("rev-parse", stdout="main\n")
+    fake_git.set_rule("remote", exit=2)
+    fake_git.set_rule("status", stdout=STATUS_HEADER + "1 .M N... 100644 100644 100644 0 0 a.txt\n")
+    return str(root)
+
+
+def _in_threads(count, target):
+    barrier = threading.Barrier(count)
+    results = [None] * count
+
+    def worker(i):
+        barrier.wait()
+        results[i] = target(i)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+    return results
+
+
+def test_concurrent_misses_run_status_once(fake_repo, fake_git):
+    fake_git.set_rule("status", delay=0.3,
+                      stdout=STATUS_HEADER + "1 .M N... 100644 100644 100644 0 0 a.txt\n")
+    paths = [os.path.join(fake_repo, name) for name in ("a.txt", "b.txt")]
+
+    results = _in_threads(8, lambda i: get_file_git_info(paths[i % 2]))
+
+    assert fake_git.count("status") == 1
+    assert [r["git_status"] for r in results] == ["dirty", "clean"] * 4
+
+
+def test_timeout_returns_empty_and_is_not_retried(fake_repo, fake_git, monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "GIT_TIMEOUT", 0.2)
+    fake_git.set_rule("status", delay=5)
+    readme = os.path.join(fake_repo, "a.txt")
+
+    start = time.monotonic()
+    assert get_file_git_info(readme)["git_status"] == ""
+    assert get_file_git_info(readme)["git_status"] == ""
+    assert time.monotonic() - start < 2
+    assert fake_git.count("status") == 1
+
+
+def test_git_processes_are_bounded(tmp_path, fake_git, monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "_git_slots", threading.BoundedSemaphore(2))
+    fake_git.set_rule("rev-parse", delay=0.1, stdout="main\n")
+    roots = []
+    for i in range(6):
+        root = tmp_path / f"repo{i}"
+        (root / ".git").mkdir(parents=True)
+        roots.append(str(root))
+
+    results = _in_threads(6, lambda i: run_git(roots[i], ["git_branch"]))
+
+    assert all(r["git_branch"] == "main" for r in results)
+    assert fake_git.count("rev-parse") == 6
+    assert fake_git.max_concurrency() <= 2
+
+
+def test_partial_output_with_failure_is_discarded(fake_repo, fake_git):
+    fake_git.set_rule("status", stdout=STATUS_HEADER + "1 .M N... 100644 100644", exit=128)
+    assert run_git(fake_repo) is None
+    assert get_file_git_info(os.path.join(fake_repo, "b.txt"))["git_status"] == ""
+
+
+def test_large_status_output_is_parsed(fake_repo, fake_git):
+    big = "".join(f"1 .M N... 100644 100644 100644 0 0 src/file_{i:06d}.txt\n" for i in range(50_000))
+    fake_git.set_rule("status", stdout=STATUS_HEADER + big)
+
+    info = run_git(fake_repo)
+
+    assert len(info["file_status_map"]) == 50_000
+    assert info["dir_rollup"]["src"] == {"dirty": 50_000}
+
+
+def test_real_git_passthrough(tmp_path, fake_git):
+    root = tmp_path / "real"
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    (root / "new.txt").write_text("x\n")
+    fake_git.reset_calls()
+
+    # Status only: an empty repository has no HEAD for the branch probe
+    info = run_git(str(root), ["git_status"])
+
+    assert info["file_status_map"]["new.txt"] == "untracked"
+    assert fake_git.count("status", repo=str(root)) == 1
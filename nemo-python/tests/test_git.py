@@ -1,40 +1,21 @@
 import os
 import subprocess
-import tempfile
+import threading
 import time
 
 import pytest
+import nemo_git_status
 from nemo_git_status import (
     run_git,
     parse_porcelain_status,
     resolve_repo_root,
     get_file_git_info,
+    build_dir_rollup,
+    refresh_path,
     cache,
 )
 
 
-# --------------------------
-# Fixtures
-# --------------------------
-
-@pytest.fixture
-def temp_git_repo():
-    """Create a temporary git repository with one commit."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        subprocess.run(["git", "init"], cwd=tmpdir, check=True, stdout=subprocess.DEVNULL)
-        subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=tmpdir, check=True)
-        subprocess.run(["git", "config", "user.name", "Test User"], cwd=tmpdir, check=True)
-
-        file_path = os.path.join(tmpdir, "README.md")
-        with open(file_path, "w") as f:
-            f.write("# Test Repo\n")
-
-        subprocess.run(["git", "add", "."], cwd=tmpdir, check=True)
-        subprocess.run(["git", "commit", "-m", "Initial commit"], cwd=tmpdir, check=True)
-
-        yield tmpdir
-
-
 # --------------------------
 # Batch Git Command Tests
 # --------------------------
@@ -115,3 +96,325 @@ def test_invalid_path_handling(tmp_path):
     assert info["git_repo"] == ""
     assert info["git_branch"] == ""
     assert info["git_status"] == ""
+
+
+# --------------------------
+# Incremental Refresh Tests
+# --------------------------
+
+def test_build_dir_rollup_counts_ancestors():
+    rollup = build_dir_rollup({"a/b/c.txt": "dirty", "a/d.txt": "untracked", "top.txt": "dirty"})
+    assert rollup["a"] == {"dirty": 1, "untracked": 1}
+    assert rollup["a/b"] == {"dirty": 1}
+    assert "" not in rollup
+
+
+def test_directory_rolls_up_dirty_child(temp_git_repo):
+    subdir = os.path.join(temp_git_repo, "src")
+    os.makedirs(subdir)
+    with open(os.path.join(subdir, "code.py"), "w") as f:
+        f.write("print('hi')\n")
+    subprocess.run(["git", "add", "."], cwd=temp_git_repo, check=True)
+    subprocess.run(["git", "commit", "-m", "Add code"], cwd=temp_git_repo, check=True, stdout=subprocess.DEVNULL)
+    with open(os.path.join(subdir, "code.py"), "a") as f:
+        f.write("print('again')\n")
+
+    cache.clear()
+    assert get_file_git_info(subdir)["git_status"] == "dirty"
+
+
+def test_changed_file_is_patched_without_full_refresh(temp_git_repo, monkeypatch):
+    readme = os.path.join(temp_git_repo, "README.md")
+    cache.clear()
+    assert get_file_git_info(readme)["git_status"] == "clean"
+
+    def fail_full_refresh(repo_root):
+        raise AssertionError("full refresh should not run")
+
+    monkeypatch.setattr(nemo_git_status, "run_git", fail_full_refresh)
+    time.sleep(0.01)
+    with open(readme, "a") as f:
+        f.write("edited\n")
+
+    assert get_file_git_info(readme)["git_status"] == "dirty"
+    assert get_file_git_info(temp_git_repo)["git_status"] == "dirty"
+
+
+def test_listing_an_edited_file_updates_its_folders(temp_git_repo, monkeypatch):
+    deep = os.path.join(temp_git_repo, "a", "b")
+    os.makedirs(deep)
+    code = os.path.join(deep, "code.py")
+    with open(code, "w") as f:
+        f.write("print('hi')\n")
+    subprocess.run(["git", "add", "."], cwd=temp_git_repo, check=True)
+    subprocess.run(["git", "commit", "-m", "Add code"], cwd=temp_git_repo, check=True, stdout=subprocess.DEVNULL)
+    cache.clear()
+    assert get_file_git_info(os.path.join(temp_git_repo, "a"))["git_status"] == "clean"
+
+    refreshed = []
+    original = nemo_git_status.refresh_path
+    monkeypatch.setattr(nemo_git_status, "refresh_path", lambda *args: refreshed.append(args[0]) or original(*args))
+    time.sleep(0.01)
+    with open(code, "a") as f:
+        f.write("print('again')\n")
+
+    assert get_file_git_info(code)["git_status"] == "dirty"
+    assert refreshed == [code]
+    assert get_file_git_info(os.path.join(temp_git_repo, "a"))["git_status"] == "dirty"
+    assert get_file_git_info(deep)["git_status"] == "dirty"
+
+
+def _age_snapshot(repo_root, seconds):
+    """Make a cached snapshot look as if its status ran `seconds` ago."""
+    info = cache.get(repo_root, ttl=nemo_git_status.SNAPSHOT_MAX_AGE)
+    info["taken_ns"] -= int(seconds * 1e9)
+
+
+def test_folders_show_unlisted_edits_after_cache_ttl(temp_git_repo):
+    deep = os.path.join(temp_git_repo, "a", "b")
+    os.makedirs(deep)
+    code = os.path.join(deep, "code.py")
+    with open(code, "w") as f:
+        f.write("print('hi')\n")
+    subprocess.run(["git", "add", "."], cwd=temp_git_repo, check=True)
+    subprocess.run(["git", "commit", "-m", "Add code"], cwd=temp_git_repo, check=True, stdout=subprocess.DEVNULL)
+    cache.clear()
+    assert get_file_git_info(temp_git_repo)["git_status"] == "clean"
+
+    # Edited in place: neither the root nor the folders change mtime
+    with open(code, "a") as f:
+        f.write("print('again')\n")
+    assert get_file_git_info(os.path.join(temp_git_repo, "a"))["git_status"] == "clean"
+    _age_snapshot(temp_git_repo, nemo_git_status.CACHE_TTL)
+    assert get_file_git_info(temp_git_repo)["git_status"] == "dirty"
+    assert get_file_git_info(os.path.join(temp_git_repo, "a"))["git_status"] == "dirty"
+
+
+def test_files_are_not_refreshed_on_cache_ttl(temp_git_repo, monkeypatch):
+    readme = os.path.join(temp_git_repo, "README.md")
+    get_file_git_info(readme)
+    _age_snapshot(temp_git_repo, nemo_git_status.CACHE_TTL)
+    runs = []
+    monkeypatch.setattr(nemo_git_status, "run_git", lambda *args: runs.append(args))
+    assert get_file_git_info(readme)["git_status"] == "clean"
+    assert runs == []
+
+
+def test_older_full_snapshot_does_not_replace_a_patch(temp_git_repo):
+    readme = os.path.join(temp_git_repo, "README.md")
+    stale = nemo_git_status.run_git(temp_git_repo)
+    get_file_git_info(readme)
+    time.sleep(0.01)
+    with open(readme, "a") as f:
+        f.write("more\n")
+    assert get_file_git_info(readme)["git_status"] == "dirty"
+
+    cache.set(temp_git_repo, stale)
+    assert cache.get(temp_git_repo, ttl=nemo_git_status.SNAPSHOT_MAX_AGE)["file_status_map"] == {"README.md": "dirty"}
+
+
+def test_patch_does_not_replace_a_newer_snapshot(temp_git_repo):
+    base = nemo_git_status.run_git(temp_git_repo)
+    cache.set(temp_git_repo, base)
+    newer = nemo_git_status.run_git(temp_git_repo)
+    cache.set(temp_git_repo, newer)
+
+    cache.replace(temp_git_repo, dict(base, file_status_map={"README.md": "dirty"}), base)
+    assert cache.get(temp_git_repo, ttl=nemo_git_status.SNAPSHOT_MAX_AGE) is newer
+
+
+def test_index_change_forces_full_refresh(temp_git_repo, monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "CACHE_TTL", 0)
+    readme = os.path.join(temp_git_repo, "README.md")
+    cache.clear()
+    info = refresh_path(readme)
+    assert info["file_status_map"] == {}
+
+    new_file = os.path.join(temp_git_repo, "staged.txt")
+    with open(new_file, "w") as f:
+        f.write("staged\n")
+    subprocess.run(["git", "add", "staged.txt"], cwd=temp_git_repo, check=True)
+
+    refreshed = refresh_path(readme)
+    assert refreshed["signature"] != info["signature"]
+    assert refreshed["file_status_map"]["staged.txt"] == "dirty"
+
+
+# --------------------------
+# Conflicts and operations in progress
+# --------------------------
+
+@pytest.fixture
+def conflicted_repo(temp_git_repo):
+    """temp_git_repo stopped in a merge with a conflict in src/conflict.txt."""
+    def git(*args):
+        subprocess.run(["git", *args], cwd=temp_git_repo, check=False,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    src = os.path.join(temp_git_repo, "src")
+    os.makedirs(src)
+    conflict = os.path.join(src, "conflict.txt")
+    with open(conflict, "w") as f:
+        f.write("base\n")
+    git("add", ".")
+    git("commit", "-m", "base")
+    git("checkout", "-b", "other")
+    with open(conflict, "w") as f:
+        f.write("other\n")
+    git("commit", "-am", "other")
+    git("checkout", "-")
+    with open(conflict, "w") as f:
+        f.write("mine\n")
+    git("commit", "-am", "mine")
+    git("merge", "other")
+    cache.clear()
+    return temp_git_repo
+
+
+def test_conflicts_are_shown_and_rolled_up(conflicted_repo):
+    assert get_file_git_info(os.path.join(conflicted_repo, "src", "conflict.txt"))["git_status"] == "conflict"
+    assert get_file_git_info(os.path.join(conflicted_repo, "src"))["git_status"] == "conflict"
+    assert get_file_git_info(os.path.join(conflicted_repo, "README.md"))["git_status"] == "clean"
+    assert get_file_git_info(conflicted_repo)["git_status"] == "conflict (merging)"
+
+
+def test_finished_operation_invalidates_snapshot(conflicted_repo, monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "CACHE_TTL", 0)
+    assert get_file_git_info(conflicted_repo)["git_status"] == "conflict (merging)"
+    subprocess.run(["git", "merge", "--abort"], cwd=conflicted_repo, check=True)
+    assert get_file_git_info(conflicted_repo)["git_status"] == "clean"
+
+
+@pytest.mark.parametrize("marker,operation", [
+    ("rebase-merge", "rebasing"),
+    ("rebase-apply", "rebasing"),
+    ("CHERRY_PICK_HEAD", "cherry-picking"),
+    ("REVERT_HEAD", "reverting"),
+    ("BISECT_LOG", "bisecting"),
+])
+def test_detect_operation_from_markers(tmp_path, marker, operation):
+    git_dir = tmp_path / ".git"
+    git_dir.mkdir()
+    assert nemo_git_status.detect_operation(str(tmp_path)) == ""
+    (git_dir / marker).mkdir()
+    assert nemo_git_status.detect_operation(str(tmp_path)) == operation
+
+
+def test_operation_marker_changes_signature(temp_git_repo):
+    before = nemo_git_status._repo_signature(temp_git_repo)
+    open(os.path.join(temp_git_repo, ".git", "CHERRY_PICK_HEAD"), "w").close()
+    assert nemo_git_status._repo_signature(temp_git_repo) != before
+
+
+# --------------------------
+# Submodules
+# --------------------------
+
+def _run(repo, *args):
+    subprocess.run(["git", "-c", "protocol.file.allow=always", *args], cwd=repo, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+@pytest.fixture
+def superproject(tmp_path):
+    """A repository with two submodules, libs/one and libs/two."""
+    root = tmp_path / "super"
+    for repo in (tmp_path / "one", tmp_path / "two", root):
+        repo.mkdir()
+        _run(repo, "init", "-q")
+        _run(repo, "config", "user.email", "test@example.com")
+        _run(repo, "config", "user.name", "Test User")
+        (repo / "file.txt").write_text(f"{repo.name}\n")
+        _run(repo, "add", ".")
+        _run(repo, "commit", "-q", "-m", "initial")
+    for name in ("one", "two"):
+        _run(root, "submodule", "add", "-q", str(tmp_path / name), f"libs/{name}")
+    _run(root, "commit", "-q", "-m", "add submodules")
+    cache.clear()
+    yield str(root)
+    cache.clear()
+
+
+def _wait_for_snapshot(repo_root, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if cache.get(repo_root, ttl=60):
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_paths_in_submodule_resolve_to_submodule(superproject):
+    sub = os.path.join(superproject, "libs", "one")
+    assert resolve_repo_root(os.path.join(sub, "file.txt")) == sub
+    assert resolve_repo_root(sub) == sub
+    assert resolve_repo_root(os.path.join(superproject, "libs")) == superproject
+    assert nemo_git_status.resolve_git_dir(sub) == os.path.join(superproject, ".git", "modules", "libs", "one")
+    assert nemo_git_status._repo_signature(sub) is not None
+
+
+def test_submodule_entry_shows_its_own_status(superproject):
+    sub = os.path.join(superproject, "libs", "one")
+    with open(os.path.join(sub, "file.txt"), "a") as f:
+        f.write("changed\n")
+
+    assert get_file_git_info(os.path.join(sub, "file.txt"))["git_status"] == "dirty"
+    assert get_file_git_info(sub)["git_status"] == "dirty"
+    assert get_file_git_info(os.path.join(superproject, "libs", "two"))["git_status"] == "clean"
+    # The superproject ignores work in progress inside its submodules
+    assert get_file_git_info(superproject)["git_status"] == "clean"
+
+
+def test_superproject_status_does_not_recurse(superproject, git_calls):
+    run_git(superproject)
+    status_args = [args for args in git_calls if "status" in args]
+    assert status_args and all("--ignore-submodules=dirty" in args for args in status_args)
+
+
+def test_opening_superproject_refreshes_submodules(superproject):
+    info = get_file_git_info(os.path.join(superproject, "file.txt"))
+    assert info["git_status"] == "clean"
+    assert cache.get(superproject)["submodules"] == ("libs/one", "libs/two")
+    for name in ("one", "two"):
+        assert _wait_for_snapshot(os.path.join(superproject, "libs", name))
+
+
+@pytest.mark.parametrize("workers, git_processes, expected", [(1, 4, 1), (4, 2, 1)])
+def test_prefetch_is_bounded(superproject, monkeypatch, workers, git_processes, expected):
+    running = []
+    peak = []
+    lock = threading.Lock()
+    original = nemo_git_status.run_git
+
+    def slow_run_git(repo_root, columns=None):
+        with lock:
+            running.append(repo_root)
+            peak.append(len(running))
+        time.sleep(0.1)
+        try:
+            return original(repo_root, columns)
+        finally:
+            with lock:
+                running.remove(repo_root)
+
+    monkeypatch.setattr(nemo_git_status, "SUBMODULE_WORKERS", workers)
+    monkeypatch.setattr(nemo_git_status, "MAX_GIT_PROCESSES", git_processes)
+    monkeypatch.setattr(nemo_git_status, "_submodule_pool", None)
+    monkeypatch.setattr(nemo_git_status, "run_git", slow_run_git)
+    nemo_git_status.fetch_repo_info(superproject)
+    for name in ("one", "two"):
+        assert _wait_for_snapshot(os.path.join(superproject, "libs", name))
+    # The superproject finished before its submodules started, and the two
+    # submodules, each slow enough to overlap, ran no more than workers at once
+    # and left a git slot free for foreground lookups
+    assert len(peak) == 3
+    assert max(peak) <= expected
+
+
+def test_prefetch_does_not_count_cache_lookups(superproject):
+    nemo_git_status.fetch_repo_info(superproject)
+    for name in ("one", "two"):
+        assert _wait_for_snapshot(os.path.join(superproject, "libs", name))
+    stats = cache.get_stats()
+    nemo_git_status._prefetch_submodules(superproject, ("libs/one", "libs/two"), nemo_git_status.GIT_COLUMNS)
+    assert cache.get_stats() == stats
@@ -17,7 +17,9 @@ sys.modules['gi.repository'] = type(sys)('gi.repository')
 sys.modules['gi.repository.Nemo'] = type(sys)('Nemo')
 sys.modules['gi.repository.GObject'] = type(sys)('GObject')
 
-from nemo_git_status import get_file_git_info, resolve_repo_root, cache
+import nemo_git_status
+from gi_stubs import MockFileInfo
+from nemo_git_status import NemoGitIntegration, STATUS_EMBLEMS, get_file_git_info, resolve_repo_root, cache
 
 
 class TestGitIntegration:
@@ -164,10 +166,12 @@ class TestGitIntegration:
         """Test that cache works correctly across multiple operations"""
         cache.clear()
         
-        # First call should populate cache
+        # First call should populate cache; the last-commit index follows in the background
+        get_file_git_info(str(temp_git_repo))
+        nemo_git_status.last_commits.wait()
         info1 = get_file_git_info(str(temp_git_repo))
         
-        # Second call should use cache
+        # Later calls should use cache
         info2 = get_file_git_info(str(temp_git_repo))
         
         assert info1 == info2, "Cached results should be identical"
@@ -250,3 +254,67 @@ class TestErrorHandling:
             
             # Should handle failure gracefully
             assert result is None or isinstance(result, str), "Should handle git failure gracefully"
+
+
+class TestEmblems:
+    """Test status emblems for icon views"""
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        """A repository with a clean, a modified and an untracked file"""
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        subprocess.run(["git", "config", "user.email", "test@example.com"], cwd=tmp_path, check=True)
+        subprocess.run(["git", "config", "user.name", "Test User"], cwd=tmp_path, check=True)
+        (tmp_path / "clean.txt").write_text("clean\n")
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "changed.txt").write_text("before\n")
+        subprocess.run(["git", "add", "."], cwd=tmp_path, check=True)
+        subprocess.run(["git", "commit", "-q", "-m", "initial"], cwd=tmp_path, check=True)
+        (tmp_path / "src" / "changed.txt").write_text("after\n")
+        (tmp_path / "new.txt").write_text("new\n")
+        cache.clear()
+        yield tmp_path
+        cache.clear()
+
+    def _emblems(self, path):
+        file = MockFileInfo(path)
+        NemoGitIntegration().update_file_info_full(None, None, None, file)
+        return file.emblems
+
+    def test_emblems_follow_status(self, repo):
+        assert self._emblems(repo / "clean.txt") == [STATUS_EMBLEMS["clean"]]
+        assert self._emblems(repo / "src" / "changed.txt") == [STATUS_EMBLEMS["dirty"]]
+        assert self._emblems(repo / "src") == [STATUS_EMBLEMS["dirty"]]
+        assert self._emblems(repo / "new.txt") == [STATUS_EMBLEMS["untracked"]]
+
+    def test_no_emblem_outside_repository(self, tmp_path):
+        (tmp_path / "plain.txt").write_text("x\n")
+        assert self._emblems(tmp_path / "plain.txt") == []
+
+    def test_emblems_shown_with_no_git_columns(self, repo, monkeypatch):
+        monkeypatch.setattr(nemo_git_status.column_settings, "_visible", frozenset())
+        assert self._emblems(repo / "new.txt") == [STATUS_EMBLEMS["untracked"]]
+        assert self._emblems(repo / "src") == [STATUS_EMBLEMS["dirty"]]
+
+    def test_disabled_emblems_need_no_status_pass(self, repo, monkeypatch, git_calls):
+        monkeypatch.setattr(nemo_git_status, "SHOW_EMBLEMS", False)
+        monkeypatch.setattr(nemo_git_status.column_settings, "_visible", frozenset({"git_branch"}))
+        assert self._emblems(repo / "new.txt") == []
+        assert not any(args[0] == "status" for args in git_calls)
+
+    def test_emblems_can_be_disabled(self, repo, monkeypatch):
+        monkeypatch.setattr(nemo_git_status, "SHOW_EMBLEMS", False)
+        assert self._emblems(repo / "new.txt") == []
+
+    def test_emblems_use_the_cached_snapshot(self, repo, git_calls):
+        self._emblems(repo / "clean.txt")
+        git_calls.clear()
+        for name in ("clean.txt", "new.txt", "src"):
+            self._emblems(repo / name)
+        assert git_calls == []
+
+    def test_emblems_refresh_with_snapshot(self, repo, monkeypatch):
+        monkeypatch.setattr(nemo_git_status, "CACHE_TTL", 0)
+        assert self._emblems(repo / "new.txt") == [STATUS_EMBLEMS["untracked"]]
+        subprocess.run(["git", "add", "new.txt"], cwd=repo, check=True)
+        assert self._emblems(repo / "new.txt") == [STATUS_EMBLEMS["dirty"]]
@@ -0,0 +1,247 @@
+import os
+import subprocess
+import threading
+import time
+
+import pytest
+
+import nemo_git_status
+from nemo_git_status import (
+    LastCommitIndex,
+    format_last_commit,
+    get_file_git_info,
+    last_commits,
+)
+
+
+def _git(repo, *args):
+    return subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def _commit_file(repo, rel_path, message, when):
+    path = os.path.join(repo, rel_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "a") as f:
+        f.write(message + "\n")
+    _git(repo, "add", rel_path)
+    env = dict(os.environ, GIT_AUTHOR_DATE=f"@{when} +0000", GIT_COMMITTER_DATE=f"@{when} +0000")
+    subprocess.run(["git", "commit", "-q", "-m", message], cwd=repo, check=True, env=env)
+    return _git(repo, "rev-parse", "--short", "HEAD")
+
+
+@pytest.fixture
+def history_repo(tmp_path):
+    """A repository where a.txt, docs/b.txt and docs/old.txt change at different times."""
+    repo = str(tmp_path / "repo")
+    os.makedirs(repo)
+    _git(repo, "init", "-q")
+    _git(repo, "config", "user.email", "test@example.com")
+    _git(repo, "config", "user.name", "Test User")
+    hashes = {
+        "old": _commit_file(repo, "docs/old.txt", "old", 1_000_000),
+        "a": _commit_file(repo, "a.txt", "a", 2_000_000),
+        "b": _commit_file(repo, "docs/b.txt", "b", 3_000_000),
+    }
+    return repo, hashes
+
+
+def _head(repo):
+    return _git(repo, "rev-parse", "HEAD")
+
+
+def test_index_maps_files_and_directories_to_newest_commit(history_repo):
+    repo, hashes = history_repo
+    index = LastCommitIndex()
+    index.update(repo, _head(repo))
+
+    assert index.lookup(repo, "a.txt") == (hashes["a"], "Test User", 2_000_000)
+    assert index.lookup(repo, "docs/old.txt")[0] == hashes["old"]
+    assert index.lookup(repo, "docs")[0] == hashes["b"]
+    assert index.lookup(repo, ".")[0] == hashes["b"]
+    assert index.lookup(repo, "missing.txt") is None
+
+
+def test_advancing_head_walks_only_new_commits(history_repo, git_calls):
+    repo, hashes = history_repo
+    index = LastCommitIndex()
+    index.update(repo, _head(repo))
+    newest = _commit_file(repo, "a.txt", "again", 4_000_000)
+
+    git_calls.clear()
+    index.update(repo, _head(repo))
+
+    logs = [args for args in git_calls if args[0] == "log"]
+    assert len(logs) == 1 and logs[0][-1].endswith(f"..{_head(repo)}")
+    assert index.lookup(repo, "a.txt")[0] == newest
+    assert index.lookup(repo, "docs")[0] == hashes["b"]
+
+
+def test_rewritten_history_rebuilds_index(history_repo):
+    repo, hashes = history_repo
+    index = LastCommitIndex()
+    index.update(repo, _head(repo))
+    _git(repo, "reset", "-q", "--hard", "HEAD~1")
+
+    index.update(repo, _head(repo))
+
+    assert index.lookup(repo, "docs")[0] == hashes["old"]
+    assert index.lookup(repo, "docs/b.txt") is None
+
+
+def test_index_is_persisted_between_sessions(history_repo, git_calls):
+    repo, hashes = history_repo
+    LastCommitIndex().update(repo, _head(repo))
+
+    git_calls.clear()
+    index = LastCommitIndex()
+    index.update(repo, _head(repo))
+
+    assert git_calls == []
+    assert index.lookup(repo, "a.txt")[0] == hashes["a"]
+
+
+def test_walk_is_bounded(history_repo, monkeypatch):
+    repo, hashes = history_repo
+    monkeypatch.setattr(nemo_git_status, "LAST_COMMIT_MAX_COMMITS", 1)
+    index = LastCommitIndex()
+    index.update(repo, _head(repo))
+
+    assert index.lookup(repo, "docs/b.txt")[0] == hashes["b"]
+    assert index.lookup(repo, "a.txt") is None
+
+
+def test_walk_has_its_own_timeout(history_repo, monkeypatch):
+    repo, _ = history_repo
+    timeouts = []
+    original = subprocess.check_output
+
+    def recording(cmd, **kwargs):
+        if "log" in cmd:
+            timeouts.append(kwargs.get("timeout"))
+        return original(cmd, **kwargs)
+
+    monkeypatch.setattr(nemo_git_status.subprocess, "check_output", recording)
+    LastCommitIndex().update(repo, _head(repo))
+    assert timeouts == [nemo_git_status.LAST_COMMIT_TIMEOUT]
+
+
+def test_failed_walk_leaves_column_empty_until_retried(history_repo, git_calls, monkeypatch):
+    repo, hashes = history_repo
+    walk = LastCommitIndex._walk
+    monkeypatch.setattr(LastCommitIndex, "_walk", staticmethod(lambda root, revisions: None))
+    index = LastCommitIndex()
+    index.update(repo, _head(repo))
+
+    git_calls.clear()
+    assert [index.lookup(repo, path) for path in ("a.txt", "docs", ".")] == [None, None, None]
+    assert git_calls == []
+    assert not os.path.exists(nemo_git_status.LAST_COMMIT_CACHE_DIR)
+
+    # Not walked again until LAST_COMMIT_RETRY has passed
+    monkeypatch.setattr(LastCommitIndex, "_walk", staticmethod(walk))
+    index.update(repo, _head(repo))
+    assert index.lookup(repo, "a.txt") is None
+
+    monkeypatch.setattr(nemo_git_status, "LAST_COMMIT_RETRY", 0)
+    index.update(repo, _head(repo))
+    assert index.lookup(repo, "a.txt")[0] == hashes["a"]
+    assert LastCommitIndex()._load(repo)["head"] == _head(repo)
+
+
+def test_request_builds_the_index_in_the_background(history_repo, monkeypatch):
+    repo, hashes = history_repo
+    started, release = threading.Event(), threading.Event()
+    walk = LastCommitIndex._walk
+
+    def slow_walk(repo_root, revisions):
+        started.set()
+        release.wait(5)
+        return walk(repo_root, revisions)
+
+    monkeypatch.setattr(LastCommitIndex, "_walk", staticmethod(slow_walk))
+    index = LastCommitIndex()
+    index.request(repo, _head(repo))
+    assert started.wait(5)
+    assert index.lookup(repo, "a.txt") is None
+
+    release.set()
+    index.wait(5)
+    assert index.lookup(repo, "a.txt")[0] == hashes["a"]
+
+
+def test_lookup_waits_for_the_requested_head(history_repo, monkeypatch):
+    repo, hashes = history_repo
+    index = LastCommitIndex()
+    index.request(repo, _head(repo))
+    index.wait(5)
+    newest = _commit_file(repo, "a.txt", "again", 4_000_000)
+    release = threading.Event()
+    walk = LastCommitIndex._walk
+    monkeypatch.setattr(LastCommitIndex, "_walk",
+                        staticmethod(lambda root, revisions: release.wait(5) and walk(root, revisions)))
+
+    index.request(repo, _head(repo))
+    assert index.lookup(repo, "a.txt") is None  # the index still describes the old HEAD
+    release.set()
+    index.wait(5)
+    assert index.lookup(repo, "a.txt")[0] == newest
+
+
+def test_slow_walk_does_not_hold_up_the_listing(history_repo, monkeypatch):
+    repo, _ = history_repo
+    release = threading.Event()
+    walk = LastCommitIndex._walk
+    monkeypatch.setattr(LastCommitIndex, "_walk",
+                        staticmethod(lambda root, revisions: release.wait(5) and walk(root, revisions)))
+    try:
+        started = time.monotonic()
+        info = get_file_git_info(os.path.join(repo, "a.txt"), columns={"git_status", "git_last_commit"})
+        assert time.monotonic() - started < 2
+        assert info["git_status"] == "clean"
+        assert info["git_last_commit"] == ""
+    finally:
+        release.set()
+
+
+@pytest.mark.parametrize("age,expected", [
+    (5, "just now"),
+    (60, "1 minute ago"),
+    (2 * 3600, "2 hours ago"),
+    (3 * 86400, "3 days ago"),
+    (65 * 86400, "2 months ago"),
+    (800 * 86400, "2 years ago"),
+])
+def test_format_last_commit(age, expected):
+    assert format_last_commit(("abc1234", "Ann", 1_000_000), now=1_000_000 + age) == f"abc1234 Ann, {expected}"
+
+
+def test_format_last_commit_without_commit():
+    assert format_last_commit(None) == ""
+
+
+def test_listing_a_directory_walks_history_once(history_repo, git_calls):
+    repo, hashes = history_repo
+    for i in range(200):
+        with open(os.path.join(repo, "docs", f"new-{i}.txt"), "w") as f:
+            f.write("x\n")
+    _git(repo, "add", "docs")
+    _git(repo, "commit", "-q", "-m", "many files")
+    listing = sorted(os.listdir(os.path.join(repo, "docs")))
+
+    git_calls.clear()
+    get_file_git_info(os.path.join(repo, "docs"))
+    last_commits.wait(10)
+    values = [get_file_git_info(os.path.join(repo, "docs", name))["git_last_commit"] for name in listing]
+
+    assert sum(1 for args in git_calls if args[0] == "log") == 1
+    assert values[listing.index("old.txt")].startswith(f"{hashes['old']} Test User, ")
+    assert all(value for value in values)
+    assert get_file_git_info(repo, columns={"git_last_commit"})["git_last_commit"].startswith(
+        _git(repo, "rev-parse", "--short", "HEAD"))
+
+
+def test_hidden_column_builds_no_index(history_repo, git_calls):
+    repo, _ = history_repo
+    get_file_git_info(os.path.join(repo, "a.txt"), columns={"git_status"})
+    assert not any(args[0] == "log" for args in git_calls)
+    assert last_commits.lookup(repo, "a.txt") is None
@@ -1,6 +1,8 @@
 import pytest
 
 from nemo_git_status import (
+    parse_branch_sync,
+    parse_numstat,
     parse_porcelain_status,
     parse_untracked,
     parse_porcelain_v1,
@@ -45,7 +47,7 @@ def test_parse_porcelain_v1(line, expected):
 @pytest.mark.parametrize("line,expected", [
     ("1 M. N... 0000000 0000000 file.txt", ("file.txt", "dirty")),
     ("2 M. N... 0000000 0000000 file2.txt", ("file2.txt", "dirty")),
-    ("u UU N... 0000000 0000000 conflict.txt", ("conflict.txt", "dirty")),
+    ("u UU N... 0000000 0000000 conflict.txt", ("conflict.txt", "conflict")),
     ("M file.txt", (None, None)),  # Not v2
     ("?? new.txt", (None, None)),  # Not v2
 ])
@@ -63,7 +65,7 @@ def test_parse_porcelain_v2(line, expected):
     (["1 M. N... 0000000 0000000 modified.txt"], {"modified.txt": "dirty"}),
     (["   ", "\t"], {}),
     (["?? a.txt", "?? b.txt"], {"a.txt": "untracked", "b.txt": "untracked"}),
-    (["u UU N... 0000000 0000000 conflict.txt"], {"conflict.txt": "dirty"}),
+    (["u UU N... 0000000 0000000 conflict.txt"], {"conflict.txt": "conflict"}),
     (["D deleted.txt"], {"deleted.txt": "dirty"}),
     (["R renamed.txt"], {"renamed.txt": "dirty"}),
     (["C copied.txt"], {"copied.txt": "dirty"}),
@@ -74,3 +76,36 @@ def test_parse_porcelain_v2(line, expected):
 ])
 def test_parse_status_fuzzed(lines, expected):
     assert parse_porcelain_status(lines) == expected
+
+
+# -----------------------------
+# parse_branch_sync
+# -----------------------------
+@pytest.mark.parametrize("lines,expected", [
+    ([], ""),
+    (["# branch.oid abc123", "# branch.head main"], ""),
+    (["# branch.head main", "# branch.upstream origin/main", "# branch.ab +0 -0"], "up to date"),
+    (["# branch.upstream origin/main", "# branch.ab +2 -0"], "ahead 2"),
+    (["# branch.upstream origin/main", "# branch.ab +0 -3"], "behind 3"),
+    (["# branch.upstream origin/main", "# branch.ab +2 -3", "1 M. N... 0 0 0 a b file.txt"],
+     "ahead 2, behind 3"),
+    (["# branch.upstream origin/gone"], "upstream gone"),
+    (["# branch.upstream origin/main", "# branch.ab +x -y"], ""),
+    (["?? new.txt", "# branch.upstream origin/main"], ""),
+])
+def test_parse_branch_sync(lines, expected):
+    assert parse_branch_sync(lines) == expected
+
+
+# -----------------------------
+# parse_numstat
+# -----------------------------
+@pytest.mark.parametrize("output,expected", [
+    ("", {}),
+    ("3\t1\ta.txt\0", {"a.txt": (3, 1)}),
+    ("0\t5\tdir/with space.txt\0-\t-\timage.png\0", {"dir/with space.txt": (0, 5), "image.png": (-1, -1)}),
+    ("1\t2\ttab\tname.txt\0", {"tab\tname.txt": (1, 2)}),
+    ("x\ty\tbad.txt\0garbage\0", {}),
+])
+def test_parse_numstat(output, expected):
+    assert parse_numstat(output) == expected
@@ -45,6 +45,8 @@ cache = module.cache
 parse_porcelain_status = module.parse_porcelain_status
 resolve_repo_root = module.resolve_repo_root
 _run_git_command = module._run_git_command
+LatencyStats = module.LatencyStats
+latency = module.latency
 
 
 class TestGitCache:
@@ -211,7 +213,9 @@ class TestPerformanceOptimizations:
             subprocess.run(["git", "add", "test.txt"], cwd=tmpdir, capture_output=True)
             subprocess.run(["git", "commit", "-m", "Initial commit"], cwd=tmpdir, capture_output=True)
 
-            # Clear cache for clean test
+            # Build the last-commit index, then clear the snapshot cache for a clean test
+            get_file_git_info(tmpdir)
+            module.last_commits.wait()
             cache.clear()
 
             # First call (cache miss)
@@ -273,3 +277,173 @@ class TestMemoryUsage:
         assert stats_after["size"] == 0, "Cache should be empty after clear"
         assert stats_after["hits"] == 0, "Hit counter should be reset"
         assert stats_after["misses"] == 0, "Miss counter should be reset"
+
+
+class TestLatencyStats:
+    """Test hot-path instrumentation"""
+
+    def test_record_buckets_by_power_of_two(self):
+        """Latencies land in log2 microsecond buckets"""
+        stats = LatencyStats(enabled=True)
+        stats.record("stage", 500)        # < 1us
+        stats.record("stage", 3_000)      # 3us
+        stats.record("stage", 3_500)      # 3.5us
+        stats.record("stage", 1_000_000)  # 1ms
+
+        snapshot = stats.snapshot()["stage"]
+        assert snapshot["count"] == 4
+        assert snapshot["histogram_us"] == {"1": 1, "4": 2, "1024": 1}
+        assert snapshot["max_ms"] == 1.0
+
+    def test_disabled_records_nothing(self, tmp_path):
+        """No stages are recorded while instrumentation is off"""
+        latency.reset()
+        latency.enabled = False
+        resolve_repo_root(str(tmp_path))
+        assert latency.snapshot() == {}
+
+    def test_enabled_records_pipeline_stages(self):
+        """Each instrumented stage and git subcommand is recorded"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            subprocess.run(["git", "init"], cwd=tmpdir, capture_output=True)
+            subprocess.run(["git", "-c", "user.name=Test", "-c", "user.email=test@example.com",
+                            "commit", "--allow-empty", "-m", "Initial commit"], cwd=tmpdir, capture_output=True)
+            latency.reset()
+            latency.enabled = True
+            try:
+                cache.clear()
+                module.uri_to_path(Path(tmpdir).as_uri())
+                get_file_git_info(tmpdir)
+            finally:
+                latency.enabled = False
+
+            stages = latency.snapshot()
+            for stage in ("uri_to_path", "resolve_repo_root", "GitCache.get",
+                          "run_git", "git rev-parse", "git status", "parse_porcelain_status"):
+                assert stage in stages, f"Missing stage {stage}: {sorted(stages)}"
+                assert stages[stage]["count"] >= 1
+
+    def test_dump_writes_json(self, tmp_path):
+        """Snapshots are dumped atomically as JSON"""
+        import json
+
+        stats = LatencyStats(enabled=True)
+        stats.record("git status", 2_000_000)
+        out = tmp_path / "stats.json"
+        stats.dump(str(out))
+
+        data = json.loads(out.read_text())
+        assert data["stages"]["git status"]["count"] == 1
+        assert not (tmp_path / "stats.json.tmp").exists()
+
+    def test_periodic_dump_uses_runtime_dir(self, tmp_path, monkeypatch):
+        """Periodic dumps go to $XDG_RUNTIME_DIR"""
+        monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+        stats = LatencyStats()
+        stats.start_periodic_dump(0.01)
+        try:
+            deadline = time.time() + 2
+            out = tmp_path / "nemo-git-integration" / f"stats-{os.getpid()}.json"
+            while not out.exists() and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            stats.stop_periodic_dump()
+        assert stats.enabled
+        assert out.exists()
+
+
+sys.path.insert(0, os.path.join(path_to_extensions, "tools"))
+import repo_generator  # noqa: E402
+import benchmark  # noqa: E402
+import soak  # noqa: E402
+
+
+class TestBenchmarkTools:
+    """Test the synthetic repository generator and baseline comparison"""
+
+    def test_generator_builds_requested_shape(self, tmp_path):
+        """Generated repos have the requested files, modifications and untracked dirs"""
+        shape = repo_generator.make_shape(files=40, depth=2, fanout=3, modified_pct=25,
+                                          untracked_dirs=1, untracked_per_dir=5, siblings=2)
+        manifest = repo_generator.generate_workspace(str(tmp_path), shape)
+        root = manifest["main"]["root"]
+
+        status = parse_porcelain_status(
+            subprocess.run(["git", "-C", root, "status", "--porcelain=v2"],
+                           capture_output=True, text=True, check=True).stdout.splitlines())
+        assert sum(1 for s in status.values() if s == "dirty") == 10
+        assert status.get("untracked_0/") == "untracked"
+        assert len(manifest["siblings"]) == 2
+        assert manifest["main"]["leaf_dir"].count("/") == 1
+
+    def test_generator_reuses_cached_workspace(self, tmp_path):
+        """A completed workspace is reused rather than rebuilt"""
+        shape = repo_generator.make_shape(files=5, depth=0)
+        first = repo_generator.generate_workspace(str(tmp_path), shape)
+        marker = Path(first["main"]["root"]) / "marker.txt"
+        marker.write_text("kept")
+        second = repo_generator.generate_workspace(str(tmp_path), shape)
+        assert second == first
+        assert marker.exists()
+
+    def test_cold_runs_start_without_indexes(self, tmp_path, monkeypatch, git_calls):
+        """Cold runs rebuild the last-commit index, which is kept out of the user's cache"""
+        import nemo_git_status
+        user_dir = str(tmp_path / "user-cache")
+        monkeypatch.setattr(nemo_git_status, "LAST_COMMIT_CACHE_DIR", user_dir)
+        manifest = repo_generator.generate_workspace(
+            str(tmp_path / "ws"), repo_generator.make_shape(files=10, depth=1))
+        git_calls.clear()
+        benchmark.run_benchmarks(manifest, repeat=2)
+
+        # One walk per run of each cold benchmark
+        assert sum(1 for args in git_calls if args[0] == "log") == 3 * 2
+        assert not os.path.exists(user_dir)
+        assert nemo_git_status.LAST_COMMIT_CACHE_DIR == user_dir
+
+    def test_compare_flags_regressions_beyond_tolerance(self):
+        """Only medians beyond the tolerance are reported"""
+        baseline = {"fast": {"median_ms": 10.0}, "slow": {"median_ms": 10.0}}
+        results = {"fast": {"median_ms": 12.0}, "slow": {"median_ms": 13.0}, "new": {"median_ms": 1.0}}
+        regressions = benchmark.compare(results, baseline, tolerance=0.25)
+        assert len(regressions) == 1
+        assert regressions[0].startswith("slow:")
+
+
+class TestSoakHarness:
+    """Test the compressed-time soak harness and its leak detection"""
+
+    def test_short_soak_finds_no_growth(self, tmp_path):
+        """A short soak over a few repositories runs cleanly without growth"""
+        manifest = repo_generator.generate_workspace(
+            str(tmp_path), repo_generator.make_shape(files=20, depth=1, fanout=2, siblings=3))
+        repos = [manifest["main"]["root"]] + manifest["siblings"]
+        status_before = [self._status(repo) for repo in repos]
+        summary = soak.soak(repos, hours=0.5, think=20, sample_minutes=2, edit_rate=0.5)
+
+        assert summary["calls"] > 0
+        assert summary["errors"] == 0
+        assert len(summary["samples"]) >= 10
+        assert summary["growth"] == {}
+        assert all(s["cached_repos"] <= len(repos) for s in summary["samples"])
+        # Every edit is undone once the soak finishes
+        assert [self._status(repo) for repo in repos] == status_before
+
+    @staticmethod
+    def _status(repo):
+        return subprocess.run(["git", "-C", repo, "status", "--porcelain"],
+                              capture_output=True, text=True, check=True).stdout
+
+    def test_find_growth_flags_steady_increase(self):
+        """Steadily rising metrics are flagged, noisy plateaus are not"""
+        samples = [{"threads": 2 + i, "fds": 10 + (i % 2), "traced_bytes": 1000} for i in range(12)]
+        growth = soak.find_growth(samples, {"threads": 0, "fds": 0, "traced_bytes": 0})
+        assert set(growth) == {"threads"}
+
+    def test_virtual_clock_jumps_ahead(self):
+        """The clock offsets wall and monotonic time but not nanosecond wall time"""
+        clock = soak.VirtualClock()
+        clock.advance(3600)
+        assert clock.time() - time.time() > 3500
+        assert clock.monotonic() - time.monotonic() > 3500
+        assert abs(clock.time_ns() - time.time_ns()) < 10**9
@@ -0,0 +1,122 @@
+import importlib.util
+import json
+import os
+import pstats
+
+import pytest
+
+from gi_stubs import MockFileInfo
+from nemo_git_status import CallRecorder, NemoGitIntegration, cache
+import nemo_git_status
+
+tools_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "tools")
+spec = importlib.util.spec_from_file_location("replay_trace", os.path.join(tools_dir, "replay_trace.py"))
+replay_trace = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(replay_trace)
+
+
+@pytest.fixture
+def recorder(monkeypatch, tmp_path):
+    """Replace the module recorder with one using a private sentinel."""
+    rec = CallRecorder(sentinel=str(tmp_path / "sentinel"))
+    monkeypatch.setattr(nemo_git_status, "recorder", rec)
+    yield rec
+    rec.stop()
+
+
+def test_trace_records_calls(temp_git_repo, recorder, tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    recorder.start(str(trace))
+    extension = NemoGitIntegration()
+    readme = os.path.join(temp_git_repo, "README.md")
+    extension.update_file_info_full(None, None, None, MockFileInfo(readme))
+    extension.update_file_info_full(None, None, None, MockFileInfo(readme))
+    recorder.stop()
+
+    header, *records = [json.loads(line) for line in trace.read_text().splitlines()]
+    assert header["columns"] == sorted(nemo_git_status.column_settings.visible)
+    assert [r["path"] for r in records] == [readme, readme]
+    assert [r["cache"] for r in records] == ["miss", "hit"]
+    assert "status" in [sub for sub, _ in records[0]["git"]]
+    assert records[1]["git"] == []
+    assert all(r["ms"] >= 0 for r in records)
+
+
+def test_sentinel_starts_and_stops_trace(recorder, tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(tmp_path))
+    sentinel = tmp_path / "sentinel"
+    sentinel.touch()
+    recorder.poll()
+    assert recorder.active
+    assert recorder.path.startswith(str(tmp_path))
+
+    sentinel.unlink()
+    recorder._next_poll = 0
+    recorder.poll()
+    assert not recorder.active
+
+
+def test_cprofile_window_is_dumped(recorder, tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    recorder.start(str(trace), profile_seconds=0.001)
+    recorder.begin_call()
+    recorder.end_call("/tmp/x", 1000)
+    recorder.begin_call()
+    recorder.end_call("/tmp/y", 1000)
+    recorder.stop()
+
+    prof = tmp_path / "trace.jsonl.prof"
+    assert prof.exists()
+    pstats.Stats(str(prof))
+
+
+def test_replay_maps_paths_and_counts_git(temp_git_repo, tmp_path):
+    trace = tmp_path / "trace.jsonl"
+    records = [{"ts": 1.0, "path": "/home/alice/repo/README.md", "cache": "miss", "git": [], "ms": 5.0},
+               {"ts": 1.1, "path": "/home/alice/repo", "cache": "hit", "git": [], "ms": 0.1}]
+    trace.write_text("\n".join(json.dumps(r) for r in records) + "\nnot json\n")
+
+    loaded = replay_trace.load_trace(str(trace))
+    assert len(loaded) == 2
+
+    mappings = replay_trace.parse_mappings([f"/home/alice/repo={temp_git_repo}"])
+    summary = replay_trace.replay(loaded, mappings, cold=True, repeat=2)
+    assert summary["calls"] == 4
+    assert summary["cache"] == {"miss": 2, "hit": 2}
+    assert summary["git"]["status"] == 2
+    assert not nemo_git_status.recorder.active
+
+
+def test_column_changes_are_recorded(recorder, tmp_path, monkeypatch):
+    monkeypatch.setattr(nemo_git_status, "column_settings", nemo_git_status.ColumnSettings())
+    trace = tmp_path / "trace.jsonl"
+    recorder.start(str(trace))
+    nemo_git_status.column_settings.set_visible(["NemoGitIntegration::git_branch", "name"])
+    recorder.stop()
+
+    headers = [json.loads(line)["columns"] for line in trace.read_text().splitlines()]
+    assert headers == [sorted(nemo_git_status.GIT_COLUMNS), ["git_branch"]]
+
+
+def test_replay_restores_recorded_columns(temp_git_repo, tmp_path, monkeypatch):
+    settings = nemo_git_status.ColumnSettings()
+    monkeypatch.setattr(nemo_git_status, "column_settings", settings)
+    trace = tmp_path / "trace.jsonl"
+    records = [{"ts": 1.0, "columns": ["git_branch"]},
+               {"ts": 1.1, "path": os.path.join(temp_git_repo, "README.md"), "cache": "miss", "git": [], "ms": 5.0}]
+    trace.write_text("\n".join(json.dumps(r) for r in records) + "\n")
+
+    summary = replay_trace.replay(replay_trace.load_trace(str(trace)), cold=True)
+    assert summary["calls"] == 1
+    assert "status" not in summary["git"]
+    assert settings.visible == nemo_git_status.GIT_COLUMNS
+
+
+@pytest.mark.parametrize("path,expected", [
+    ("/home/alice/repo/a.txt", "/src/repo/a.txt"),
+    ("/home/alice/repo", "/src/repo"),
+    ("/home/alice/repository", "/home/alice/repository"),
+])
+def test_replay_map_path(path, expected):
+    mappings = replay_trace.parse_mappings(["/home/alice/repo=/src/repo"])
+    assert replay_trace.map_path(path, mappings) == expected
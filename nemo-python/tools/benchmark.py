@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Reproducible benchmarks for the nemo-git-integration extension.
+
+Generates (or reuses) a synthetic workspace with repo_generator, times the
+extension's hot paths against it and writes the results as JSON. When a
+baseline file exists, each benchmark's median is compared against it and
+the run fails if any is slower than the configured tolerance allows.
+
+Usage:
+    benchmark.py [--preset NAME] [--repeat N] [--output FILE]
+                 [--baseline FILE] [--tolerance FRACTION] [--save-baseline]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import gi_stubs  # noqa: E402
+import repo_generator  # noqa: E402
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DEFAULT_RESULTS_DIR = os.path.join(project_root, ".benchmarks")
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nemo-git-bench")
+DEFAULT_TOLERANCE = 0.25
+
+
+def measure(func: Callable[[], None], repeat: int, setup: Optional[Callable[[], None]] = None) -> dict:
+    """
+    Time func repeat times, running setup (untimed) before each run.
+
+    Returns:
+        Median, mean, min and max in milliseconds
+    """
+    samples: List[float] = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {
+        "median_ms": round(statistics.median(samples), 3),
+        "mean_ms": round(statistics.fmean(samples), 3),
+        "min_ms": round(min(samples), 3),
+        "max_ms": round(max(samples), 3),
+        "repeat": repeat,
+    }
+
+
+def run_benchmarks(manifest: dict, repeat: int) -> Dict[str, dict]:
+    """
+    Run every benchmark against a generated workspace.
+
+    Last-commit indexes are persisted to a temporary directory for the run,
+    so the user's cache is untouched and cold runs start without one.
+    """
+    gi_stubs.install()
+    import nemo_git_status
+
+    original_index_dir = nemo_git_status.LAST_COMMIT_CACHE_DIR
+    with tempfile.TemporaryDirectory(prefix="nemo-git-bench-") as index_dir:
+        nemo_git_status.LAST_COMMIT_CACHE_DIR = index_dir
+        nemo_git_status.last_commits.clear()
+        try:
+            return _run_benchmarks(nemo_git_status, manifest, repeat)
+        finally:
+            nemo_git_status.last_commits.wait()
+            nemo_git_status.LAST_COMMIT_CACHE_DIR = original_index_dir
+            nemo_git_status.last_commits.clear()
+
+
+def _run_benchmarks(nemo_git_status, manifest: dict, repeat: int) -> Dict[str, dict]:
+    main = manifest["main"]
+    root = main["root"]
+    sample = os.path.join(root, main["sample_file"])
+    leaf = os.path.join(root, main["leaf_dir"])
+    listing = [entry.path for entry in os.scandir(leaf)]
+    cache = nemo_git_status.cache
+    results: Dict[str, dict] = {}
+
+    def list_directory():
+        for path in listing:
+            nemo_git_status.get_file_git_info(path)
+
+    def clear_caches():
+        # Snapshots, in-memory and persisted last-commit indexes, once
+        # the index being built in the background for the last run is done
+        nemo_git_status.last_commits.wait()
+        cache.clear()
+        nemo_git_status.last_commits.clear()
+        shutil.rmtree(nemo_git_status.LAST_COMMIT_CACHE_DIR, ignore_errors=True)
+
+    status_output = subprocess.run(
+        ["git", "-C", root, "status", "--porcelain=v2", "--branch"],
+        capture_output=True, text=True, check=True,
+    ).stdout.splitlines()
+    # A fully dirty tree stresses the parser the way a mass rename would
+    synthetic_lines = [
+        f"1 .M N... 100644 100644 100644 0000000 0000000 file_{i:07d}.txt"
+        for i in range(main["files"])
+    ]
+
+    results["parse_status_real"] = measure(
+        lambda: nemo_git_status.parse_porcelain_status(status_output), repeat)
+    results["parse_status_all_dirty"] = measure(
+        lambda: nemo_git_status.parse_porcelain_status(synthetic_lines), repeat)
+    results["file_info_cold"] = measure(
+        lambda: nemo_git_status.get_file_git_info(sample), repeat, setup=clear_caches)
+    nemo_git_status.get_file_git_info(sample)
+    results["file_info_warm"] = measure(
+        lambda: nemo_git_status.get_file_git_info(sample), repeat)
+    results["dir_listing_cold"] = measure(list_directory, repeat, setup=clear_caches)
+    list_directory()
+    results["dir_listing_warm"] = measure(list_directory, repeat)
+    results["repo_root_listing_cold"] = measure(
+        lambda: nemo_git_status.get_file_git_info(root), repeat, setup=clear_caches)
+
+    siblings = manifest.get("siblings", [])
+    if siblings:
+        # A cache smaller than the workspace forces evictions on every pass
+        original_cache = nemo_git_status.cache
+        nemo_git_status.cache = nemo_git_status.GitCache(max_size=max(1, len(siblings) // 2))
+        try:
+            def browse_siblings():
+                for sibling in siblings:
+                    nemo_git_status.get_file_git_info(sibling)
+            results["cache_churn_siblings"] = measure(browse_siblings, repeat)
+        finally:
+            nemo_git_status.cache = original_cache
+
+    for result in results.values():
+        result["files_listed"] = len(listing)
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """
+    Compare medians against a baseline.
+
+    Returns:
+        Human-readable descriptions of every regression beyond tolerance
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base.get("median_ms"):
+            continue
+        limit = base["median_ms"] * (1 + tolerance)
+        if result["median_ms"] > limit:
+            regressions.append(
+                f"{name}: {result['median_ms']:.3f} ms > {base['median_ms']:.3f} ms "
+                f"(+{tolerance:.0%} allowed)"
+            )
+    return regressions
+
+
+def _git_version() -> str:
+    try:
+        return subprocess.run(["git", "--version"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the nemo-git-integration extension")
+    parser.add_argument("--preset", default="smoke", choices=sorted(repo_generator.PRESETS),
+                        help="Repository shape to benchmark (default: smoke)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Where generated repositories are kept between runs")
+    parser.add_argument("--output", help="Results file (default: .benchmarks/<preset>.json)")
+    parser.add_argument("--baseline", help="Baseline file (default: .benchmarks/<preset>-baseline.json)")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown as a fraction of the baseline median")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline")
+    args = parser.parse_args(argv)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"{args.preset}.json")
+    baseline_path = args.baseline or os.path.join(DEFAULT_RESULTS_DIR, f"{args.preset}-baseline.json")
+
+    print(f"[INFO] Preparing '{args.preset}' workspace in {args.cache_dir}")
+    manifest = repo_generator.generate_workspace(args.cache_dir, repo_generator.make_shape(args.preset))
+    results = run_benchmarks(manifest, max(1, args.repeat))
+
+    report = {
+        "meta": {
+            "preset": args.preset,
+            "shape": manifest["shape"],
+            "python": platform.python_version(),
+            "git": _git_version(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in results.items():
+        print(f"{name:>24}: median {result['median_ms']:10.3f} ms  min {result['min_ms']:10.3f} ms")
+    print(f"[INFO] Results written to {output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(baseline_path)), exist_ok=True)
+        with open(baseline_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[INFO] Baseline saved to {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"[INFO] No baseline at {baseline_path}; run with --save-baseline to create one")
+        return 0
+
+    with open(baseline_path) as f:
+        baseline = json.load(f).get("results", {})
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print("[ERROR] Performance regressions:", file=sys.stderr)
+        for line in regressions:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    print(f"[INFO] Within {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Minimal gi stand-ins so tools can import the extension outside Nemo.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+extensions_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "extensions")
+
+
+def install():
+    """Register stub gi modules (if none are loaded) and expose the extension on sys.path."""
+    if extensions_dir not in sys.path:
+        sys.path.insert(0, extensions_dir)
+    if "gi.repository" in sys.modules:
+        return
+    gi = type(sys)("gi")
+    repository = type(sys)("gi.repository")
+    nemo = type(sys)("Nemo")
+    gobject = type(sys)("GObject")
+    for name in ("Column", "ColumnProvider", "InfoProvider", "NameAndDescProvider"):
+        setattr(nemo, name, type(name, (), {}))
+    nemo.OperationResult = type("OperationResult", (), {"COMPLETE": "complete"})
+    gobject.GObject = type("GObject", (), {})
+    repository.Nemo = nemo
+    repository.GObject = gobject
+    gi.repository = repository
+    sys.modules.update({
+        "gi": gi,
+        "gi.repository": repository,
+        "gi.repository.Nemo": nemo,
+        "gi.repository.GObject": gobject,
+    })
+
+
+class MockFileInfo:
+    """Minimal stand-in for Nemo.FileInfo recording attributes and emblems."""
+
+    def __init__(self, path: str):
+        self._uri = Path(path).as_uri()
+        self.attributes: Dict[str, str] = {}
+        self.emblems: List[str] = []
+
+    def get_activation_uri(self):
+        return self._uri
+
+    def add_string_attribute(self, name, value):
+        self.attributes[name] = value
+
+    def add_emblem(self, emblem):
+        self.emblems.append(emblem)
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""
+Replay a recorded nemo-git-integration call trace.
+
+Feeds each path from a trace written by the extension's call recorder
+(NEMO_GIT_TRACE or the ~/.cache/nemo_git_trace sentinel) back through
+get_file_git_info, so a user's slow listing can be reproduced and
+benchmarked against a local checkout. The visible columns recorded in the
+trace are restored as they change, so replay runs the same git commands.
+
+Usage:
+    replay_trace.py TRACE [--map OLD=NEW ...] [--cold] [--repeat N] [--realtime] [--json]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import gi_stubs  # noqa: E402
+
+
+def load_trace(path: str) -> List[dict]:
+    """Read call and column records, skipping blank or malformed lines."""
+    records = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and (record.get("path") or isinstance(record.get("columns"), list)):
+                records.append(record)
+    return records
+
+
+def parse_mappings(values: Iterable[str]) -> List[Tuple[str, str]]:
+    """Parse OLD=NEW prefix mappings, longest prefix first."""
+    mappings = []
+    for value in values:
+        old, sep, new = value.partition("=")
+        if not sep or not old:
+            raise ValueError(f"Invalid mapping (expected OLD=NEW): {value}")
+        mappings.append((old.rstrip("/"), new.rstrip("/")))
+    return sorted(mappings, key=lambda m: len(m[0]), reverse=True)
+
+
+def map_path(path: str, mappings: List[Tuple[str, str]]) -> str:
+    """Rewrite a recorded path onto the local machine."""
+    for old, new in mappings:
+        if path == old or path.startswith(old + "/"):
+            return new + path[len(old):]
+    return path
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def replay(records: List[dict], mappings: Optional[List[Tuple[str, str]]] = None,
+           cold: bool = False, repeat: int = 1, realtime: bool = False) -> Dict:
+    """
+    Replay trace records through get_file_git_info.
+
+    Args:
+        records: Trace records as returned by load_trace
+        mappings: Path prefix rewrites from recorded to local paths
+        cold: Clear the extension cache before each pass
+        repeat: Number of passes over the trace
+        realtime: Sleep between calls to honour the recorded timing
+
+    Returns:
+        Summary with call count, timings and git commands per subcommand
+    """
+    gi_stubs.install()
+    import nemo_git_status
+
+    mappings = mappings or []
+    durations: List[float] = []
+    git_counts: Dict[str, int] = {}
+    outcomes: Dict[str, int] = {}
+    recorder = nemo_git_status.recorder
+    column_settings = nemo_git_status.column_settings
+    original_columns = column_settings.visible
+    original_note_git = recorder.note_git
+    original_note_outcome = recorder.note_outcome
+
+    def note_git(args, elapsed_ns):
+        sub = nemo_git_status._git_subcommand(args)
+        git_counts[sub] = git_counts.get(sub, 0) + 1
+
+    def note_outcome(outcome):
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    # Count git work and cache outcomes without writing a trace file
+    was_active = recorder.active
+    recorder.note_git = note_git
+    recorder.note_outcome = note_outcome
+    recorder.active = True
+    started = time.perf_counter()
+    try:
+        for _ in range(max(1, repeat)):
+            if cold:
+                nemo_git_status.cache.clear()
+            previous_ts = None
+            for record in records:
+                if realtime and previous_ts is not None:
+                    time.sleep(max(0.0, record.get("ts", previous_ts) - previous_ts))
+                previous_ts = record.get("ts", previous_ts)
+                if not record.get("path"):
+                    column_settings.set_visible(nemo_git_status.COLUMN_PREFIX + c for c in record["columns"])
+                    continue
+                path = map_path(record["path"], mappings)
+                t0 = time.perf_counter()
+                nemo_git_status.get_file_git_info(path)
+                durations.append((time.perf_counter() - t0) * 1000)
+    finally:
+        recorder.note_git = original_note_git
+        recorder.note_outcome = original_note_outcome
+        recorder.active = was_active
+        column_settings.set_visible(nemo_git_status.COLUMN_PREFIX + c for c in original_columns)
+    wall_ms = (time.perf_counter() - started) * 1000
+
+    ordered = sorted(durations)
+    return {
+        "calls": len(durations),
+        "wall_ms": round(wall_ms, 3),
+        "total_ms": round(sum(durations), 3),
+        "p50_ms": round(_percentile(ordered, 0.50), 3),
+        "p95_ms": round(_percentile(ordered, 0.95), 3),
+        "max_ms": round(ordered[-1], 3) if ordered else 0.0,
+        "cache": outcomes,
+        "git": git_counts,
+        "recorded_ms": round(sum(r.get("ms", 0) for r in records if r.get("path")), 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a nemo-git-integration call trace")
+    parser.add_argument("trace", help="JSONL trace written by the extension")
+    parser.add_argument("--map", action="append", default=[], metavar="OLD=NEW",
+                        help="Rewrite recorded path prefix OLD to local prefix NEW")
+    parser.add_argument("--cold", action="store_true", help="Clear the cache before each pass")
+    parser.add_argument("--repeat", type=int, default=1, help="Number of passes over the trace")
+    parser.add_argument("--realtime", action="store_true", help="Honour recorded gaps between calls")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        mappings = parse_mappings(args.map)
+        records = load_trace(args.trace)
+    except (OSError, ValueError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+
+    summary = replay(records, mappings, cold=args.cold, repeat=args.repeat, realtime=args.realtime)
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for key, value in summary.items():
+            print(f"{key:>12}: {value}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
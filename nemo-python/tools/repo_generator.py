@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Synthetic git repository generator for benchmarks.
+
+Builds repositories of a configurable shape - file count, flat or deep
+trees, a percentage of modified files, large untracked directories and
+many sibling repositories - deterministically from a seed. Generated
+repositories are cached by shape so expensive layouts (100k or 1M files)
+are only built once.
+
+Usage:
+    repo_generator.py DEST [--preset NAME] [--files N] [--depth D] [--fanout F]
+                      [--modified PCT] [--untracked-dirs N] [--untracked-per-dir N]
+                      [--siblings N] [--seed S]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+from typing import Dict, List
+
+# Named repository shapes; "siblings" repos are generated next to the main one
+PRESETS: Dict[str, dict] = {
+    "smoke": dict(files=1_000, depth=2, fanout=8, modified_pct=5, untracked_dirs=1,
+                  untracked_per_dir=200, siblings=20),
+    "10k": dict(files=10_000, depth=3, fanout=10, modified_pct=5, untracked_dirs=2,
+                untracked_per_dir=2_000, siblings=50),
+    "10k-flat": dict(files=10_000, depth=0, fanout=1, modified_pct=5, untracked_dirs=0,
+                     untracked_per_dir=0, siblings=0),
+    "100k": dict(files=100_000, depth=4, fanout=10, modified_pct=2, untracked_dirs=4,
+                 untracked_per_dir=10_000, siblings=100),
+    "1m": dict(files=1_000_000, depth=5, fanout=10, modified_pct=1, untracked_dirs=4,
+               untracked_per_dir=50_000, siblings=200),
+}
+
+SHAPE_DEFAULTS = dict(files=1_000, depth=2, fanout=8, modified_pct=0, untracked_dirs=0,
+                      untracked_per_dir=0, siblings=0, seed=0)
+
+SIBLING_FILES = 50
+COMPLETE_MARKER = ".bench-complete.json"
+
+# Fixed identity and dates keep commits (and so object ids) reproducible
+GIT_ENV = {
+    "GIT_AUTHOR_NAME": "Bench",
+    "GIT_AUTHOR_EMAIL": "bench@example.com",
+    "GIT_AUTHOR_DATE": "2000-01-01T00:00:00Z",
+    "GIT_COMMITTER_NAME": "Bench",
+    "GIT_COMMITTER_EMAIL": "bench@example.com",
+    "GIT_COMMITTER_DATE": "2000-01-01T00:00:00Z",
+}
+
+
+def make_shape(preset: str = None, **overrides) -> dict:
+    """Merge a preset with explicit overrides into a full shape dict."""
+    shape = dict(SHAPE_DEFAULTS)
+    if preset:
+        if preset not in PRESETS:
+            raise ValueError(f"Unknown preset: {preset} (choose from {', '.join(PRESETS)})")
+        shape.update(PRESETS[preset])
+    shape.update({k: v for k, v in overrides.items() if v is not None})
+    return shape
+
+
+def shape_key(shape: dict) -> str:
+    """Stable short identifier for a shape, used as the cache directory name."""
+    digest = hashlib.sha1(json.dumps(shape, sort_keys=True).encode()).hexdigest()[:10]
+    return f"repo-{shape['files']}f-d{shape['depth']}-{digest}"
+
+
+def _leaf_dir(index: int, depth: int, fanout: int) -> str:
+    """Map a leaf index to a nested directory path of the given depth."""
+    parts = []
+    for _ in range(depth):
+        parts.append(f"d{index % fanout}")
+        index //= fanout
+    return "/".join(reversed(parts))
+
+
+def _git(repo: str, *args: str):
+    env = dict(os.environ, **GIT_ENV)
+    subprocess.run(["git", "-C", repo, *args], check=True, env=env,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def posix_join(directory: str, name: str) -> str:
+    """Join repo-relative path parts with forward slashes."""
+    return f"{directory}/{name}" if directory else name
+
+
+def _write_tree(root: str, files: int, depth: int, fanout: int) -> List[str]:
+    """Write tracked files round-robin across the leaf directories."""
+    leaves = fanout ** depth if depth > 0 else 1
+    leaf_dirs = [_leaf_dir(i, depth, fanout) for i in range(min(leaves, files) or 1)]
+    for leaf in leaf_dirs:
+        os.makedirs(os.path.join(root, leaf), exist_ok=True)
+    paths = []
+    for i in range(files):
+        rel = posix_join(leaf_dirs[i % len(leaf_dirs)], f"file_{i:07d}.txt")
+        with open(os.path.join(root, rel), "w") as f:
+            f.write(f"file {i}\n")
+        paths.append(rel)
+    return paths
+
+
+def generate_repo(path: str, files: int = 1_000, depth: int = 2, fanout: int = 8,
+                  modified_pct: float = 0, untracked_dirs: int = 0,
+                  untracked_per_dir: int = 0, seed: int = 0, **_ignored) -> dict:
+    """
+    Create a single synthetic repository.
+
+    Args:
+        path: Directory to create (must not exist)
+        files: Number of tracked files
+        depth: Directory nesting depth (0 for a flat tree)
+        fanout: Subdirectories per level
+        modified_pct: Percentage of tracked files modified after the commit
+        untracked_dirs: Number of untracked directories
+        untracked_per_dir: Files inside each untracked directory
+        seed: Random seed choosing the modified files
+
+    Returns:
+        Manifest describing the repository layout
+    """
+    os.makedirs(path)
+    _git(path, "init", "-q", "-b", "main")
+    paths = _write_tree(path, files, depth, fanout)
+    _git(path, "add", "-A")
+    _git(path, "commit", "-q", "-m", "Synthetic repository")
+
+    rng = random.Random(seed)
+    modified = sorted(rng.sample(paths, int(len(paths) * modified_pct / 100)))
+    for rel in modified:
+        with open(os.path.join(path, rel), "a") as f:
+            f.write("modified\n")
+
+    untracked = []
+    for d in range(untracked_dirs):
+        rel_dir = f"untracked_{d}/node_modules"
+        os.makedirs(os.path.join(path, rel_dir))
+        for i in range(untracked_per_dir):
+            with open(os.path.join(path, rel_dir, f"dep_{i:06d}.js"), "w") as f:
+                f.write("module.exports = {};\n")
+        untracked.append(rel_dir)
+
+    leaf_dirs = sorted({os.path.dirname(p) for p in paths})
+    return {
+        "root": path,
+        "files": files,
+        "modified": len(modified),
+        "sample_file": paths[len(paths) // 2] if paths else "",
+        "sample_modified": modified[0] if modified else "",
+        "leaf_dir": leaf_dirs[len(leaf_dirs) // 2] if leaf_dirs else "",
+        "untracked_dirs": untracked,
+    }
+
+
+def generate_workspace(dest: str, shape: dict) -> dict:
+    """
+    Create (or reuse) a main repository plus sibling repositories.
+
+    The workspace is cached under dest by shape and reused when a previous
+    run completed, since large shapes take minutes to build.
+
+    Returns:
+        Manifest with the main repository and the sibling repository roots
+    """
+    root = os.path.join(dest, shape_key(shape))
+    marker = os.path.join(root, COMPLETE_MARKER)
+    if os.path.exists(marker):
+        with open(marker) as f:
+            return json.load(f)
+    if os.path.exists(root):
+        shutil.rmtree(root)
+    os.makedirs(root)
+
+    manifest = {"shape": shape, "main": generate_repo(os.path.join(root, "main"), **shape), "siblings": []}
+    for i in range(shape.get("siblings", 0)):
+        sibling = os.path.join(root, "siblings", f"repo_{i:04d}")
+        os.makedirs(os.path.dirname(sibling), exist_ok=True)
+        generate_repo(sibling, files=SIBLING_FILES, depth=1, fanout=4,
+                      modified_pct=10, seed=shape.get("seed", 0) + i)
+        manifest["siblings"].append(sibling)
+
+    with open(marker, "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic git repositories")
+    parser.add_argument("dest", help="Directory that caches generated workspaces")
+    parser.add_argument("--preset", choices=sorted(PRESETS), help="Named shape")
+    parser.add_argument("--files", type=int)
+    parser.add_argument("--depth", type=int)
+    parser.add_argument("--fanout", type=int)
+    parser.add_argument("--modified", type=float, dest="modified_pct", help="Percent of files modified")
+    parser.add_argument("--untracked-dirs", type=int)
+    parser.add_argument("--untracked-per-dir", type=int)
+    parser.add_argument("--siblings", type=int)
+    parser.add_argument("--seed", type=int)
+    args = vars(parser.parse_args(argv))
+    dest = args.pop("dest")
+    preset = args.pop("preset")
+
+    try:
+        manifest = generate_workspace(dest, make_shape(preset, **args))
+    except (ValueError, OSError, subprocess.CalledProcessError) as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 1
+    print(json.dumps(manifest, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Soak test for the nemo-git-integration extension.
+
+Simulates hours of browsing across many synthetic repositories by feeding
+directory listings through NemoGitIntegration.update_file_info_full with
+mock Nemo file objects, occasionally editing files between listings. Time
+is compressed: the extension's clock jumps ahead between listings, so
+cache expiry and snapshot revalidation happen as they would over hours of
+real use while the run itself takes minutes.
+
+RSS, memory traced to the extension (tracemalloc), thread count and open
+file descriptors are sampled throughout; the run fails if any of them
+keeps growing after warm-up.
+
+Usage:
+    soak.py [--repos N] [--hours H] [--think SECONDS] [--sample-minutes M]
+            [--edit-rate FRACTION] [--seed S] [--cache-dir DIR] [--json]
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import gi_stubs  # noqa: E402
+from gi_stubs import MockFileInfo  # noqa: E402
+import repo_generator  # noqa: E402
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "nemo-git-bench")
+WARMUP_FRACTION = 0.25
+
+# Growth after warm-up beyond these limits counts as a leak
+GROWTH_LIMITS = {
+    "rss_bytes": 16 * 1024 * 1024,
+    "traced_bytes": 256 * 1024,
+    "threads": 0,
+    "fds": 0,
+}
+
+
+class VirtualClock:
+    """Stand-in for the time module whose wall and monotonic clocks can jump ahead."""
+
+    def __init__(self):
+        self.offset = 0.0
+
+    def advance(self, seconds: float):
+        self.offset += seconds
+
+    def time(self) -> float:
+        return time.time() + self.offset
+
+    def monotonic(self) -> float:
+        return time.monotonic() + self.offset
+
+    def __getattr__(self, name):
+        # time_ns stays real: it is compared against file mtimes
+        return getattr(time, name)
+
+
+def _rss_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _open_fds() -> Optional[int]:
+    for fd_dir in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(fd_dir))
+        except OSError:
+            continue
+    return None
+
+
+def _listings(root: str) -> List[List[str]]:
+    """Directory listings (entries of root and each subdirectory) of a repository."""
+    listings = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d != ".git"]
+        entries = [os.path.join(dirpath, name) for name in sorted(dirnames + filenames)]
+        if entries:
+            listings.append(entries)
+    return listings
+
+
+def find_growth(samples: List[dict], limits: Dict[str, float] = None,
+                warmup: float = WARMUP_FRACTION) -> Dict[str, float]:
+    """
+    Find metrics that kept growing after warm-up.
+
+    A metric is flagged when every value after the second half's start
+    exceeds every value before it by more than its limit, or when it never
+    decreases and its total growth exceeds the limit.
+
+    Returns:
+        Growth per flagged metric
+    """
+    limits = GROWTH_LIMITS if limits is None else limits
+    steady = samples[int(len(samples) * warmup):]
+    growth = {}
+    if len(steady) < 4:
+        return growth
+    for metric, limit in limits.items():
+        values = [s[metric] for s in steady if s.get(metric) is not None]
+        if len(values) < 4:
+            continue
+        half = len(values) // 2
+        floor_rise = min(values[half:]) - max(values[:half])
+        rising = all(b >= a for a, b in zip(values, values[1:]))
+        total = values[-1] - values[0]
+        if floor_rise > limit or (rising and total > limit):
+            growth[metric] = max(floor_rise, total)
+    return growth
+
+
+def soak(repos: List[str], hours: float = 8.0, think: float = 30.0,
+         sample_minutes: float = 10.0, edit_rate: float = 0.2, seed: int = 0) -> dict:
+    """
+    Browse repositories for a span of simulated time and sample resource use.
+
+    Args:
+        repos: Repository roots to browse
+        hours: Simulated duration
+        think: Mean simulated seconds between directory listings
+        sample_minutes: Simulated minutes between samples
+        edit_rate: Probability of editing a file after a listing
+        seed: Random seed choosing listings and edits
+
+    Returns:
+        Summary with samples, flagged growth and the largest allocation increases
+    """
+    gi_stubs.install()
+    import nemo_git_status
+
+    rng = random.Random(seed)
+    listings = {repo: _listings(repo) for repo in repos}
+    extension = nemo_git_status.NemoGitIntegration()
+    clock = VirtualClock()
+    original_time = nemo_git_status.time
+    edited: Dict[str, bytes] = {}
+    samples: List[dict] = []
+    snapshots = []
+    filters = [tracemalloc.Filter(True, nemo_git_status.__file__)]
+    calls = 0
+
+    def sample(elapsed: float):
+        snapshot = tracemalloc.take_snapshot().filter_traces(filters)
+        snapshots.append(snapshot)
+        samples.append({
+            "simulated_s": round(elapsed),
+            "calls": calls,
+            "rss_bytes": _rss_bytes(),
+            "traced_bytes": sum(stat.size for stat in snapshot.statistics("filename")),
+            "threads": threading.active_count(),
+            "fds": _open_fds(),
+            "cached_repos": nemo_git_status.cache.get_stats()["size"],
+        })
+
+    def toggle_edit(path: str):
+        # Edits are undone on the next visit so the dirty set stays bounded
+        if path in edited:
+            with open(path, "wb") as f:
+                f.write(edited.pop(path))
+        else:
+            with open(path, "rb") as f:
+                edited[path] = f.read()
+            with open(path, "ab") as f:
+                f.write(b"soak edit\n")
+
+    nemo_git_status.cache.clear()
+    nemo_git_status.time = clock
+    tracemalloc.start()
+    started = time.perf_counter()
+    try:
+        duration = hours * 3600
+        interval = sample_minutes * 60
+        next_sample = 0.0
+        while clock.offset < duration:
+            if clock.offset >= next_sample:
+                sample(clock.offset)
+                next_sample += interval
+            repo = rng.choice(repos)
+            entries = rng.choice(listings[repo])
+            for path in entries:
+                extension.update_file_info_full(None, None, None, MockFileInfo(path))
+                calls += 1
+            if rng.random() < edit_rate:
+                files = [p for p in entries if os.path.isfile(p)]
+                if files:
+                    toggle_edit(rng.choice(files))
+            clock.advance(rng.expovariate(1.0 / think) if think > 0 else 0)
+        sample(clock.offset)
+    finally:
+        nemo_git_status.time = original_time
+        for path, content in edited.items():
+            with open(path, "wb") as f:
+                f.write(content)
+        tracemalloc.stop()
+
+    growth = find_growth(samples)
+    top = []
+    steady = snapshots[int(len(snapshots) * WARMUP_FRACTION):]
+    if growth and len(steady) >= 2:
+        for stat in steady[-1].compare_to(steady[0], "lineno")[:10]:
+            top.append(str(stat))
+    return {
+        "repos": len(repos),
+        "simulated_hours": hours,
+        "wall_s": round(time.perf_counter() - started, 2),
+        "calls": calls,
+        "errors": extension.get_stats()["errors"],
+        "samples": samples,
+        "growth": growth,
+        "top_allocations": top,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Soak test the nemo-git-integration extension")
+    parser.add_argument("--repos", type=int, default=200, help="Synthetic repositories to browse")
+    parser.add_argument("--hours", type=float, default=8.0, help="Simulated hours of browsing")
+    parser.add_argument("--think", type=float, default=30.0,
+                        help="Mean simulated seconds between directory listings")
+    parser.add_argument("--sample-minutes", type=float, default=10.0,
+                        help="Simulated minutes between resource samples")
+    parser.add_argument("--edit-rate", type=float, default=0.2,
+                        help="Probability of editing a file after each listing")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR,
+                        help="Where generated repositories are kept between runs")
+    parser.add_argument("--json", action="store_true", help="Print the full summary as JSON")
+    args = parser.parse_args(argv)
+
+    shape = repo_generator.make_shape(files=200, depth=1, fanout=4, modified_pct=5,
+                                      siblings=max(0, args.repos - 1), seed=args.seed)
+    print(f"[INFO] Preparing {args.repos} repositories in {args.cache_dir}", file=sys.stderr)
+    manifest = repo_generator.generate_workspace(args.cache_dir, shape)
+    repos = [manifest["main"]["root"]] + manifest["siblings"]
+
+    summary = soak(repos, hours=args.hours, think=args.think, sample_minutes=args.sample_minutes,
+                   edit_rate=args.edit_rate, seed=args.seed)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        for s in summary["samples"]:
+            rss = f"{s['rss_bytes'] / 1048576:8.1f} MiB" if s["rss_bytes"] is not None else "     n/a"
+            print(f"{s['simulated_s'] / 3600:6.2f} h  calls {s['calls']:8d}  rss {rss}  "
+                  f"traced {s['traced_bytes'] / 1024:8.1f} KiB  threads {s['threads']:3d}  "
+                  f"fds {s['fds']}  cached {s['cached_repos']}")
+        print(f"[INFO] {summary['calls']} calls over {args.hours} simulated hours "
+              f"in {summary['wall_s']} s ({summary['errors']} errors)")
+
+    if summary["growth"]:
+        print("[ERROR] Resource growth after warm-up:", file=sys.stderr)
+        for metric, amount in summary["growth"].items():
+            print(f"  {metric}: +{amount}", file=sys.stderr)
+        for line in summary["top_allocations"]:
+            print(f"  {line}", file=sys.stderr)
+        return 1
+    print("[INFO] No resource growth detected", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
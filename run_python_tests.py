@@ -23,7 +23,29 @@ sys.modules['gi.repository.GObject'] = type(sys)('GObject')
 os.environ['PYTHONPATH'] = str(extensions_path) + ':' + os.environ.get('PYTHONPATH', '')
 
 
-def run_tests(test_type="all"):
+def run_tool(script, tool_args, description):
+    """
+    Run one of the nemo-python/tools scripts
+    
+    Args:
+        script: Script name in nemo-python/tools (e.g. benchmark.py)
+        tool_args: Extra arguments passed to the script
+                   (e.g. --preset 10k --save-baseline)
+        description: What is being run, for the banner
+    """
+    tool_script = project_root / "nemo-python" / "tools" / script
+    command = [sys.executable, str(tool_script)] + list(tool_args)
+    
+    print(f"Running {description}...")
+    print(f"Command: {' '.join(command)}")
+    print("-" * 60)
+    
+    env = os.environ.copy()
+    env['PYTHONPATH'] = str(extensions_path)
+    return subprocess.run(command, cwd=project_root, env=env).returncode
+
+
+def run_tests(test_type="all", extra_args=()):
     """
     Run tests based on type
     
@@ -34,25 +56,40 @@ def run_tests(test_type="all"):
                   - "integration": Run integration tests only
                   - "security": Run security tests only
                   - "performance": Run performance tests only
+                  - "performance-bench": Run the benchmark suite
+                  - "performance-soak": Run the long-running soak test
                   - "regression": Run regression tests only
+        extra_args: Additional arguments for the benchmark suite or soak test
     """
     
     test_dir = project_root / "nemo-python" / "tests"
     
+    if test_type == "performance-bench":
+        return run_tool("benchmark.py", extra_args, "performance benchmarks")
+    if test_type == "performance-soak":
+        return run_tool("soak.py", extra_args, "soak test")
+    
     if test_type == "all":
         pytest_args = [str(test_dir)]
     elif test_type == "unit":
         pytest_args = [
             str(test_dir / "test_git.py"),
+            str(test_dir / "test_columns.py"),
             str(test_dir / "test_parse_status.py"),
             str(test_dir / "test_paths.py")
         ]
     elif test_type == "integration":
-        pytest_args = [str(test_dir / "test_integration.py")]
+        pytest_args = [
+            str(test_dir / "test_integration.py"),
+            str(test_dir / "test_trace.py")
+        ]
     elif test_type == "security":
         pytest_args = [str(test_dir / "test_security.py")]
     elif test_type == "performance":
-        pytest_args = [str(test_dir / "test_performance.py")]
+        pytest_args = [
+            str(test_dir / "test_performance.py"),
+            str(test_dir / "test_concurrency.py")
+        ]
     elif test_type == "regression":
         pytest_args = [str(test_dir / "test_regression.py")]
     else:
@@ -96,7 +133,7 @@ def main():
     else:
         test_type = "all"
     
-    return run_tests(test_type)
+    return run_tests(test_type, sys.argv[2:])
 
 
 if __name__ == "__main__":
@@ -11,4 +11,14 @@
   run ./install.sh
   [ "$status" -eq 0 ]
   [ -f "$HOME/.local/share/nemo-python/extensions/nemo_git_status.py" ]
-}
\ No newline at end of file
+}
+
+@test "installation provides an emblem icon for every status emblem" {
+  run ./install.sh
+  [ "$status" -eq 0 ]
+  emblems=$(sed -n '/^STATUS_EMBLEMS = {/,/^}/s/.*: "\(.*\)",$/\1/p' nemo-python/extensions/nemo_git_status.py)
+  [ -n "$emblems" ]
+  for name in $emblems; do
+    [ -f "$HOME/.local/share/icons/hicolor/64x64/emblems/emblem-$name.png" ]
+  done
+}
@@ -0,0 +1,119 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  source "$SOURCE_DIR/lib/progress.sh"
+
+  # Zenity mock: logs its input, or reads one line and cancels when
+  # ZENITY_CANCEL is set
+  ZENITY_LOG="$TEST_DIR/zenity_log.txt"
+  export ZENITY_LOG
+  export PATH="$TEST_DIR:$PATH"
+
+  cat <<'EOF' > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock] $@" >> "$ZENITY_LOG"
+if [ -n "$ZENITY_CANCEL" ]; then
+  head -n 1 >> "$ZENITY_LOG"
+  exit 1
+fi
+cat >> "$ZENITY_LOG"
+exit 0
+EOF
+  chmod +x "$TEST_DIR/zenity"
+
+  # Fake command printing git-style progress, then failing
+  cat <<'EOF' > "$TEST_DIR/fake-clone"
+#!/bin/bash
+echo "Cloning into 'repo'..."
+for pct in 10 50 100; do
+  printf 'Receiving objects: %3d%% (%d/10)\r' "$pct" $((pct / 10)) >&2
+done
+echo ", done." >&2
+echo "Resolving deltas: 100% (4/4), done." >&2
+echo "fatal: something went wrong" >&2
+exit 3
+EOF
+  chmod +x "$TEST_DIR/fake-clone"
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+@test "turns progress output into dialog updates" {
+  run run_with_progress "$TEST_DIR/log" --title="Clone" -- "$TEST_DIR/fake-clone"
+  [ "$status" -eq 3 ]
+
+  grep -q -- "--progress.*--title=Clone" "$ZENITY_LOG"
+  grep -qx "50" "$ZENITY_LOG"
+  grep -qx "# Receiving objects 50%" "$ZENITY_LOG"
+  # The dialog only closes once the command has finished
+  [ "$(grep -x "[0-9]*" "$ZENITY_LOG" | tail -n 2 | head -n 1)" = "99" ]
+  [ "$(tail -n 1 "$ZENITY_LOG")" = "100" ]
+}
+
+@test "keeps only the last lines of output without progress updates" {
+  NEMO_GIT_OUTPUT_LINES=3 run run_with_progress "$TEST_DIR/log" -- "$TEST_DIR/fake-clone"
+
+  run cat "$TEST_DIR/log"
+  [ "${#lines[@]}" -eq 3 ]
+  [ "${lines[0]}" = ", done." ]
+  [ "${lines[2]}" = "fatal: something went wrong" ]
+}
+
+@test "cancelling the dialog kills the whole process group" {
+  cat <<'EOF' > "$TEST_DIR/slow"
+#!/bin/bash
+echo "started"
+sleep 60 &
+echo $! > "$PID_FILE"
+wait
+EOF
+  chmod +x "$TEST_DIR/slow"
+  export PID_FILE="$TEST_DIR/child.pid"
+
+  SECONDS=0
+  ZENITY_CANCEL=1 run run_with_progress "$TEST_DIR/log" -- "$TEST_DIR/slow"
+  [ "$status" -eq 130 ]
+  [ "$SECONDS" -lt 10 ]
+
+  sleep 0.2
+  run ps -o stat= -p "$(cat "$PID_FILE")"
+  [[ -z "$output" || "$output" == Z* ]]
+}
+
+@test "streams output into a text viewer" {
+  run run_with_viewer "$TEST_DIR/log" --title="Status" -- seq 1 5000
+  [ "$status" -eq 0 ]
+
+  grep -q -- "--text-info --title=Status" "$ZENITY_LOG"
+  grep -qx "5000" "$ZENITY_LOG"
+  [ "$(wc -l < "$TEST_DIR/log")" -eq "$NEMO_GIT_OUTPUT_LINES" ]
+}
+
+@test "closing the viewer early stops the command" {
+  SECONDS=0
+  ZENITY_CANCEL=1 run run_with_viewer "$TEST_DIR/log" -- bash -c 'echo first; sleep 60'
+  [ "$status" -eq 130 ]
+  [ "$SECONDS" -lt 10 ]
+}
+
+@test "reports the command's status under job control" {
+  # Called directly, as run would start it in a subshell without job control
+  set -m
+  run_with_progress "$TEST_DIR/log" -- "$TEST_DIR/fake-clone" && rc=0 || rc=$?
+  set +m
+  [ "$rc" -eq 3 ]
+}
+
+@test "closing the viewer after the command finished keeps its status" {
+  cat <<'EOF2' > "$TEST_DIR/zenity"
+#!/bin/bash
+cat > /dev/null
+sleep 0.5
+EOF2
+  run run_with_viewer "$TEST_DIR/log" -- bash -c 'echo done; exit 143'
+  [ "$status" -eq 143 ]
+}
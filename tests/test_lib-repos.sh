@@ -0,0 +1,87 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  export NEMO_GIT_REPO_CACHE_DIR="$TEST_DIR/repo-cache"
+  source "$SOURCE_DIR/lib/repos.sh"
+
+  git config --global init.defaultBranch main
+  WORKSPACE="$TEST_DIR/workspace"
+  mkdir -p "$WORKSPACE"
+  git init -q "$WORKSPACE/top"
+  git init -q "$WORKSPACE/org/team/nested"
+  git init -q "$WORKSPACE/top/vendor/inner"
+  git init -q "$WORKSPACE/web/node_modules/pkg"
+  mkdir -p "$WORKSPACE/worktree"
+  echo "gitdir: $WORKSPACE/top/.git/worktrees/wt" > "$WORKSPACE/worktree/.git"
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+list_repos() {
+  discover_repos "$1" | tr '\0' '\n' | sed "s|^$WORKSPACE/||"
+}
+
+@test "finds nested repositories and worktrees without entering repositories" {
+  run list_repos "$WORKSPACE"
+  [ "$status" -eq 0 ]
+  [ "$output" = "$(printf 'org/team/nested\ntop\nworktree')" ]
+}
+
+@test "skips ignored directories" {
+  NEMO_GIT_DISCOVERY_IGNORE="" run list_repos "$WORKSPACE"
+  [[ "$output" == *"web/node_modules/pkg"* ]]
+
+  NEMO_GIT_DISCOVERY_IGNORE="org:web" run list_repos "$WORKSPACE"
+  [ "$output" = "$(printf 'top\nworktree')" ]
+}
+
+@test "honours the depth limit" {
+  NEMO_GIT_DISCOVERY_DEPTH=2 run list_repos "$WORKSPACE"
+  [ "$output" = "$(printf 'top\nworktree')" ]
+}
+
+@test "returns the root itself when it is a repository" {
+  run list_repos "$WORKSPACE/top"
+  [ "$output" = "top" ]
+}
+
+@test "reuses the cached list until a searched directory changes" {
+  list_repos "$WORKSPACE" > /dev/null
+  [ "$(ls "$NEMO_GIT_REPO_CACHE_DIR" | wc -l)" -eq 1 ]
+
+  # A record added behind the walk's back is served while the cache is valid
+  git init -q "$TEST_DIR/outside"
+  cache_file="$NEMO_GIT_REPO_CACHE_DIR/$(ls "$NEMO_GIT_REPO_CACHE_DIR")"
+  printf 'R%s/\0' "$TEST_DIR/outside" >> "$cache_file"
+  run list_repos "$WORKSPACE"
+  [[ "$output" == *"$TEST_DIR/outside"* ]]
+
+  # New repositories change their parent's mtime and force a fresh walk
+  git init -q "$WORKSPACE/org/team/added"
+  run list_repos "$WORKSPACE"
+  [[ "$output" == *"org/team/added"* ]]
+
+  # Removed repositories invalidate the cache and expose what they contained
+  rm -rf "$WORKSPACE/top/.git"
+  run list_repos "$WORKSPACE"
+  [ "$(grep -cx "top" <<<"$output")" -eq 0 ]
+  [[ "$output" == *"top/vendor/inner"* ]]
+}
+
+@test "finds the repository root of a file, including .git files" {
+  mkdir -p "$WORKSPACE/top/src"
+  touch "$WORKSPACE/top/src/file.txt" "$WORKSPACE/worktree/file.txt"
+
+  run find_repo_root "$WORKSPACE/top/src/file.txt"
+  [ "$output" = "$WORKSPACE/top" ]
+
+  run find_repo_root "$WORKSPACE/worktree/file.txt"
+  [ "$output" = "$WORKSPACE/worktree" ]
+
+  run find_repo_root "$TEST_DIR"
+  [ "$status" -ne 0 ]
+}
@@ -6,17 +6,26 @@ setup() {
   SCRIPT_NAME="s01b-clone.sh"
   SCRIPT_PATH="$SOURCE_DIR/s01-create/$SCRIPT_NAME"
 
-  cp "$SCRIPT_PATH" "$TEST_DIR/$SCRIPT_NAME"
-  chmod +x "$TEST_DIR/$SCRIPT_NAME"
+  mkdir -p "$TEST_DIR/s01-create"
+  cp "$SCRIPT_PATH" "$TEST_DIR/s01-create/$SCRIPT_NAME"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
+  chmod +x "$TEST_DIR/s01-create/$SCRIPT_NAME"
 
   export PATH="$TEST_DIR:$PATH"
 
   # Create mock zenity with dynamic entry injection
   cat > "$TEST_DIR/zenity" <<'EOF'
 #!/bin/bash
+echo "$*" >> "$ZENITY_LOG_FILE"
 if [[ "$*" == *"--entry"* ]]; then
   echo "$ZENITY_MOCK_REPO_URL"
   exit 0
+elif [[ "$*" == *"--list"* ]]; then
+  echo "${ZENITY_MOCK_CLONE_MODE-full}"
+  exit 0
+elif [[ "$*" == *"--file-selection"* ]]; then
+  echo "$ZENITY_MOCK_REFERENCE"
+  exit 0
 elif [[ "$*" == *"--info"* ]]; then
   echo "[Zenity Info] $@" >&2
   exit 0
@@ -29,6 +38,24 @@ elif [[ "$*" == *"--warning"* ]]; then
 fi
 EOF
   chmod +x "$TEST_DIR/zenity"
+  export ZENITY_LOG_FILE="$TEST_DIR/zenity.log"
+}
+
+# A bare repository with two commits and a subfolder, allowing partial clones
+create_bare_source() {
+  git init -q "$TEST_DIR/work"
+  mkdir "$TEST_DIR/work/docs"
+  echo "top" > "$TEST_DIR/work/top.txt"
+  echo "doc" > "$TEST_DIR/work/docs/doc.txt"
+  git -C "$TEST_DIR/work" add .
+  git -C "$TEST_DIR/work" commit -q -m "first"
+  echo "more" >> "$TEST_DIR/work/top.txt"
+  git -C "$TEST_DIR/work" commit -q -am "second"
+  git clone -q --bare "$TEST_DIR/work" "$TEST_DIR/big.git"
+  git -C "$TEST_DIR/big.git" config uploadpack.allowFilter true
+  mkdir "$TEST_DIR/dest"
+  # Remembered clone modes live under $HOME
+  export HOME="$TEST_DIR/home"
 }
 
 teardown() {
@@ -37,8 +64,9 @@ teardown() {
 
 @test "s01b-clone.sh clones a repository successfully" {
   export ZENITY_MOCK_REPO_URL="https://github.com/wilsonify/nemo-git-integration.git"
+  export HOME="$TEST_DIR/home"
   echo "$TEST_DIR"
-  run "$TEST_DIR/$SCRIPT_NAME" "$TEST_DIR"
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR"
 
   [ "$status" -eq 0 ]
   [ -d "$TEST_DIR/nemo-git-integration" ]
@@ -48,7 +76,7 @@ teardown() {
 @test "s01b-clone.sh shows error when no URL is entered" {
   export ZENITY_MOCK_REPO_URL=""
 
-  run "$TEST_DIR/$SCRIPT_NAME" "$TEST_DIR"
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR"
 
   [ "$status" -eq 1 ]
   [ ! -d "$TEST_DIR/.git" ]
@@ -57,7 +85,123 @@ teardown() {
 @test "s01b-clone.sh handles clone failure" {
   export ZENITY_MOCK_REPO_URL="https://invalid.url/fake/repo.git"
 
-  run "$TEST_DIR/$SCRIPT_NAME" "$TEST_DIR"
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR"
 
   [ "$status" -ne 0 ] # Git clone should fail
 }
+
+@test "s01b-clone.sh clones a local repository with progress" {
+  git init -q "$TEST_DIR/source"
+  echo "content" > "$TEST_DIR/source/file.txt"
+  git -C "$TEST_DIR/source" add file.txt
+  git -C "$TEST_DIR/source" commit -q -m "initial"
+  export ZENITY_MOCK_REPO_URL="$TEST_DIR/source"
+  export HOME="$TEST_DIR/home"
+
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/s01-create"
+
+  [ "$status" -eq 0 ]
+  [ -f "$TEST_DIR/s01-create/source/file.txt" ]
+  [[ "$output" == *"Clone Success"* ]]
+}
+
+@test "s01b-clone.sh makes a shallow clone" {
+  create_bare_source
+  export ZENITY_MOCK_REPO_URL="file://$TEST_DIR/big.git"
+  export ZENITY_MOCK_CLONE_MODE="shallow"
+
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+
+  [ "$status" -eq 0 ]
+  [ "$(git -C "$TEST_DIR/dest/big" rev-parse --is-shallow-repository)" = "true" ]
+  [ "$(git -C "$TEST_DIR/dest/big" rev-list --count HEAD)" -eq 1 ]
+}
+
+@test "s01b-clone.sh makes a shallow clone of a plain local path" {
+  create_bare_source
+  export ZENITY_MOCK_REPO_URL="$TEST_DIR/big.git"
+  export ZENITY_MOCK_CLONE_MODE="shallow"
+
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+
+  [ "$status" -eq 0 ]
+  [ "$(git -C "$TEST_DIR/dest/big" rev-list --count HEAD)" -eq 1 ]
+}
+
+@test "s01b-clone.sh makes a blobless clone" {
+  create_bare_source
+  export ZENITY_MOCK_REPO_URL="file://$TEST_DIR/big.git"
+  export ZENITY_MOCK_CLONE_MODE="blobless"
+
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+
+  [ "$status" -eq 0 ]
+  [ "$(git -C "$TEST_DIR/dest/big" config remote.origin.partialclonefilter)" = "blob:none" ]
+  # Contents of older versions were not downloaded
+  [ "$(git -C "$TEST_DIR/dest/big" rev-list --objects --missing=print --all | grep -c '^?')" -gt 0 ]
+  [ "$(git -C "$TEST_DIR/dest/big" rev-list --count HEAD)" -eq 2 ]
+  [ -f "$TEST_DIR/dest/big/docs/doc.txt" ]
+}
+
+@test "s01b-clone.sh makes a sparse clone with only top-level files" {
+  create_bare_source
+  export ZENITY_MOCK_REPO_URL="file://$TEST_DIR/big.git"
+  export ZENITY_MOCK_CLONE_MODE="sparse"
+
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+
+  [ "$status" -eq 0 ]
+  [ -f "$TEST_DIR/dest/big/top.txt" ]
+  [ ! -e "$TEST_DIR/dest/big/docs" ]
+  [[ "$output" == *"sparse-checkout add"* ]]
+}
+
+@test "s01b-clone.sh borrows objects from a reference clone" {
+  create_bare_source
+  export ZENITY_MOCK_REPO_URL="file://$TEST_DIR/big.git"
+  export ZENITY_MOCK_CLONE_MODE="reference"
+  export ZENITY_MOCK_REFERENCE="$TEST_DIR/work"
+
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+
+  [ "$status" -eq 0 ]
+  grep -q "$TEST_DIR/work/.git/objects" "$TEST_DIR/dest/big/.git/objects/info/alternates"
+  [ -f "$TEST_DIR/dest/big/top.txt" ]
+}
+
+@test "s01b-clone.sh rejects a reference folder that is not a repository" {
+  create_bare_source
+  export ZENITY_MOCK_REPO_URL="file://$TEST_DIR/big.git"
+  export ZENITY_MOCK_CLONE_MODE="reference"
+  export ZENITY_MOCK_REFERENCE="$TEST_DIR/dest"
+
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+
+  [ "$status" -eq 1 ]
+  [ ! -e "$TEST_DIR/dest/big" ]
+}
+
+@test "s01b-clone.sh remembers the clone mode per host" {
+  create_bare_source
+  export ZENITY_MOCK_REPO_URL="file://$TEST_DIR/big.git"
+  export ZENITY_MOCK_CLONE_MODE="blobless"
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+  [ "$status" -eq 0 ]
+
+  rm -rf "$TEST_DIR/dest/big" "$ZENITY_LOG_FILE"
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+
+  grep -q "TRUE blobless" "$ZENITY_LOG_FILE"
+  grep -q "FALSE full" "$ZENITY_LOG_FILE"
+}
+
+@test "s01b-clone.sh does nothing when the clone mode is cancelled" {
+  create_bare_source
+  export ZENITY_MOCK_REPO_URL="file://$TEST_DIR/big.git"
+  export ZENITY_MOCK_CLONE_MODE=""
+
+  run "$TEST_DIR/s01-create/$SCRIPT_NAME" "$TEST_DIR/dest"
+
+  [ "$status" -eq 0 ]
+  [ ! -e "$TEST_DIR/dest/big" ]
+}
@@ -6,8 +6,10 @@ setup() {
   SCRIPT_NAME="s01c-branch.sh"
   SCRIPT_PATH="$SOURCE_DIR/s01-create/$SCRIPT_NAME"
 
-  cp "$SCRIPT_PATH" "$TEST_DIR/$SCRIPT_NAME"
-  chmod +x "$TEST_DIR/$SCRIPT_NAME"
+  mkdir -p "$TEST_DIR/s01-create"
+  cp "$SCRIPT_PATH" "$TEST_DIR/s01-create/$SCRIPT_NAME"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
+  chmod +x "$TEST_DIR/s01-create/$SCRIPT_NAME"
 
   export PATH="$TEST_DIR:$PATH"
 
@@ -15,7 +17,14 @@ setup() {
   cat > "$TEST_DIR/zenity" <<'EOF'
 #!/bin/bash
 if [[ "$*" == *"--list"* ]]; then
-  echo "$ZENITY_BRANCH_SELECTION"
+  # Keep each list shown; the second one answers ZENITY_BRANCH_SELECTION_2
+  n=$(ls "$ZENITY_LISTS_DIR" | wc -l)
+  cat > "$ZENITY_LISTS_DIR/list.$((n + 1))"
+  if [ "$n" -eq 1 ]; then
+    echo "$ZENITY_BRANCH_SELECTION_2"
+  else
+    echo "$ZENITY_BRANCH_SELECTION"
+  fi
   exit 0
 elif [[ "$*" == *"--entry"* ]]; then
   echo "$ZENITY_NEW_BRANCH_NAME"
@@ -23,6 +32,26 @@ elif [[ "$*" == *"--entry"* ]]; then
 fi
 EOF
   chmod +x "$TEST_DIR/zenity"
+  export ZENITY_LISTS_DIR="$TEST_DIR/lists"
+  mkdir -p "$ZENITY_LISTS_DIR"
+}
+
+# A repository "repo" with branches committed on increasingly recent dates
+create_repo_with_branches() {
+  git init -q -b main "$TEST_DIR/repo"
+  cd "$TEST_DIR/repo"
+  local day=1 branch
+  for branch in main "$@"; do
+    git checkout -q -B "$branch"
+    GIT_COMMITTER_DATE="2024-01-0$day 12:00:00" git commit -q --allow-empty -m "$branch"
+    day=$((day + 1))
+  done
+  git checkout -q main
+}
+
+# Print the branch names offered by the Nth list dialog
+listed_branches() {
+  awk 'NR % 2 == 1' "$ZENITY_LISTS_DIR/list.$1"
 }
 
 teardown() {
@@ -41,7 +70,7 @@ teardown() {
   export ZENITY_BRANCH_SELECTION="[New Branch]"
   export ZENITY_NEW_BRANCH_NAME="feature/test-branch"
 
-  run "$TEST_DIR/s01c-branch.sh" "$TEST_DIR"
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR"
 
   [ "$status" -eq 0 ]
   BRANCH=$(git rev-parse --abbrev-ref HEAD)
@@ -63,7 +92,7 @@ teardown() {
 
   export ZENITY_BRANCH_SELECTION="feature/other"
 
-  run "$TEST_DIR/s01c-branch.sh" "$TEST_DIR"
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR"
 
   [ "$status" -eq 0 ]
   BRANCH=$(git rev-parse --abbrev-ref HEAD)
@@ -72,3 +101,72 @@ teardown() {
   [ "$(cat ~/.cache/nemo_git_current_branch)" = "feature/other" ]
   [ "$(cat ~/.cache/nemo_git_prev_branch)" = "main" ]
 }
+
+@test "s01c-branch.sh lists the most recently committed branches first" {
+  create_repo_with_branches old middle new
+  export ZENITY_BRANCH_SELECTION=""
+
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR/repo"
+
+  [ "$status" -eq 0 ]
+  [ "$(listed_branches 1 | tr '\n' ' ')" = "new middle old main [New Branch] " ]
+  grep -q "2024-01-04" "$ZENITY_LISTS_DIR/list.1"
+}
+
+@test "s01c-branch.sh reuses the cached list until the refs change" {
+  create_repo_with_branches first
+  export ZENITY_BRANCH_SELECTION=""
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR/repo"
+  CACHE="$(ls -d ~/.cache/nemo_git_branches_state/*)/branches"
+  printf 'cached-only\t2000-01-01\n' >> "$CACHE"
+
+  rm "$ZENITY_LISTS_DIR"/*
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR/repo"
+  listed_branches 1 | grep -qx "cached-only"
+
+  git branch second
+  rm "$ZENITY_LISTS_DIR"/*
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR/repo"
+  listed_branches 1 | grep -qx "second"
+  [ "$(listed_branches 1 | grep -c "cached-only")" -eq 0 ]
+}
+
+@test "s01c-branch.sh searches branches beyond the limit" {
+  create_repo_with_branches feature/a feature/b topic
+  export NEMO_GIT_BRANCH_LIMIT=2
+  export ZENITY_BRANCH_SELECTION="[Search All Branches]"
+  export ZENITY_NEW_BRANCH_NAME="FEATURE/A"
+  export ZENITY_BRANCH_SELECTION_2="feature/a"
+
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR/repo"
+
+  [ "$status" -eq 0 ]
+  [ "$(listed_branches 1 | tr '\n' ' ')" = "topic feature/b [New Branch] [Search All Branches] " ]
+  [ "$(listed_branches 2 | tr '\n' ' ')" = "feature/a [New Branch] " ]
+  [ "$(git rev-parse --abbrev-ref HEAD)" = "feature/a" ]
+}
+
+@test "s01c-branch.sh checks out a remote branch as a tracking branch" {
+  create_repo_with_branches main-only
+  git clone -q "$TEST_DIR/repo" "$TEST_DIR/clone"
+  git -C "$TEST_DIR/clone" remote add upstream "$TEST_DIR/repo"
+  git -C "$TEST_DIR/clone" fetch -q upstream
+  export ZENITY_BRANCH_SELECTION="upstream/main-only"
+
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR/clone"
+
+  [ "$status" -eq 0 ]
+  [ "$(git -C "$TEST_DIR/clone" rev-parse --abbrev-ref HEAD)" = "main-only" ]
+  [ "$(git -C "$TEST_DIR/clone" rev-parse --abbrev-ref "main-only@{upstream}")" = "upstream/main-only" ]
+  listed_branches 1 | grep -qx "main-only"
+}
+
+@test "s01c-branch.sh reports a branch that cannot be checked out" {
+  create_repo_with_branches other
+  export ZENITY_BRANCH_SELECTION="does-not-exist"
+
+  run "$TEST_DIR/s01-create/s01c-branch.sh" "$TEST_DIR/repo"
+
+  [ "$status" -ne 0 ]
+  [ "$(git rev-parse --abbrev-ref HEAD)" = "main" ]
+}
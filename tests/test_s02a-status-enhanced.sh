@@ -0,0 +1,118 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  SCRIPT="$TEST_DIR/s02-read/s02a-status-enhanced.sh"
+  mkdir -p "$TEST_DIR/s02-read"
+  cp "$SOURCE_DIR/s02-read/s02a-status-enhanced.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
+  chmod +x "$SCRIPT"
+  export NEMO_GIT_REPO_CACHE_DIR="$TEST_DIR/repo-cache"
+
+  # Zenity mock: drains progress input and saves text-info contents,
+  # whether given as a file or streamed on stdin
+  ZENITY_LOG="$TEST_DIR/zenity_log.txt"
+  ZENITY_TEXT="$TEST_DIR/zenity_text.txt"
+  export ZENITY_LOG ZENITY_TEXT
+  export PATH="$TEST_DIR:$PATH"
+
+  cat <<'EOF' > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock] $@" >> "$ZENITY_LOG"
+if [[ "$*" == *"--progress"* ]]; then
+  cat >> "$ZENITY_LOG"
+elif [[ "$*" == *"--text-info"* && "$*" == *"--filename="* ]]; then
+  for arg in "$@"; do
+    [[ "$arg" == --filename=* ]] && cat "${arg#--filename=}" > "$ZENITY_TEXT"
+  done
+elif [[ "$*" == *"--text-info"* ]]; then
+  cat > "$ZENITY_TEXT"
+elif [[ "$*" == *"--error"* ]]; then
+  exit 1
+fi
+exit 0
+EOF
+  chmod +x "$TEST_DIR/zenity"
+
+  git config --global init.defaultBranch main
+  WORKSPACE="$TEST_DIR/workspace"
+  for name in clean dirty untracked; do
+    git init -q "$WORKSPACE/$name"
+    echo "content" > "$WORKSPACE/$name/file.txt"
+    git -C "$WORKSPACE/$name" add file.txt
+    git -C "$WORKSPACE/$name" commit -q -m "initial"
+  done
+  echo "change" >> "$WORKSPACE/dirty/file.txt"
+  touch "$WORKSPACE/untracked/new.txt"
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+@test "summarises many repositories sorted by severity" {
+  NEMO_GIT_JOBS=2 run "$SCRIPT" "$WORKSPACE"
+  [ "$status" -eq 0 ]
+
+  run cat "$ZENITY_TEXT"
+  [[ "${lines[0]}" == "3 repositories: 1 changed, 1 untracked, 1 clean" ]]
+  [[ "${lines[1]}" == CHANGED*dirty*"1 modified"* ]]
+  [[ "${lines[2]}" == UNTRACKED*untracked*"1 untracked"* ]]
+  [[ "${lines[3]}" == CLEAN*clean*main* ]]
+}
+
+@test "shows progress while repositories are checked" {
+  run "$SCRIPT" "$WORKSPACE"
+  [ "$status" -eq 0 ]
+
+  grep -q -- "--progress" "$ZENITY_LOG"
+  grep -q "^100$" "$ZENITY_LOG"
+  grep -q "# Checked 3 of 3" "$ZENITY_LOG"
+}
+
+@test "reports repositories that time out" {
+  cat <<'EOF' > "$TEST_DIR/git"
+#!/bin/bash
+if [[ "$*" == *"/dirty status"* ]]; then sleep 5; fi
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$TEST_DIR/git"
+
+  NEMO_GIT_TIMEOUT=1 run "$SCRIPT" "$WORKSPACE"
+  [ "$status" -eq 0 ]
+
+  run cat "$ZENITY_TEXT"
+  [[ "${lines[1]}" == ERROR*dirty*"timed out after 1s"* ]]
+}
+
+@test "shows full status for a single repository" {
+  run "$SCRIPT" "$WORKSPACE/dirty"
+  [ "$status" -eq 0 ]
+
+  [ "$(grep -c -- "--progress" "$ZENITY_LOG")" -eq 0 ]
+  grep -q "=== Git Status: dirty ===" "$ZENITY_TEXT"
+}
+
+@test "exits quietly when progress is cancelled" {
+  cat <<'EOF' > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock Cancel] $@" >> "$ZENITY_LOG"
+if [[ "$*" == *"--progress"* ]]; then
+  exit 1
+fi
+exit 0
+EOF
+  chmod +x "$TEST_DIR/zenity"
+
+  run "$SCRIPT" "$WORKSPACE"
+  [ "$status" -ne 0 ]
+  [ "$(grep -c -- "--text-info" "$ZENITY_LOG")" -eq 0 ]
+}
+
+@test "shows error when no repositories are found" {
+  mkdir "$TEST_DIR/empty"
+  run "$SCRIPT" "$TEST_DIR/empty"
+  [ "$status" -ne 0 ]
+  grep -q "Not a Git Repository" "$ZENITY_LOG"
+}
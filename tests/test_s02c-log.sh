@@ -0,0 +1,134 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  SCRIPT="$TEST_DIR/s02c-log.sh"
+  cp "$SOURCE_DIR/s02-read/s02c-log.sh" "$SCRIPT"
+  chmod +x "$SCRIPT"
+
+  # Zenity mock: saves each text-info page and answers with the next
+  # exit code from ZENITY_ANSWERS (default: close)
+  ZENITY_LOG="$TEST_DIR/zenity_log.txt"
+  ZENITY_PAGES="$TEST_DIR/pages"
+  export ZENITY_LOG ZENITY_PAGES
+  export PATH="$TEST_DIR:$PATH"
+  mkdir -p "$ZENITY_PAGES"
+
+  cat <<'EOF' > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock] $@" >> "$ZENITY_LOG"
+if [[ "$*" == *"--text-info"* ]]; then
+  page=$(ls "$ZENITY_PAGES" | wc -l)
+  cat > "$ZENITY_PAGES/$page"
+  read -r -a answers <<<"${ZENITY_ANSWERS:-1}"
+  exit "${answers[$page]:-1}"
+fi
+exit 0
+EOF
+  chmod +x "$TEST_DIR/zenity"
+
+  git config --global init.defaultBranch main
+  REPO="$TEST_DIR/repo"
+  git init -q "$REPO"
+  for i in 1 2 3 4 5; do
+    echo "$i" > "$REPO/file.txt"
+    git -C "$REPO" add file.txt
+    git -C "$REPO" commit -q -m "commit $i"
+    git -C "$REPO" tag "v$i"
+  done
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+@test "shows the whole log when it fits on one page" {
+  run "$SCRIPT" "$REPO"
+  [ "$status" -eq 0 ]
+
+  [ "$(ls "$ZENITY_PAGES" | wc -l)" -eq 1 ]
+  [ "$(grep -c "commit [0-9]" "$ZENITY_PAGES/0")" -eq 5 ]
+  grep -q "tag: v5" "$ZENITY_PAGES/0"
+  [ "$(tail -n 1 "$ZENITY_PAGES/0")" = "--- end of history ---" ]
+}
+
+@test "loads older commits a page at a time" {
+  NEMO_GIT_LOG_PAGE=2 ZENITY_ANSWERS="0 0 0" run "$SCRIPT" "$REPO"
+  [ "$status" -eq 0 ]
+
+  [ "$(ls "$ZENITY_PAGES" | wc -l)" -eq 3 ]
+  grep -q "commit 5" "$ZENITY_PAGES/0"
+  grep -q "commit 4" "$ZENITY_PAGES/0"
+  grep -q "commit 3" "$ZENITY_PAGES/1"
+  grep -q "commit 1" "$ZENITY_PAGES/2"
+  [ "$(grep -c "commit [0-9]" "$ZENITY_PAGES/1")" -eq 2 ]
+  [ "$(grep -c "end of history" "$ZENITY_PAGES/1")" -eq 0 ]
+  [ "$(grep -c "commit [0-9]" "$ZENITY_PAGES/2")" -eq 1 ]
+  grep -q "end of history" "$ZENITY_PAGES/2"
+}
+
+@test "does not load another page after the last one" {
+  NEMO_GIT_LOG_PAGE=5 ZENITY_ANSWERS="0 0" run "$SCRIPT" "$REPO"
+  [ "$status" -eq 0 ]
+
+  [ "$(ls "$ZENITY_PAGES" | wc -l)" -eq 1 ]
+  grep -q "end of history" "$ZENITY_PAGES/0"
+}
+
+@test "reads each page with one git log and no look-ahead walk" {
+  cat <<'EOF' > "$TEST_DIR/git"
+#!/bin/bash
+echo "$@" >> "$GIT_LOG"
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$TEST_DIR/git"
+  export GIT_LOG="$TEST_DIR/git_log.txt"
+
+  NEMO_GIT_LOG_PAGE=2 ZENITY_ANSWERS="0 1" run "$SCRIPT" "$REPO"
+  [ "$status" -eq 0 ]
+  [ "$(grep -c "^log" "$GIT_LOG")" -eq 2 ]
+  grep -q "^log .*--skip=0 -n 3" "$GIT_LOG"
+  grep -q "^log .*--skip=2 -n 3" "$GIT_LOG"
+}
+
+@test "stops paging when the viewer is closed" {
+  NEMO_GIT_LOG_PAGE=2 ZENITY_ANSWERS="1" run "$SCRIPT" "$REPO"
+  [ "$status" -eq 0 ]
+
+  [ "$(ls "$ZENITY_PAGES" | wc -l)" -eq 1 ]
+  grep -q -- "--ok-label=Older Commits" "$ZENITY_LOG"
+}
+
+@test "leaves the repository untouched by default" {
+  run "$SCRIPT" "$REPO"
+  [ "$status" -eq 0 ]
+
+  sleep 0.5
+  [ ! -e "$REPO/.git/objects/info/commit-graph" ]
+}
+
+@test "writes a missing commit-graph in the background when enabled" {
+  NEMO_GIT_LOG_COMMIT_GRAPH=1 run "$SCRIPT" "$REPO"
+  [ "$status" -eq 0 ]
+
+  for _ in $(seq 1 50); do
+    [ -e "$REPO/.git/objects/info/commit-graph" ] && break
+    sleep 0.1
+  done
+  [ -e "$REPO/.git/objects/info/commit-graph" ]
+}
+
+@test "shows an error for a repository without commits" {
+  git init -q "$TEST_DIR/empty"
+  run "$SCRIPT" "$TEST_DIR/empty"
+  [ "$status" -eq 1 ]
+  grep -q "Git Error" "$ZENITY_LOG"
+}
+
+@test "shows an error if the directory is not a git repository" {
+  mkdir "$TEST_DIR/plain"
+  run "$SCRIPT" "$TEST_DIR/plain"
+  [ "$status" -eq 1 ]
+  grep -q "Not a Git Repo" "$ZENITY_LOG"
+}
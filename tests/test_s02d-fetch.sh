@@ -0,0 +1,176 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  SCRIPT="$TEST_DIR/s02-read/s02d-fetch.sh"
+  mkdir -p "$TEST_DIR/s02-read"
+  cp "$SOURCE_DIR/s02-read/s02d-fetch.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
+  chmod +x "$SCRIPT"
+  export NEMO_GIT_REPO_CACHE_DIR="$TEST_DIR/repo-cache"
+
+  # Zenity mock: picks $ZENITY_CHOICE from lists, drains progress input
+  # and saves text-info contents
+  ZENITY_LOG="$TEST_DIR/zenity_log.txt"
+  ZENITY_TEXT="$TEST_DIR/zenity_text.txt"
+  export ZENITY_LOG ZENITY_TEXT
+  export PATH="$TEST_DIR:$PATH"
+
+  cat <<'EOF' > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock] $@" >> "$ZENITY_LOG"
+if [[ "$*" == *"--list"* ]]; then
+  cat > /dev/null
+  echo "$ZENITY_CHOICE"
+elif [[ "$*" == *"--progress"* ]]; then
+  cat >> "$ZENITY_LOG"
+elif [[ "$*" == *"--text-info"* ]]; then
+  for arg in "$@"; do
+    [[ "$arg" == --filename=* ]] && cat "${arg#--filename=}" > "$ZENITY_TEXT"
+  done
+elif [[ "$*" == *"--error"* ]]; then
+  exit 1
+fi
+exit 0
+EOF
+  chmod +x "$TEST_DIR/zenity"
+
+  git config --global init.defaultBranch main
+  WORKSPACE="$TEST_DIR/workspace"
+  mkdir -p "$WORKSPACE" "$TEST_DIR/remotes"
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+# Create a bare remote with one commit and a clone of it in the workspace
+make_clone() {
+  git init -q "$TEST_DIR/seed-$1"
+  echo "$1" > "$TEST_DIR/seed-$1/file.txt"
+  git -C "$TEST_DIR/seed-$1" add file.txt
+  git -C "$TEST_DIR/seed-$1" commit -q -m "initial"
+  git clone -q --bare "$TEST_DIR/seed-$1" "$TEST_DIR/remotes/$1.git"
+  git clone -q "$TEST_DIR/remotes/$1.git" "$WORKSPACE/$1"
+}
+
+# Add a commit to a remote through its seed repository
+advance_remote() {
+  echo "more" >> "$TEST_DIR/seed-$1/file.txt"
+  git -C "$TEST_DIR/seed-$1" commit -q -a -m "more"
+  git -C "$TEST_DIR/seed-$1" push -q "$TEST_DIR/remotes/$1.git" main
+}
+
+@test "fetches every repository under a folder" {
+  make_clone alpha
+  make_clone beta
+  make_clone gamma
+  advance_remote alpha
+  advance_remote gamma
+  git init -q "$WORKSPACE/local-only"
+
+  NEMO_GIT_JOBS=2 run "$SCRIPT" "$WORKSPACE"
+  [ "$status" -eq 0 ]
+
+  [ "$(git -C "$WORKSPACE/alpha" rev-parse origin/main)" = "$(git -C "$TEST_DIR/seed-alpha" rev-parse HEAD)" ]
+  [ "$(git -C "$WORKSPACE/gamma" rev-parse origin/main)" = "$(git -C "$TEST_DIR/seed-gamma" rev-parse HEAD)" ]
+
+  run cat "$ZENITY_TEXT"
+  [[ "${lines[0]}" == "4 repositories: 3 fetched, 1 without remotes" ]]
+  [[ "$output" == *"OK     alpha"*"1 refs updated"* ]]
+  [[ "$output" == *"OK     beta"*"up to date"* ]]
+  [[ "$output" == *"SKIP   local-only"*"no remotes"* ]]
+  grep -q "# Fetched 4 of 4" "$ZENITY_LOG"
+}
+
+@test "shares the job budget between repositories and their remotes" {
+  make_clone alpha
+  make_clone beta
+  GIT_LOG="$TEST_DIR/git_log.txt"
+  export GIT_LOG
+
+  cat <<'EOF' > "$TEST_DIR/git"
+#!/bin/bash
+echo "$@" >> "$GIT_LOG"
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$TEST_DIR/git"
+
+  NEMO_GIT_JOBS=4 run "$SCRIPT" "$WORKSPACE"
+  [ "$status" -eq 0 ]
+  [ "$(grep -c -- "fetch --all --jobs=2" "$GIT_LOG")" -eq 2 ]
+
+  : > "$GIT_LOG"
+  NEMO_GIT_JOBS=1 run "$SCRIPT" "$WORKSPACE"
+  [ "$(grep -c -- "fetch --all --jobs=1" "$GIT_LOG")" -eq 2 ]
+}
+
+@test "reports failed and timed out repositories" {
+  make_clone alpha
+  make_clone broken
+  make_clone slow
+  git -C "$WORKSPACE/broken" remote set-url origin "$TEST_DIR/remotes/missing.git"
+
+  cat <<'EOF' > "$TEST_DIR/git"
+#!/bin/bash
+if [[ "$*" == *"/slow fetch"* ]]; then sleep 5; fi
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$TEST_DIR/git"
+
+  NEMO_GIT_FETCH_TIMEOUT=1 run "$SCRIPT" "$WORKSPACE"
+  [ "$status" -eq 1 ]
+
+  run cat "$ZENITY_TEXT"
+  [[ "${lines[0]}" == "3 repositories: 1 fetched, 2 failed" ]]
+  [[ "${lines[1]}" == FAIL*broken* ]]
+  [[ "${lines[2]}" == FAIL*slow*"timed out after 1s" ]]
+}
+
+@test "prunes deleted remote branches when asked" {
+  make_clone alpha
+  git -C "$TEST_DIR/seed-alpha" push -q "$TEST_DIR/remotes/alpha.git" main:gone
+  git -C "$WORKSPACE/alpha" fetch -q
+  git -C "$TEST_DIR/remotes/alpha.git" branch -q -D gone
+
+  NEMO_GIT_FETCH_PRUNE=1 run "$SCRIPT" "$WORKSPACE"
+  [ "$status" -eq 0 ]
+  run git -C "$WORKSPACE/alpha" rev-parse -q --verify origin/gone
+  [ "$status" -ne 0 ]
+}
+
+@test "fetches all remotes of a repository with progress" {
+  make_clone alpha
+  make_clone beta
+  git -C "$WORKSPACE/alpha" remote add other "$TEST_DIR/remotes/beta.git"
+  advance_remote alpha
+
+  ZENITY_CHOICE="All remotes" run "$SCRIPT" "$WORKSPACE/alpha"
+  [ "$status" -eq 0 ]
+
+  [ "$(git -C "$WORKSPACE/alpha" rev-parse origin/main)" = "$(git -C "$TEST_DIR/seed-alpha" rev-parse HEAD)" ]
+  git -C "$WORKSPACE/alpha" rev-parse -q --verify other/main
+  grep -q -- "--progress" "$ZENITY_LOG"
+  grep -q "^# Fetching other" "$ZENITY_LOG"
+  grep -q "Fetch Complete" "$ZENITY_LOG"
+}
+
+@test "fetches the chosen remote of a repository" {
+  make_clone alpha
+  advance_remote alpha
+
+  ZENITY_CHOICE="origin" run "$SCRIPT" "$WORKSPACE/alpha"
+  [ "$status" -eq 0 ]
+
+  [ "$(git -C "$WORKSPACE/alpha" rev-parse origin/main)" = "$(git -C "$TEST_DIR/seed-alpha" rev-parse HEAD)" ]
+  [ "$(grep -c "All remotes" "$ZENITY_LOG")" -eq 0 ]
+  grep -q "Fetched from 'origin' successfully" "$ZENITY_LOG"
+}
+
+@test "shows an error when no repository is found" {
+  mkdir -p "$WORKSPACE/empty"
+  run "$SCRIPT" "$WORKSPACE/empty"
+  [ "$status" -eq 1 ]
+  grep -q "Not a Git Repo" "$ZENITY_LOG"
+}
@@ -3,9 +3,12 @@
 setup() {
   TEST_DIR=$(mktemp -d)
   SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
-  SCRIPT="$TEST_DIR/s03a-pull.sh"
+  SCRIPT="$TEST_DIR/s03-update/s03a-pull.sh"
+  mkdir -p "$TEST_DIR/s03-update"
   cp "$SOURCE_DIR/s03-update/s03a-pull.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
   chmod +x "$SCRIPT"
+  source "$TEST_DIR/lib/repos.sh"
 
   # Create a mock zenity
   export PATH="$TEST_DIR:$PATH"
@@ -34,7 +37,32 @@ EOF
 }
 
 teardown() {
-  rm -rf "$TEST_DIR" "$REMOTE_REPO"
+  for repo in "$TEST_DIR" "$TEST_DIR"/repos/*; do
+    rm -rf "$(repo_state_dir pull "$repo")"
+  done
+  rm -rf "$TEST_DIR" "$REMOTE_REPO" "$UPSTREAM_DIR" "$WRAPPER_DIR"
+}
+
+# Push a new commit to the remote from a separate clone
+push_upstream_change() {
+  UPSTREAM_DIR=$(mktemp -d)
+  git clone -q "$1" "$UPSTREAM_DIR/clone"
+  echo "$2" > "$UPSTREAM_DIR/clone/$2.txt"
+  git -C "$UPSTREAM_DIR/clone" add .
+  git -C "$UPSTREAM_DIR/clone" commit -q -m "$2"
+  git -C "$UPSTREAM_DIR/clone" push -q
+  rm -rf "$UPSTREAM_DIR"
+}
+
+# Make a repository in the test directory tracking its own bare remote
+make_tracked_repo() {
+  git init -q --bare "$TEST_DIR/remotes/$1.git"
+  git init -q "$TEST_DIR/repos/$1"
+  echo "$1" > "$TEST_DIR/repos/$1/file.txt"
+  git -C "$TEST_DIR/repos/$1" add file.txt
+  git -C "$TEST_DIR/repos/$1" commit -q -m "initial"
+  git -C "$TEST_DIR/repos/$1" remote add origin "$TEST_DIR/remotes/$1.git"
+  git -C "$TEST_DIR/repos/$1" push -q -u origin main
 }
 
 @test "s03a-pull.sh pulls latest changes with rebase" {
@@ -48,3 +76,97 @@ teardown() {
   grep -q "pull --rebase" "$ZENITY_LOG" || true  # Optional, since it's a script echo not a direct command
   grep -q "Git Pull Successful" "$ZENITY_LOG"
 }
+
+@test "fetches once and rebases local commits onto the upstream" {
+  push_upstream_change "$REMOTE_REPO" upstream
+  echo "local" > local.txt
+  git add local.txt
+  git commit -q -m "local"
+  echo "uncommitted" >> file.txt
+
+  # The git wrapper lives outside the repository so stashing leaves it alone
+  WRAPPER_DIR=$(mktemp -d)
+  cat <<'EOF' > "$WRAPPER_DIR/git"
+#!/bin/bash
+for arg in "$@"; do
+  case "$arg" in fetch|pull) echo "$arg" >> "$GIT_LOG"; break ;; esac
+done
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$WRAPPER_DIR/git"
+  export PATH="$WRAPPER_DIR:$PATH"
+  export GIT_LOG="$WRAPPER_DIR/git_log.txt"
+
+  run "$SCRIPT" "$TEST_DIR"
+  [ "$status" -eq 0 ]
+
+  [ "$(cat "$GIT_LOG")" = "fetch" ]
+  [ -f upstream.txt ]
+  [ "$(git log -1 --format=%s)" = "local" ]
+  [ "$(git rev-parse HEAD~1)" = "$(git rev-parse origin/main)" ]
+  grep -q "uncommitted" file.txt
+  grep -q "Git Pull Successful.*with 1 new commits from origin/main" "$ZENITY_LOG"
+}
+
+@test "keeps undo state per repository" {
+  make_tracked_repo alpha
+  make_tracked_repo beta
+
+  run "$SCRIPT" "$TEST_DIR/repos" "$TEST_DIR/repos/alpha" "$TEST_DIR/repos/beta"
+  [ "$status" -eq 0 ]
+
+  for name in alpha beta; do
+    state=$(repo_state_dir pull "$TEST_DIR/repos/$name")
+    [ "$(cat "$state/head_before_pull")" = "$(git -C "$TEST_DIR/repos/$name" rev-parse HEAD)" ]
+    [ "$(cat "$state/was_stashed")" = "false" ]
+  done
+}
+
+@test "pulls selected repositories in parallel with a combined result" {
+  for name in alpha beta gamma; do
+    make_tracked_repo "$name"
+  done
+  push_upstream_change "$TEST_DIR/remotes/alpha.git" news
+  push_upstream_change "$TEST_DIR/remotes/gamma.git" news
+  git -C "$TEST_DIR/repos/beta" branch -q --unset-upstream
+
+  NEMO_GIT_JOBS=3 run "$SCRIPT" "$TEST_DIR/repos" "$TEST_DIR"/repos/*
+  [ "$status" -eq 1 ]
+
+  [ -f "$TEST_DIR/repos/alpha/news.txt" ]
+  [ -f "$TEST_DIR/repos/gamma/news.txt" ]
+  grep -q "Git Pull Error.*1 of 3 repositories failed" "$ZENITY_LOG"
+  grep -q "beta: FAILED.*No upstream branch" "$ZENITY_LOG"
+  [ "$(grep -c -- "--info\|--error" "$ZENITY_LOG")" -eq 1 ]
+}
+
+@test "never prompts for credentials when pulling several repositories" {
+  make_tracked_repo alpha
+  make_tracked_repo beta
+  git -C "$TEST_DIR/repos/beta" remote set-url origin "$TEST_DIR/remotes/missing.git"
+
+  WRAPPER_DIR=$(mktemp -d)
+  cat <<'EOF' > "$WRAPPER_DIR/git"
+#!/bin/bash
+for arg in "$@"; do
+  case "$arg" in fetch) echo "prompt=${GIT_TERMINAL_PROMPT-unset}" >> "$GIT_LOG"; break ;; esac
+done
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$WRAPPER_DIR/git"
+  export PATH="$WRAPPER_DIR:$PATH"
+  export GIT_LOG="$WRAPPER_DIR/git_log.txt"
+
+  run "$SCRIPT" "$TEST_DIR/repos" "$TEST_DIR/repos/alpha" "$TEST_DIR/repos/beta"
+  [ "$status" -eq 1 ]
+
+  [ "$(sort -u "$GIT_LOG")" = "prompt=0" ]
+  # The failed repository is named and its error listed first
+  grep -qF 'failed to pull: beta\n\nbeta: FAILED' "$ZENITY_LOG"
+
+  # A single repository still lets git ask
+  rm "$GIT_LOG"
+  run "$SCRIPT" "$TEST_DIR/repos/alpha"
+  [ "$status" -eq 0 ]
+  [ "$(cat "$GIT_LOG")" = "prompt=unset" ]
+}
@@ -0,0 +1,120 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  SCRIPT="$TEST_DIR/s03-update/s03b-add-enhanced.sh"
+  mkdir -p "$TEST_DIR/s03-update"
+  cp "$SOURCE_DIR/s03-update/s03b-add-enhanced.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
+  chmod +x "$SCRIPT"
+  export NEMO_GIT_REPO_CACHE_DIR="$TEST_DIR/repo-cache"
+
+  # Zenity mock with log
+  ZENITY_LOG="$TEST_DIR/zenity_log.txt"
+  export ZENITY_LOG
+  export PATH="$TEST_DIR:$PATH"
+
+  cat <<'EOF2' > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock] $@" >> "$ZENITY_LOG"
+if [[ "$*" == *"--error"* ]]; then
+  exit 1
+fi
+exit 0
+EOF2
+  chmod +x "$TEST_DIR/zenity"
+
+  # Git wrapper that logs every add invocation
+  GIT_LOG="$TEST_DIR/git_log.txt"
+  export GIT_LOG
+  cat <<'EOF2' > "$TEST_DIR/git"
+#!/bin/bash
+for arg in "$@"; do
+  [ "$arg" = "add" ] && echo "$*" >> "$GIT_LOG" && break
+done
+exec /usr/bin/git "$@"
+EOF2
+  chmod +x "$TEST_DIR/git"
+
+  git config --global init.defaultBranch main
+  WORKSPACE="$TEST_DIR/workspace"
+  for name in one two; do
+    git init -q "$WORKSPACE/$name"
+    echo "content" > "$WORKSPACE/$name/tracked.txt"
+    /usr/bin/git -C "$WORKSPACE/$name" add tracked.txt
+    /usr/bin/git -C "$WORKSPACE/$name" commit -q -m "initial"
+  done
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+@test "stages files across repositories with one git add each" {
+  mkdir -p "$WORKSPACE/one/sub"
+  for i in 1 2 3; do
+    touch "$WORKSPACE/one/new$i.txt" "$WORKSPACE/two/new$i.txt"
+  done
+  touch "$WORKSPACE/one/sub/deep.txt"
+
+  run "$SCRIPT" "$WORKSPACE" "$WORKSPACE"/one/new*.txt "$WORKSPACE/one/sub/deep.txt" \
+    "$WORKSPACE"/two/new*.txt
+  [ "$status" -eq 0 ]
+
+  run git -C "$WORKSPACE/one" diff --cached --name-only
+  [ "${#lines[@]}" -eq 4 ]
+  [[ "$output" == *"sub/deep.txt"* ]]
+  run git -C "$WORKSPACE/two" diff --cached --name-only
+  [ "${#lines[@]}" -eq 3 ]
+
+  [ "$(wc -l < "$GIT_LOG")" -eq 2 ]
+  grep -q -- "--question.*Add 7 selected files" "$ZENITY_LOG"
+}
+
+@test "stages paths containing spaces and glob characters" {
+  touch "$WORKSPACE/one/with space.txt" "$WORKSPACE/one/star*.txt" "$WORKSPACE/one/stars.txt"
+
+  run "$SCRIPT" "$WORKSPACE" "$WORKSPACE/one/with space.txt" "$WORKSPACE/one/star*.txt"
+  [ "$status" -eq 0 ]
+
+  run git -C "$WORKSPACE/one" diff --cached --name-only
+  [ "${#lines[@]}" -eq 2 ]
+  [[ "$output" == *"with space.txt"* ]]
+  [[ "$output" != *"stars.txt"* ]]
+}
+
+@test "reports the files that could not be staged" {
+  touch "$WORKSPACE/one/good.txt"
+  mkdir -p "$WORKSPACE/one/locked"
+  touch "$WORKSPACE/one/locked/bad.txt"
+  echo "locked/bad.txt" > "$WORKSPACE/one/.git/info/exclude"
+
+  run "$SCRIPT" "$WORKSPACE" "$WORKSPACE/one/good.txt" "$WORKSPACE/one/locked/bad.txt"
+  [ "$status" -eq 0 ]
+
+  run git -C "$WORKSPACE/one" diff --cached --name-only
+  [ "$output" = "good.txt" ]
+  grep -q "Failed to add: locked/bad.txt" "$ZENITY_LOG"
+}
+
+@test "warns about files outside any repository" {
+  touch "$WORKSPACE/loose.txt" "$WORKSPACE/one/new.txt"
+
+  run "$SCRIPT" "$WORKSPACE" "$WORKSPACE/loose.txt" "$WORKSPACE/one/new.txt"
+  [ "$status" -eq 0 ]
+
+  grep -q -- "--warning.*loose.txt: Not in a git repository" "$ZENITY_LOG"
+  run git -C "$WORKSPACE/one" diff --cached --name-only
+  [ "$output" = "new.txt" ]
+}
+
+@test "lists a count instead of names for large selections" {
+  mkdir -p "$WORKSPACE/one/many"
+  for i in $(seq 1 30); do touch "$WORKSPACE/one/many/file$i.txt"; done
+
+  run "$SCRIPT" "$WORKSPACE" "$WORKSPACE"/one/many/*.txt
+  [ "$status" -eq 0 ]
+
+  grep -q "Successfully staged 30 files" "$ZENITY_LOG"
+}
@@ -0,0 +1,110 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  SCRIPT="$TEST_DIR/s03-update/s03c-commit-enhanced.sh"
+  mkdir -p "$TEST_DIR/s03-update"
+  cp "$SOURCE_DIR/s03-update/s03c-commit-enhanced.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
+  chmod +x "$SCRIPT"
+  export NEMO_GIT_REPO_CACHE_DIR="$TEST_DIR/repo-cache"
+
+  # Zenity mock with log; the entry dialog answers with a fixed message
+  ZENITY_LOG="$TEST_DIR/zenity_log.txt"
+  export ZENITY_LOG
+  export PATH="$TEST_DIR:$PATH"
+
+  cat <<'EOF2' > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock] $@" >> "$ZENITY_LOG"
+if [[ "$*" == *"--entry"* ]]; then
+  echo "${ZENITY_ENTRY-Coordinated change}"
+elif [[ "$*" == *"--error"* ]]; then
+  exit 1
+fi
+exit 0
+EOF2
+  chmod +x "$TEST_DIR/zenity"
+
+  # Git wrapper that logs add and commit invocations
+  GIT_LOG="$TEST_DIR/git_log.txt"
+  export GIT_LOG
+  cat <<'EOF2' > "$TEST_DIR/git"
+#!/bin/bash
+for arg in "$@"; do
+  case "$arg" in
+    add|commit) echo "$arg" >> "$GIT_LOG"; break ;;
+  esac
+done
+exec /usr/bin/git "$@"
+EOF2
+  chmod +x "$TEST_DIR/git"
+
+  git config --global init.defaultBranch main
+  WORKSPACE="$TEST_DIR/workspace"
+  for name in one two three; do
+    git init -q "$WORKSPACE/$name"
+    echo "content" > "$WORKSPACE/$name/tracked.txt"
+    /usr/bin/git -C "$WORKSPACE/$name" add tracked.txt
+    /usr/bin/git -C "$WORKSPACE/$name" commit -q -m "initial"
+  done
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+@test "commits every repository with one message prompt" {
+  for name in one two three; do
+    echo "change" >> "$WORKSPACE/$name/tracked.txt"
+    touch "$WORKSPACE/$name/new file.txt"
+  done
+
+  NEMO_GIT_JOBS=2 run "$SCRIPT" "$WORKSPACE" \
+    "$WORKSPACE"/*/tracked.txt "$WORKSPACE"/*/"new file.txt"
+  [ "$status" -eq 0 ]
+
+  for name in one two three; do
+    [ "$(/usr/bin/git -C "$WORKSPACE/$name" log -1 --format=%s)" = "Coordinated change" ]
+    [ -z "$(/usr/bin/git -C "$WORKSPACE/$name" status --porcelain)" ]
+  done
+
+  [ "$(grep -c -- "--entry" "$ZENITY_LOG")" -eq 1 ]
+  grep -q -- "--entry.*6 files in 3 repositories" "$ZENITY_LOG"
+  [ "$(grep -c '^add$' "$GIT_LOG")" -eq 3 ]
+  [ "$(grep -c '^commit$' "$GIT_LOG")" -eq 3 ]
+}
+
+@test "reports repositories with nothing to commit" {
+  echo "change" >> "$WORKSPACE/one/tracked.txt"
+
+  run "$SCRIPT" "$WORKSPACE" "$WORKSPACE/one/tracked.txt" "$WORKSPACE/two/tracked.txt"
+  [ "$status" -eq 0 ]
+
+  [ "$(/usr/bin/git -C "$WORKSPACE/one" log -1 --format=%s)" = "Coordinated change" ]
+  [ "$(/usr/bin/git -C "$WORKSPACE/two" log -1 --format=%s)" = "initial" ]
+  grep -q "Successfully committed: tracked.txt" "$ZENITY_LOG"
+  grep -q "Commit failed" "$ZENITY_LOG"
+}
+
+@test "aborts without committing when the message is empty" {
+  echo "change" >> "$WORKSPACE/one/tracked.txt"
+
+  ZENITY_ENTRY="" run "$SCRIPT" "$WORKSPACE" "$WORKSPACE/one/tracked.txt"
+  [ "$status" -eq 1 ]
+
+  [ "$(/usr/bin/git -C "$WORKSPACE/one" log -1 --format=%s)" = "initial" ]
+  [ ! -e "$GIT_LOG" ]
+}
+
+@test "warns about files outside any repository" {
+  touch "$WORKSPACE/loose.txt"
+  echo "change" >> "$WORKSPACE/two/tracked.txt"
+
+  run "$SCRIPT" "$WORKSPACE" "$WORKSPACE/loose.txt" "$WORKSPACE/two/tracked.txt"
+  [ "$status" -eq 0 ]
+
+  grep -q -- "--warning.*loose.txt: Not in a git repository" "$ZENITY_LOG"
+  [ "$(/usr/bin/git -C "$WORKSPACE/two" log -1 --format=%s)" = "Coordinated change" ]
+}
@@ -0,0 +1,182 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  SCRIPT="$TEST_DIR/s03-update/s03d-push.sh"
+  mkdir -p "$TEST_DIR/s03-update"
+  cp "$SOURCE_DIR/s03-update/s03d-push.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
+  chmod +x "$SCRIPT"
+  export NEMO_GIT_REPO_CACHE_DIR="$TEST_DIR/repo-cache"
+
+  # Create a mock zenity
+  export PATH="$TEST_DIR:$PATH"
+  ZENITY_LOG="$TEST_DIR/zenity_log.txt"
+  cat <<MOCK > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock] \$@" >> "$ZENITY_LOG"
+# Let progress dialogs read their input to the end
+if [[ "\$*" == *"--progress"* ]]; then cat > /dev/null; fi
+exit 0
+MOCK
+  chmod +x "$TEST_DIR/zenity"
+
+  git config --global init.defaultBranch main
+  mkdir -p "$TEST_DIR/repos" "$TEST_DIR/remotes"
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+# Make a repository tracking its own bare remote
+make_tracked_repo() {
+  git init -q --bare "$TEST_DIR/remotes/$1.git"
+  git init -q "$TEST_DIR/repos/$1"
+  echo "$1" > "$TEST_DIR/repos/$1/file.txt"
+  git -C "$TEST_DIR/repos/$1" add file.txt
+  git -C "$TEST_DIR/repos/$1" commit -q -m "initial"
+  git -C "$TEST_DIR/repos/$1" remote add origin "$TEST_DIR/remotes/$1.git"
+  git -C "$TEST_DIR/repos/$1" push -q -u origin main
+}
+
+# Add a local commit to a repository
+commit_in() {
+  echo "$2" >> "$TEST_DIR/repos/$1/file.txt"
+  git -C "$TEST_DIR/repos/$1" commit -q -am "$2"
+}
+
+@test "pushes from a linked worktree" {
+  make_tracked_repo main-tree
+  git -C "$TEST_DIR/repos/main-tree" worktree add -q -b work "$TEST_DIR/repos/linked"
+  git -C "$TEST_DIR/repos/linked" push -q -u origin work
+  echo "more" >> "$TEST_DIR/repos/linked/file.txt"
+  git -C "$TEST_DIR/repos/linked" commit -q -am "more"
+
+  run "$SCRIPT" "$TEST_DIR/repos/linked"
+
+  [ "$status" -eq 0 ]
+  grep -q "Push Successful" "$ZENITY_LOG"
+  [ "$(git -C "$TEST_DIR/remotes/main-tree.git" rev-parse work)" = "$(git -C "$TEST_DIR/repos/linked" rev-parse HEAD)" ]
+}
+
+@test "pushes the current repository to its upstream" {
+  make_tracked_repo single
+  commit_in single "change"
+
+  run "$SCRIPT" "$TEST_DIR/repos/single"
+
+  [ "$status" -eq 0 ]
+  grep -q "Push Successful" "$ZENITY_LOG"
+  [ "$(git -C "$TEST_DIR/remotes/single.git" rev-parse main)" = "$(git -C "$TEST_DIR/repos/single" rev-parse HEAD)" ]
+}
+
+@test "sets the upstream of a branch that has none" {
+  make_tracked_repo single
+  git -C "$TEST_DIR/repos/single" checkout -q -b feature
+  commit_in single "feature"
+
+  run "$SCRIPT" "$TEST_DIR/repos/single"
+
+  [ "$status" -eq 0 ]
+  grep -q "pushed and upstream set" "$ZENITY_LOG"
+  [ "$(git -C "$TEST_DIR/repos/single" rev-parse --abbrev-ref "feature@{upstream}")" = "origin/feature" ]
+}
+
+@test "pushes selected repositories with commits and skips the rest" {
+  make_tracked_repo ahead
+  make_tracked_repo current
+  make_tracked_repo untracked
+  commit_in ahead "one"
+  commit_in ahead "two"
+  git -C "$TEST_DIR/repos/untracked" checkout -q -b local-only
+  commit_in untracked "local"
+
+  run "$SCRIPT" "$TEST_DIR/repos" "$TEST_DIR/repos/ahead" "$TEST_DIR/repos/current" "$TEST_DIR/repos/untracked"
+
+  [ "$status" -eq 0 ]
+  grep -q "Pushed 1 of 3 repositories" "$ZENITY_LOG"
+  grep -q "ahead: pushed 2 commits to 'origin/main'" "$ZENITY_LOG"
+  grep -q "current: nothing to push" "$ZENITY_LOG"
+  grep -q "untracked: no upstream for 'local-only'" "$ZENITY_LOG"
+  [ "$(git -C "$TEST_DIR/remotes/ahead.git" rev-parse main)" = "$(git -C "$TEST_DIR/repos/ahead" rev-parse HEAD)" ]
+  [ "$(git -C "$TEST_DIR/repos/untracked" ls-remote origin local-only | wc -l)" -eq 0 ]
+}
+
+@test "pushes to an upstream branch with a different name" {
+  make_tracked_repo one
+  make_tracked_repo two
+  git -C "$TEST_DIR/repos/one" checkout -q -b work --track origin/main
+  commit_in one "work"
+  commit_in two "change"
+
+  run "$SCRIPT" "$TEST_DIR/repos" "$TEST_DIR/repos/one" "$TEST_DIR/repos/two"
+
+  [ "$status" -eq 0 ]
+  grep -q "Pushed 2 of 2 repositories" "$ZENITY_LOG"
+  [ "$(git -C "$TEST_DIR/remotes/one.git" rev-parse main)" = "$(git -C "$TEST_DIR/repos/one" rev-parse work)" ]
+  [ "$(git -C "$TEST_DIR/remotes/one.git" branch --list work | wc -l)" -eq 0 ]
+}
+
+@test "reports repositories whose push was rejected" {
+  make_tracked_repo good
+  make_tracked_repo stale
+  commit_in good "change"
+  commit_in stale "local"
+  # Move the remote on without the repository noticing
+  git clone -q "$TEST_DIR/remotes/stale.git" "$TEST_DIR/other"
+  git -C "$TEST_DIR/other" commit -q --allow-empty -m "elsewhere"
+  git -C "$TEST_DIR/other" push -q
+
+  run "$SCRIPT" "$TEST_DIR/repos" "$TEST_DIR/repos/good" "$TEST_DIR/repos/stale"
+
+  [ "$status" -eq 1 ]
+  grep -q "1 of 2 repositories failed to push" "$ZENITY_LOG"
+  grep -q "stale: FAILED" "$ZENITY_LOG"
+  [ "$(git -C "$TEST_DIR/remotes/good.git" rev-parse main)" = "$(git -C "$TEST_DIR/repos/good" rev-parse HEAD)" ]
+}
+
+@test "never prompts for credentials when pushing several repositories" {
+  make_tracked_repo good
+  make_tracked_repo lost
+  commit_in good "change"
+  commit_in lost "change"
+  git -C "$TEST_DIR/repos/lost" remote set-url origin "$TEST_DIR/remotes/missing.git"
+
+  WRAPPER_DIR="$TEST_DIR/wrapper"
+  mkdir -p "$WRAPPER_DIR"
+  cat <<'EOF' > "$WRAPPER_DIR/git"
+#!/bin/bash
+for arg in "$@"; do
+  case "$arg" in push) echo "prompt=${GIT_TERMINAL_PROMPT-unset}" >> "$GIT_LOG"; break ;; esac
+done
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$WRAPPER_DIR/git"
+  export PATH="$WRAPPER_DIR:$PATH"
+  export GIT_LOG="$WRAPPER_DIR/git_log.txt"
+
+  run "$SCRIPT" "$TEST_DIR/repos" "$TEST_DIR/repos/good" "$TEST_DIR/repos/lost"
+  [ "$status" -eq 1 ]
+
+  [ "$(sort -u "$GIT_LOG")" = "prompt=0" ]
+  # The failed repository is named and its error listed first
+  grep -qF 'failed to push: lost\n\nlost: FAILED' "$ZENITY_LOG"
+}
+
+@test "skips repositories behind their upstream and reports nothing to push" {
+  make_tracked_repo behind
+  make_tracked_repo current
+  commit_in behind "local"
+  git clone -q "$TEST_DIR/remotes/behind.git" "$TEST_DIR/other"
+  git -C "$TEST_DIR/other" commit -q --allow-empty -m "elsewhere"
+  git -C "$TEST_DIR/other" push -q
+  git -C "$TEST_DIR/repos/behind" fetch -q
+
+  run "$SCRIPT" "$TEST_DIR/repos" "$TEST_DIR/repos/behind" "$TEST_DIR/repos/current"
+
+  [ "$status" -eq 0 ]
+  grep -q "Nothing to Push" "$ZENITY_LOG"
+  grep -q "behind: 'main' is 1 commits behind 'origin/main'; pull first" "$ZENITY_LOG"
+}
@@ -3,9 +3,12 @@
 setup() {
   TEST_DIR=$(mktemp -d)
   SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
-  SCRIPT="$TEST_DIR/s04a-reset.sh"
+  SCRIPT="$TEST_DIR/s04-delete/s04a-reset.sh"
+  mkdir -p "$TEST_DIR/s04-delete"
   cp "$SOURCE_DIR/s04-delete/s04a-reset.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
   chmod +x "$SCRIPT"
+  export NEMO_GIT_REPO_CACHE_DIR="$TEST_DIR/repo-cache"
 
   # Zenity mock
   ZENITY_LOG="$TEST_DIR/zenity_log.txt"
@@ -84,3 +87,42 @@ EOF
   run grep -- "Reset Cancelled" "$ZENITY_LOG"
 }
 
+@test "restores files across repositories with one restore each" {
+  for name in one two; do
+    git init -q "$TEST_DIR/$name"
+    echo "original" > "$TEST_DIR/$name/a file.txt"
+    echo "original" > "$TEST_DIR/$name/b.txt"
+    git -C "$TEST_DIR/$name" add .
+    git -C "$TEST_DIR/$name" commit -q -m "initial"
+    echo "edited" > "$TEST_DIR/$name/a file.txt"
+    echo "edited" > "$TEST_DIR/$name/b.txt"
+  done
+
+  cat <<'EOF' > "$TEST_DIR/git"
+#!/bin/bash
+[[ " $* " == *" restore "* ]] && echo "$*" >> "$TEST_DIR/git_log.txt"
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$TEST_DIR/git"
+  export TEST_DIR
+
+  run "$SCRIPT" "$TEST_DIR" one/"a file.txt" one/b.txt two/"a file.txt" two/b.txt
+  [ "$status" -eq 0 ]
+
+  for name in one two; do
+    [ "$(cat "$TEST_DIR/$name/a file.txt")" = "original" ]
+    [ "$(cat "$TEST_DIR/$name/b.txt")" = "original" ]
+  done
+  [ "$(wc -l < "$TEST_DIR/git_log.txt")" -eq 2 ]
+  grep -q -- "Restore Complete" "$ZENITY_LOG"
+}
+
+@test "names files that could not be restored" {
+  touch untracked.txt
+
+  run "$SCRIPT" "$TEST_DIR" "tracked.txt" "untracked.txt"
+
+  run cat tracked.txt
+  [ "$output" = "original" ]
+  grep -q -- "Restore Incomplete.*untracked.txt" "$ZENITY_LOG"
+}
@@ -2,9 +2,11 @@
 
 setup() {
   TEST_DIR=$(mktemp -d)
-  SCRIPT="$TEST_DIR/s04e-unpull.sh"
+  SCRIPT="$TEST_DIR/s04-delete/s04e-unpull.sh"
   SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  mkdir -p "$TEST_DIR/s04-delete"
   cp "$SOURCE_DIR/s04-delete/s04e-unpull.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
   chmod +x "$SCRIPT"
 
   cd "$TEST_DIR"
@@ -15,6 +17,8 @@ setup() {
 
   export HOME="$TEST_DIR"
   mkdir -p "$HOME/.cache"
+  source "$TEST_DIR/lib/repos.sh"
+  STATE_DIR=$(repo_state_dir pull "$TEST_DIR")
 
   # Zenity mock logs messages to file
   export ZENITY_LOG="$TEST_DIR/zenity_log.txt"
@@ -52,8 +56,8 @@ teardown() {
 }
 
 @test "fails if pull HEAD state file missing" {
-  mkdir -p "$HOME/.cache/nemo_git_pull_state"
-  echo "true" > "$HOME/.cache/nemo_git_pull_state/was_stashed"
+  mkdir -p "$STATE_DIR"
+  echo "true" > "$STATE_DIR/was_stashed"
   # no head_before_pull file
   run "$SCRIPT" "$TEST_DIR"
   [ "$status" -eq 1 ]
@@ -61,9 +65,9 @@ teardown() {
 }
 
 @test "exits cleanly if no pull to undo (HEAD matches)" {
-  mkdir -p "$HOME/.cache/nemo_git_pull_state"
-  git rev-parse HEAD > "$HOME/.cache/nemo_git_pull_state/head_before_pull"
-  echo "false" > "$HOME/.cache/nemo_git_pull_state/was_stashed"
+  mkdir -p "$STATE_DIR"
+  git rev-parse HEAD > "$STATE_DIR/head_before_pull"
+  echo "false" > "$STATE_DIR/was_stashed"
 
   run "$SCRIPT" "$TEST_DIR"
   [ "$status" -eq 0 ]
@@ -71,10 +75,10 @@ teardown() {
 }
 
 @test "successful reset without stash" {
-  mkdir -p "$HOME/.cache/nemo_git_pull_state"
+  mkdir -p "$STATE_DIR"
   ORIGINAL_HEAD=$(git rev-parse HEAD)
-  echo "$ORIGINAL_HEAD" > "$HOME/.cache/nemo_git_pull_state/head_before_pull"
-  echo "false" > "$HOME/.cache/nemo_git_pull_state/was_stashed"
+  echo "$ORIGINAL_HEAD" > "$STATE_DIR/head_before_pull"
+  echo "false" > "$STATE_DIR/was_stashed"
 
   # Make a new commit to simulate pull changed HEAD
   echo "change" > file.txt
@@ -88,3 +92,25 @@ teardown() {
   [ "$output" = "$ORIGINAL_HEAD" ]
   grep -q "Unpull Success" "$ZENITY_LOG"
 }
+
+@test "reapplies the recorded stash after undoing" {
+  ORIGINAL_HEAD=$(git rev-parse HEAD)
+  echo "local edit" >> file.txt
+  git stash push -q
+  mkdir -p "$STATE_DIR"
+  echo "$ORIGINAL_HEAD" > "$STATE_DIR/head_before_pull"
+  echo "true" > "$STATE_DIR/was_stashed"
+  git rev-parse stash@{0} > "$STATE_DIR/stash_commit"
+  git stash drop -q
+
+  echo "pulled" > other.txt
+  git add other.txt
+  git commit -m "pulled" > /dev/null
+
+  run "$SCRIPT" "$TEST_DIR"
+  [ "$status" -eq 0 ]
+  [ "$(git rev-parse HEAD)" = "$ORIGINAL_HEAD" ]
+  grep -q "local edit" file.txt
+  grep -q "restored stash" "$ZENITY_LOG"
+  [ ! -d "$STATE_DIR" ]
+}
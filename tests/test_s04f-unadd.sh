@@ -0,0 +1,99 @@
+#!/usr/bin/env bats
+
+setup() {
+  TEST_DIR=$(mktemp -d)
+  SOURCE_DIR="${BATS_TEST_DIRNAME}/../nemo-git-integration"
+  SCRIPT="$TEST_DIR/s04-delete/s04f-unadd.sh"
+  mkdir -p "$TEST_DIR/s04-delete"
+  cp "$SOURCE_DIR/s04-delete/s04f-unadd.sh" "$SCRIPT"
+  cp -r "$SOURCE_DIR/lib" "$TEST_DIR/lib"
+  chmod +x "$SCRIPT"
+  export NEMO_GIT_REPO_CACHE_DIR="$TEST_DIR/repo-cache"
+
+  # Zenity mock
+  ZENITY_LOG="$TEST_DIR/zenity_log.txt"
+  export ZENITY_LOG
+  export PATH="$TEST_DIR:$PATH"
+
+  cat <<'EOF' > "$TEST_DIR/zenity"
+#!/bin/bash
+echo "[Zenity Mock] $@" >> "$ZENITY_LOG"
+if [[ "$*" == *"--question"* ]]; then
+  exit 0  # simulate confirmation
+elif [[ "$*" == *"--error"* ]]; then
+  exit 1
+fi
+exit 0
+EOF
+  chmod +x "$TEST_DIR/zenity"
+
+  # Git wrapper that logs unstaging commands
+  cat <<'EOF' > "$TEST_DIR/git"
+#!/bin/bash
+[[ " $* " == *" restore "* || " $* " == *" rm "* ]] && echo "$*" >> "$GIT_LOG"
+exec /usr/bin/git "$@"
+EOF
+  chmod +x "$TEST_DIR/git"
+  export GIT_LOG="$TEST_DIR/git_log.txt"
+
+  git config --global init.defaultBranch main
+  WORKSPACE="$TEST_DIR/workspace"
+  for name in one two; do
+    git init -q "$WORKSPACE/$name"
+    echo "original" > "$WORKSPACE/$name/tracked.txt"
+    /usr/bin/git -C "$WORKSPACE/$name" add tracked.txt
+    /usr/bin/git -C "$WORKSPACE/$name" commit -q -m "initial"
+  done
+}
+
+teardown() {
+  rm -rf "$TEST_DIR"
+}
+
+@test "unstages files across repositories with one command each" {
+  for name in one two; do
+    echo "edited" >> "$WORKSPACE/$name/tracked.txt"
+    touch "$WORKSPACE/$name/new file.txt"
+    /usr/bin/git -C "$WORKSPACE/$name" add .
+  done
+
+  run "$SCRIPT" "$WORKSPACE" "$WORKSPACE"/one/* "$WORKSPACE"/two/*
+  [ "$status" -eq 0 ]
+
+  for name in one two; do
+    [ -z "$(/usr/bin/git -C "$WORKSPACE/$name" diff --cached --name-only)" ]
+  done
+  [ "$(wc -l < "$GIT_LOG")" -eq 2 ]
+  grep -q -- "Git Unstage Successful" "$ZENITY_LOG"
+}
+
+@test "unstages everything in the directory when nothing is selected" {
+  echo "edited" >> "$WORKSPACE/one/tracked.txt"
+  touch "$WORKSPACE/one/new.txt"
+  /usr/bin/git -C "$WORKSPACE/one" add .
+
+  run "$SCRIPT" "$WORKSPACE/one"
+  [ "$status" -eq 0 ]
+
+  [ -z "$(/usr/bin/git -C "$WORKSPACE/one" diff --cached --name-only)" ]
+  [ "$(cat "$WORKSPACE/one/tracked.txt")" = "$(printf 'original\nedited')" ]
+}
+
+@test "unstages files before the first commit" {
+  git init -q "$WORKSPACE/fresh"
+  touch "$WORKSPACE/fresh/a.txt" "$WORKSPACE/fresh/b.txt"
+  /usr/bin/git -C "$WORKSPACE/fresh" add .
+
+  run "$SCRIPT" "$WORKSPACE/fresh" "$WORKSPACE/fresh/a.txt"
+  [ "$status" -eq 0 ]
+
+  [ "$(/usr/bin/git -C "$WORKSPACE/fresh" diff --cached --name-only)" = "b.txt" ]
+  [ -e "$WORKSPACE/fresh/a.txt" ]
+}
+
+@test "shows error if the selection is not in a git repository" {
+  mkdir "$TEST_DIR/notagit"
+  run "$SCRIPT" "$TEST_DIR/notagit" "file.txt"
+  [ "$status" -ne 0 ]
+  grep -q -- "Not a Git Repository" "$ZENITY_LOG"
+}
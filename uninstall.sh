@@ -148,6 +148,10 @@ remove_user_local() {
             rm -f "$HOME_DIR/.local/share/icons/$icon"
             removed_count=$((removed_count + 1))
         fi
+        if [ -f "$HOME_DIR/.local/share/icons/hicolor/64x64/emblems/emblem-$icon" ]; then
+            rm -f "$HOME_DIR/.local/share/icons/hicolor/64x64/emblems/emblem-$icon"
+            removed_count=$((removed_count + 1))
+        fi
     done
     
     # Clear Nemo cache
@@ -211,6 +215,10 @@ remove_system_wide() {
             rm -f "/usr/share/icons/hicolor/scalable/apps/$icon"
             removed_count=$((removed_count + 1))
         fi
+        if [ -f "/usr/share/icons/hicolor/64x64/emblems/emblem-$icon" ]; then
+            rm -f "/usr/share/icons/hicolor/64x64/emblems/emblem-$icon"
+            removed_count=$((removed_count + 1))
+        fi
     done
     
     # Update icon cache
@@ -307,6 +315,7 @@ verify_system_wide() {
     
     for icon in "${ICON_FILES[@]}"; do
         check_file "/usr/share/icons/hicolor/scalable/apps/$icon" "System icon: $icon"
+        check_file "/usr/share/icons/hicolor/64x64/emblems/emblem-$icon" "System emblem: emblem-$icon"
     done
 }
 
@@ -325,6 +334,7 @@ verify_user_local() {
     
     for icon in "${ICON_FILES[@]}"; do
         check_file "$HOME_DIR/.local/share/icons/$icon" "User icon: $icon"
+        check_file "$HOME_DIR/.local/share/icons/hicolor/64x64/emblems/emblem-$icon" "User emblem: emblem-$icon"
     done
 }
 